@@ -13,11 +13,22 @@ import sys
 from cw2dt_core import headless_main
 
 
+_USAGE = """usage: cw2dt [--headless [options]]
+
+Without --headless the Qt GUI is launched (requires: pip install cw2dt[gui]).
+Run 'cw2dt --headless --help' for the full list of headless options.
+"""
+
+
 def main(argv: list[str] | None = None) -> int:
     args = list(sys.argv[1:] if argv is None else argv)
     if '--headless' in args:
         # Strip the marker and delegate entirely to core CLI
         return headless_main([a for a in args if a != '--headless'])
+    if '-h' in args or '--help' in args:
+        # Answer help without importing the GUI (and loading Qt plugins)
+        print(_USAGE, end='')
+        return 0
     # Lazy import so regular import of this module stays light
     try:
         import cw2dt_gui  # type: ignore
@@ -9,9 +9,13 @@ objects and functions defined here. Backwards compatibility for the
 modular split starts at version 1.0.1.
 """
 from __future__ import annotations
-import os, sys, subprocess, shutil, platform, socket, importlib, importlib.util, time, hashlib, json, webbrowser, uuid, re, asyncio
+import os, sys, subprocess, shutil, platform, socket, time, hashlib, json, uuid, re, mmap, threading
+# webbrowser, importlib.util and asyncio are imported where used: they are only needed
+# for --open-browser, plugin loading and prerender respectively.
 from datetime import datetime, timezone
 from dataclasses import dataclass, field
+from functools import lru_cache
+from collections import deque
 from typing import Tuple, Dict
 from typing import Optional, Callable, List, Dict, Any
 
@@ -43,27 +47,28 @@ __all__ = [
     "validate_required_fields",
 ]
 
+_OS = platform.system()  # stable for the process lifetime
+
 PARTIAL_SUFFIXES = {".tmp", ".part", ".partial", ".download"}
+_PARTIAL_TUP = tuple(sorted(PARTIAL_SUFFIXES))  # str.endswith accepts a tuple: one C call per name
+_PARTIAL_TUP_B = tuple(s.encode() for s in _PARTIAL_TUP)
+_HTML_EXTS = ('.html','.htm')
 
 # ---------------- Shared Regex Safety Heuristic -----------------
+# One match per pattern: the lookahead branch finds '(.*.*' anywhere first, so it keeps priority
+# over a nested group ('(a+b+)+' is itself a '+)+' shape) regardless of position.
+_RISKY_RE = re.compile(r'(?s)(?=.*?(?P<any2>\(\.\*\.\*))|.*?(?P<nest>\+\)\+)')
+
 def detect_risky_regex(patterns: Optional[List[str]]) -> List[tuple[str,str]]:
     """Return list of (pattern, reason) tuples for patterns considered risky.
     Heuristics are intentionally conservative: we flag obvious catastrophic backtracking shapes.
     """
-    risky: List[tuple[str,str]] = []
+    risky: Dict[str,str] = {}  # pattern -> first reason; dict order keeps first-seen order
     for pat in (patterns or []):
-        if not pat: continue
-        p = pat.strip()
-        if '(.*.*' in p:
-            risky.append((pat,'consecutive_any_wildcards'))
-        if '(a+b+)+' in p or '+)+' in p:
-            risky.append((pat,'nested_repeating_group'))
-    # de-duplicate while preserving first reason
-    seen=set(); out=[]
-    for pat,reason in risky:
-        if pat not in seen:
-            seen.add(pat); out.append((pat,reason))
-    return out
+        if not pat or pat in risky: continue
+        m = _RISKY_RE.match(pat)
+        if m: risky[pat] = 'consecutive_any_wildcards' if m.lastgroup == 'any2' else 'nested_repeating_group'
+    return list(risky.items())
 
 # ---- shared default constants (exposed for GUI parity) ----
 DEFAULT_PRERENDER_MAX_PAGES = 40
@@ -73,14 +78,10 @@ DEFAULT_CONTAINER_PORT = 80
 DEFAULT_HOST_PORT = 8080
 
 # ---- verification parsing ----
-_VERIFICATION_RE = None
+_VERIFICATION_RE = re.compile(r"OK=(\d+) Missing=(\d+) Mismatched=(\d+) Total=(\d+)")
 def parse_verification_summary(text: str):
     if not text:
         return {'ok':None,'missing':None,'mismatched':None,'total':None}
-    global _VERIFICATION_RE
-    if _VERIFICATION_RE is None:
-        import re as _re
-        _VERIFICATION_RE = _re.compile(r"OK=(\d+) Missing=(\d+) Mismatched=(\d+) Total=(\d+)")
     for line in text.splitlines():
         m = _VERIFICATION_RE.search(line)
         if m:
@@ -96,6 +97,31 @@ def validate_required_fields(url: str, dest: str, ip_text: str, build_docker: bo
     if build_docker and not (docker_name or '').strip(): errs.append('Docker image name required when building')
     return errs
 
+# Manifests and state go through orjson when it is installed (several times faster on
+# large, dict-heavy documents); stdlib json otherwise.
+try:
+    import orjson as _orjson  # type: ignore
+except ImportError:
+    _orjson = None
+
+def _read_json(path: str):
+    with open(path,'rb') as f: raw=f.read()
+    return _orjson.loads(raw) if _orjson else json.loads(raw)
+
+def _write_json_atomic(path: str, obj, indent: bool = True):
+    """Write obj as JSON via a temp file + os.replace, so an interrupted write never
+    leaves a truncated manifest/state behind. indent=True matches json.dump(indent=2)."""
+    if _orjson: raw=_orjson.dumps(obj, option=_orjson.OPT_INDENT_2 if indent else 0)
+    else: raw=(json.dumps(obj,indent=2) if indent else json.dumps(obj,separators=(',',':'))).encode('utf-8')
+    tmp=path+'.tmp'
+    try:
+        with open(tmp,'wb') as f: f.write(raw)
+        os.replace(tmp,path)
+    except Exception:
+        try: os.remove(tmp)
+        except OSError: pass
+        raise
+
 def run_verification(manifest_path: str, fast: bool=True, docker_name: str|None=None, project_dir: str|None=None, readme: bool=True, output_cb=None):
     """Run checksum verification script and (optionally) append results to README.
 
@@ -123,13 +149,13 @@ def run_verification(manifest_path: str, fast: bool=True, docker_name: str|None=
     passed = (res.returncode == 0)
     # Update manifest with verification summary
     try:
-        with open(manifest_path,'r',encoding='utf-8') as mf: data=json.load(mf)
+        data=_read_json(manifest_path)
         data['verification']={
             'status':'passed' if passed else 'failed',
             'ok':stats['ok'],'missing':stats['missing'],'mismatched':stats['mismatched'],'total':stats['total'],
             'fast_missing':fast
         }
-        with open(manifest_path,'w',encoding='utf-8') as mf: json.dump(data,mf,indent=2)
+        _write_json_atomic(manifest_path, data)
     except Exception: pass
     # Optional README + verifier script portability
     if readme and docker_name and project_dir:
@@ -173,36 +199,73 @@ def _ensure_state_dir(output_folder: str) -> str:
     except Exception: pass
     return p
 def _state_path(output_folder: str) -> str: return os.path.join(_ensure_state_dir(output_folder),'state.json')
+# state.json carries a per-file snapshot (tens of thousands of entries on large sites) and is
+# only read back by this module, so it is stored compact.
 def _load_state(output_folder: str) -> dict:
     try:
-        with open(_state_path(output_folder),'r',encoding='utf-8') as f: d=json.load(f)
+        d=_read_json(_state_path(output_folder))
         return d if isinstance(d, dict) else {}
     except Exception: return {}
 def _save_state(output_folder: str, state: dict):
-    try:
-        with open(_state_path(output_folder),'w',encoding='utf-8') as f: json.dump(state,f,indent=2)
+    try: _write_json_atomic(_state_path(output_folder), state, indent=False)
     except Exception: pass
 
-def _snapshot_file_hashes(base: str, extra_ext: list[str] | None = None) -> dict:
-    """Snapshot all regular files under base with sha256, size, mtime.
+def _snapshot_file_hashes(base: str, extra_ext: list[str] | None = None, prev: dict | None = None) -> dict:
+    """Snapshot all regular files under base with a content hash, size, mtime.
+    The hash is stored under its algorithm name: 'blake3' when the blake3 package is
+    installed (snapshots only detect changes), else 'sha256'.
     Historically this only tracked HTML unless extra extensions were supplied;
     for incremental diff usefulness (and tests) we now include all files.
     extra_ext is currently unused (parity placeholder).
+    prev (a previously saved snapshot state) lets files whose size and mtime (mtime_ns when
+    recorded) are unchanged reuse the recorded hash instead of being re-read. A file whose
+    previous entry used the other algorithm keeps that algorithm when it can be computed,
+    so installing/removing blake3 does not make every digest incomparable.
     """
+    hashers={'sha256':_sha256_file}
+    if _blake3: hashers['blake3']=_blake3_file
+    entries=[]; todo={k:[] for k in hashers}; alg=_SNAPSHOT_ALG
+    prev_files=(prev or {}).get('files') or {}
+    cut=len(os.path.join(base,''))  # entry paths start with base+sep: slicing replaces a relpath per file
+    for e in _iter_files(base):
+        p=e.path; rel=p[cut:]
+        try:
+            st=e.stat()  # DirEntry caches the stat result (free on Windows, one call elsewhere)
+        except Exception:
+            continue
+        size=st.st_size; mtime=int(st.st_mtime); mtime_ns=st.st_mtime_ns
+        old=prev_files.get(rel); key=alg
+        if old:
+            okey=alg if old.get(alg) else next((k for k in _SNAP_ALGS if old.get(k)), None)
+            # mtime_ns catches same-second rewrites; snapshots predating it fall back to whole seconds
+            if okey and old.get('size')==size and (old['mtime_ns']==mtime_ns if 'mtime_ns' in old else old.get('mtime')==mtime):
+                entries.append((rel,okey,old[okey],size,mtime,mtime_ns)); continue
+            if okey in hashers: key=okey
+        entries.append((rel,key,None,size,mtime,mtime_ns)); todo[key].append(p)
+    # changed/new files are hashed together per algorithm (pooled for larger sets); walk order is kept
+    digests={k:_hash_files(paths, hash_file=hashers[k]) for k,paths in todo.items() if paths}
     result={}
-    for root,_,files in os.walk(base):
-        for fn in files:
-            p=os.path.join(root,fn); rel=os.path.relpath(p,base)
-            try:
-                h=hashlib.sha256()
-                with open(p,'rb') as f:
-                    for chunk in iter(lambda: f.read(65536), b''): h.update(chunk)
-                st=os.stat(p)
-                result[rel]={'sha256':h.hexdigest(),'size':st.st_size,'mtime':int(st.st_mtime)}
-            except Exception:
-                continue
+    for rel,key,digest,size,mtime,mtime_ns in entries:
+        if digest is None:
+            digest=next(digests[key])
+            if digest is None: continue
+        result[rel]={key:digest,'size':size,'mtime':mtime,'mtime_ns':mtime_ns}
     return result
 
+_SNAP_ALGS = ('blake3', 'sha256')  # digest keys a snapshot entry may carry
+
+def _snap_hash(meta: dict):
+    return next((meta[k] for k in _SNAP_ALGS if meta.get(k)), None)
+
+def _snap_same(old: dict, new: dict) -> bool:
+    """Whether two same-size snapshot entries describe unchanged content."""
+    for k in _SNAP_ALGS:
+        if old.get(k) and new.get(k): return old[k]==new[k]
+    # no digest in a shared algorithm (blake3 installed/removed between runs and the file could
+    # not be re-hashed the old way): fall back to stat identity rather than report a change
+    if 'mtime_ns' in old and 'mtime_ns' in new: return old['mtime_ns']==new['mtime_ns']
+    return old.get('mtime')==new.get('mtime')
+
 def _compute_diff(prev: dict, current: dict) -> dict:
     """Compute diff between previous and current snapshot states.
     Returns keys: added, removed, modified (with old/new hash+size+delta), changed (alias list),
@@ -210,29 +273,31 @@ def _compute_diff(prev: dict, current: dict) -> dict:
     """
     prev_files = (prev or {}).get('files', {}) or {}
     curr_files = (current or {}).get('files', {}) or {}
-    added=[]; removed=[]; modified=[]; unchanged=0
+    added=[]; removed=[]; modified=[]; changed=[]; unchanged=0; pget=prev_files.get
     # Added & modified/unchanged
     for path, meta in curr_files.items():
-        if path not in prev_files:
+        old=pget(path)
+        if old is None:
             added.append(path)
         else:
-            old=prev_files[path]
-            if old.get('sha256') != meta.get('sha256') or old.get('size') != meta.get('size'):
+            # size first: an int compare settles most real changes before the digest compare
+            old_size=old.get('size'); new_size=meta.get('size')
+            if old_size != new_size or not _snap_same(old, meta):
                 modified.append({
                     'path': path,
-                    'old_hash': old.get('sha256'),
-                    'new_hash': meta.get('sha256'),
-                    'old_size': old.get('size'),
-                    'new_size': meta.get('size'),
-                    'delta_bytes': (meta.get('size') or 0) - (old.get('size') or 0)
+                    'old_hash': _snap_hash(old),
+                    'new_hash': _snap_hash(meta),
+                    'old_size': old_size,
+                    'new_size': new_size,
+                    'delta_bytes': (new_size or 0) - (old_size or 0)
                 })
+                changed.append(path)
             else:
                 unchanged += 1
-    # Removed
-    for path in prev_files:
-        if path not in curr_files:
-            removed.append(path)
-    changed=[m['path'] for m in modified]
+    # Removed: every previous path not seen above. When the common-path count already equals
+    # len(prev) nothing was removed (the usual incremental case) and the pass is skipped.
+    if len(prev_files) > len(curr_files)-len(added):
+        removed=[path for path in prev_files if path not in curr_files]
     return {
         'added': added,
         'removed': removed,
@@ -244,107 +309,287 @@ def _compute_diff(prev: dict, current: dict) -> dict:
 
 def _timestamp(): return datetime.now(timezone.utc).strftime('%Y%m%d-%H%M%S')
 
-def compute_checksums(base_folder: str, extra_extensions: list[str] | None = None, progress_cb=None, cancel_cb=None, chunk_size: int = 65536):
+_HASH_POOL_MIN = 32  # below this many files the thread pool costs more than it saves
+
+_HASH_BUF = threading.local()  # per-thread read buffer, reused across files (hashing runs on a pool)
+
+def _sha256():
+    # Integrity-only digests (change detection, manifests): flagged as non-security use so
+    # FIPS-restricted OpenSSL builds still hand out their native implementation.
+    return hashlib.sha256(usedforsecurity=False)
+
+def _sha256_file(path, chunk_size: int = 65536):
+    """Hex sha256 of one file, or None if it can't be read."""
+    mv=getattr(_HASH_BUF,'mv',None)
+    if mv is None or len(mv)!=chunk_size: mv=_HASH_BUF.mv=memoryview(bytearray(chunk_size))
+    try:
+        # unbuffered: readinto() fills our buffer straight from the fd, no per-chunk bytes objects
+        # (hashlib.file_digest would allocate a fresh 256 KiB buffer for every small file)
+        with open(path,'rb',buffering=0) as f:
+            h=_sha256()
+            while n := f.readinto(mv): h.update(mv[:n])
+            return h.hexdigest()
+    except Exception: return None
+
+# Incremental snapshots only detect changes, so they use BLAKE3 (SIMD, several times faster
+# than SHA-256) when the optional blake3 package is installed; manifests stay SHA-256.
+try:
+    from blake3 import blake3 as _blake3  # type: ignore
+except ImportError:
+    _blake3 = None
+_SNAPSHOT_ALG = 'blake3' if _blake3 else 'sha256'
+
+def _blake3_file(path, chunk_size: int = 65536):
+    """Hex blake3 of one file, or None if it can't be read (chunk_size unused: mmap'd)."""
+    try:
+        h=_blake3(); h.update_mmap(path)
+        return h.hexdigest()
+    except Exception: return None
+
+def _hash_files(paths: list, chunk_size: int = 65536, hash_file=_sha256_file):
+    """Yield hash_file digests for paths, in order.
+    Files hash independently and hashlib drops the GIL while digesting, so larger sets are
+    hashed on a thread pool with a bounded window of in-flight files. Closing the generator
+    early (cancel) drops the queued work.
+    """
+    if len(paths) < _HASH_POOL_MIN:
+        for p in paths: yield hash_file(p, chunk_size)
+        return
+    from concurrent.futures import ThreadPoolExecutor
+    workers=min(32,(os.cpu_count() or 4)*2); window=deque()
+    ex=ThreadPoolExecutor(max_workers=workers)
+    try:
+        for p in paths:
+            window.append(ex.submit(hash_file, p, chunk_size))
+            if len(window) >= workers*4: yield window.popleft().result()
+        while window: yield window.popleft().result()
+    finally:
+        ex.shutdown(wait=True, cancel_futures=True)
+
+# Tooling/VCS directories never hold mirrored pages; compute_checksums prunes them whole.
+CHECKSUM_SKIP_DIRS = frozenset({'.git', 'node_modules', '__pycache__'})
+
+def compute_checksums(base_folder: str, extra_extensions: list[str] | None = None, progress_cb=None, cancel_cb=None, chunk_size: int = 65536, skip_dirs=None):
     extra_ext=[e.lower().lstrip('.') for e in (extra_extensions or []) if e]
     extra_tuple=tuple(f'.{e}' for e in extra_ext)
-    candidates=[]; norm_api='/_api/'
-    for root,_,files in os.walk(base_folder):
-        norm_root=root.replace('\\','/')
-        is_api = (norm_api in (norm_root + '/'))
-        for fn in files:
-            low=fn.lower()
-            if low.endswith(('.html','.htm')) or (is_api and low.endswith('.json')) or (extra_tuple and low.endswith(extra_tuple)):
-                candidates.append((root, fn))
-    total=len(candidates); checks={}; last_emit=0.0
-    for idx,(root,fn) in enumerate(candidates,1):
-        if cancel_cb and callable(cancel_cb):
-            try:
-                if cancel_cb():
-                    break
-            except Exception:
-                pass
-        p=os.path.join(root,fn); rel=os.path.relpath(p, base_folder)
-        try:
-            h=hashlib.sha256()
-            with open(p,'rb') as cf:
-                for chunk in iter(lambda: cf.read(chunk_size), b''): h.update(chunk)
-            checks[rel]=h.hexdigest()
-        except Exception: continue
-        if progress_cb:
-            now=time.time()
-            if idx==1 or idx==total or (idx % 50 == 0) or (now-last_emit)>0.6:
-                last_emit=now
-                try: progress_cb(idx,total)
-                except Exception: pass
+    candidates=[]; norm_api='/_api/'; add=candidates.append; dirname=os.path.dirname
+    api_dir=None; is_api=False
+    # scandir walk: names are filtered from the dirent, no per-file stat or path join
+    for e in _iter_files(base_folder, CHECKSUM_SKIP_DIRS if skip_dirs is None else skip_dirs):
+        low=e.name.lower()
+        if low.endswith(_HTML_EXTS) or (extra_tuple and low.endswith(extra_tuple)): add(e.path); continue
+        if low.endswith('.json'):
+            # a directory's entries arrive together: classify it once, not per file
+            d=dirname(e.path)
+            if d!=api_dir: api_dir=d; is_api=norm_api in (d.replace('\\','/') + '/')
+            if is_api: add(e.path)
+    total=len(candidates); checks={}; last_emit=0.0; cut=len(os.path.join(base_folder,''))
+    # digests are consumed in order here, keeping progress/cancel handling on the calling thread
+    digests=_hash_files(candidates, chunk_size)
+    try:
+        for idx,p in enumerate(candidates,1):
+            if cancel_cb and callable(cancel_cb):
+                try:
+                    if cancel_cb():
+                        break
+                except Exception:
+                    pass
+            digest=next(digests)
+            if digest is None: continue
+            checks[p[cut:]]=digest
+            if progress_cb:
+                now=time.time()
+                if idx==1 or idx==total or (idx % 50 == 0) or (now-last_emit)>0.6:
+                    last_emit=now
+                    try: progress_cb(idx,total)
+                    except Exception: pass
+    finally:
+        digests.close()
     return checks
 
+_WHICH_MISS_TTL = 5.0
+_which_cache: dict = {}  # name -> (monotonic timestamp, path or None)
+
+def _which(name: str):
+    """Memoized shutil.which (each miss stats every PATH entry). Hits are kept until
+    refresh_tool_availability(); misses only for _WHICH_MISS_TTL seconds, so a tool
+    installed while the GUI is open is picked up without a refresh.
+    """
+    now=time.monotonic(); hit=_which_cache.get(name)
+    if hit and (hit[1] is not None or (now-hit[0]) < _WHICH_MISS_TTL): return hit[1]
+    path=shutil.which(name); _which_cache[name]=(now,path)
+    return path
+
 def is_wget2_available():
-    try: subprocess.run(['wget2','--version'],capture_output=True,check=True); return True
-    except Exception: return False
+    # PATH lookup only: spawning `wget2 --version` cost a fork+exec per check
+    return _which('wget2') is not None
+
+def _iter_files(base: str, skip_dirs=None):
+    """Yield os.DirEntry objects for every file below base.
+    Breadth-first os.scandir walk: the dirent type cache avoids the extra stat
+    os.walk issues per entry. Symlinked directories are listed but not followed,
+    matching os.walk defaults; unreadable directories are skipped, as are
+    directories whose name is in skip_dirs.
+    """
+    pending=deque([base])
+    while pending:
+        try: it=os.scandir(pending.popleft())
+        except OSError: continue
+        with it:
+            for entry in it:
+                try:
+                    if entry.is_dir():
+                        if not entry.is_symlink() and not (skip_dirs and entry.name in skip_dirs): pending.append(entry.path)
+                        continue
+                except OSError: continue
+                yield entry
 
 def count_files_and_partials(base_path: str):
     total=0;partials=0
     if not base_path or not os.path.isdir(base_path): return 0,0
-    for root,_,files in os.walk(base_path):
-        for f in files:
-            total += 1
-            lf=f.lower()
-            for suf in PARTIAL_SUFFIXES:
-                if lf.endswith(suf): partials +=1; break
+    # bytes path: scandir hands back raw dirent names, skipping a filesystem decode per entry
+    for entry in _iter_files(os.fsencode(base_path)):
+        total += 1
+        if entry.name.lower().endswith(_PARTIAL_TUP_B): partials += 1
     return total, partials
 
+_SCRIPT_RE = re.compile(rb"<script\b[^>]*>.*?</script>", re.IGNORECASE | re.DOTALL)
+_SCRIPT_OPEN_RE = re.compile(rb"<script", re.IGNORECASE)
+# prerender: capture file-name sanitizing and strict-mode root-relative href/src links
+_SAFE_NAME_RE = re.compile(r'[^a-zA-Z0-9_.-]+')
+_ROOT_LINK_ATTR_RE = re.compile(r'(href|src)=("|\')(/[^"\'#? ]*)([?#][^"\']*)?("|\')')
+
+def _strip_js_file(path: str) -> tuple[bool,int,int]:
+    """Remove <script> blocks from one HTML file in place.
+    Works on raw bytes (no decode/encode round trip) and only rewrites the file
+    when a script was found. The file is matched straight from a read-only mmap:
+    pages without scripts are never copied into Python, and pages with scripts are
+    rewritten in a single regex pass that also counts external vs inline blocks.
+    Returns (modified, external_count, inline_count).
+    """
+    counts=[0,0]  # [inline, external]
+    def _drop(m):
+        counts[b'src=' in m.group(0).lower()] += 1
+        return b''
+    with open(path,'rb') as f:
+        try: mm=mmap.mmap(f.fileno(),0,access=mmap.ACCESS_READ)
+        except ValueError: return False,0,0  # empty file
+        with mm:
+            # one case-insensitive scan; a lowercase find() first would double the work on clean pages
+            if not _SCRIPT_OPEN_RE.search(mm): return False,0,0
+            data=_SCRIPT_RE.sub(_drop, mm)
+    if not (counts[0] or counts[1]): return False,0,0
+    with open(path,'wb') as f: f.write(data)
+    return True, counts[1], counts[0]
+
+def _strip_js_file_safe(path: str) -> tuple[bool,int,int]:
+    try: return _strip_js_file(path)
+    except Exception: return False,0,0
+
+def _strip_js_tree(site_root: str, max_workers: int | None = None, paths: list[str] | None = None) -> dict:
+    """Strip scripts from every .html/.htm file under site_root; returns js_stripping stats.
+    Files are independent and the work is dominated by open/read/write syscalls
+    (which release the GIL), so they are processed on a thread pool. `paths` may
+    carry an already collected file list (see scan_output) to skip the walk.
+    """
+    if paths is None:
+        paths=[e.path for e in _iter_files(site_root) if e.name.lower().endswith(_HTML_EXTS)]
+    stats={'scanned':len(paths),'stripped':0,'scripts_removed':0,'inline_scripts_removed':0}
+    if not paths: return stats
+    from concurrent.futures import ThreadPoolExecutor
+    workers=max_workers or min(32,(os.cpu_count() or 4)*4,len(paths))
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        for modified, external, inline in ex.map(_strip_js_file_safe, paths):
+            if modified:
+                stats['stripped'] += 1; stats['scripts_removed'] += external; stats['inline_scripts_removed'] += inline
+    return stats
+
+_BC3 = None  # browser_cookie3 module once loaded; False after a failed install (don't retry pip every clone)
+
+def _load_browser_cookie3(log):
+    """Import browser_cookie3 once (installing it via pip on first miss) and reuse the handle."""
+    global _BC3
+    if _BC3 is None:
+        try:
+            import browser_cookie3  # type: ignore
+        except ModuleNotFoundError:
+            log('[deps] installing browser_cookie3...')
+            try:
+                subprocess.check_call([sys.executable,'-m','pip','install','browser_cookie3'])
+                import browser_cookie3  # type: ignore
+            except Exception as e:
+                log(f"[cookies] browser_cookie3 install failed: {e}")
+                browser_cookie3=False  # type: ignore
+        _BC3=browser_cookie3
+    return _BC3 or None
+
 def docker_available():
-    try: subprocess.run(['docker','--version'],capture_output=True,check=True); return True
-    except Exception: return False
+    return _which('docker') is not None
 
+def refresh_tool_availability():
+    """Forget cached PATH probes (call after the user installs wget2/docker)."""
+    global _BC3
+    _which_cache.clear(); _image_exists_cache.clear()
+    if _BC3 is False: _BC3=None
+
+@lru_cache(maxsize=1)
 def docker_install_instructions():
-    os_name=platform.system()
+    os_name=_OS
     if os_name=='Windows': return 'winget install Docker.DockerDesktop'
     if os_name=='Darwin': return 'brew install --cask docker'
     if os_name=='Linux': return 'sudo apt-get update && sudo apt-get install -y docker.io'
     return 'Install Docker manually for your platform.'
 
+# Install command tables (built once): Linux package managers in preference order -> program -> argv.
+_LINUX_INSTALL_CMDS = {
+    "apt-get": {"wget2":["sudo","apt-get","install","-y","wget2"], "docker":["sudo","apt-get","install","-y","docker.io"]},
+    "apt":     {"wget2":["sudo","apt","install","-y","wget2"], "docker":["sudo","apt","install","-y","docker.io"]},
+    "dnf":     {"wget2":["sudo","dnf","install","-y","wget2"], "docker":["sudo","dnf","install","-y","docker"]},
+    "yum":     {"wget2":["sudo","yum","install","-y","wget2"], "docker":["sudo","yum","install","-y","docker"]},
+    "pacman":  {"wget2":["sudo","pacman","-S","--noconfirm","wget2"], "docker":["sudo","pacman","-S","--noconfirm","docker"]},
+    "zypper":  {"wget2":["sudo","zypper","install","-y","wget2"], "docker":["sudo","zypper","install","-y","docker"]},
+    "apk":     {"wget2":["sudo","apk","add","wget2"], "docker":["sudo","apk","add","docker"]},
+}
+_DARWIN_INSTALL_CMDS = {"wget2":["brew","install","wget2"], "docker":["brew","install","--cask","docker"]}
+_WINDOWS_DOCKER_CMDS = (("winget",["winget","install","-e","--id","Docker.DockerDesktop"]), ("choco",["choco","install","docker-desktop","-y"]))
+
 def get_install_cmd(program: str):
     """Return best-effort install command for a program or None.
     Mirrors legacy logic; returns list[str] suitable for subprocess or None.
     """
-    mgrs_linux=["apt-get","apt","dnf","yum","pacman","zypper","apk"]
-    os_name=platform.system()
+    os_name=_OS
     if os_name=="Darwin":
-        if shutil.which("brew"):
-            if program=="wget2": return ["brew","install","wget2"]
-            if program=="docker": return ["brew","install","--cask","docker"]
-        return None
-    if os_name=="Linux":
-        for mgr in mgrs_linux:
-            if not shutil.which(mgr): continue
-            if program=="wget2":
-                if mgr in ("apt-get","apt"): return ["sudo",mgr,"install","-y","wget2"]
-                if mgr in ("dnf","yum"): return ["sudo",mgr,"install","-y","wget2"]
-                if mgr=="pacman": return ["sudo","pacman","-S","--noconfirm","wget2"]
-                if mgr=="zypper": return ["sudo","zypper","install","-y","wget2"]
-                if mgr=="apk": return ["sudo","apk","add","wget2"]
-            if program=="docker":
-                if mgr in ("apt-get","apt"): return ["sudo",mgr,"install","-y","docker.io"]
-                if mgr in ("dnf","yum"): return ["sudo",mgr,"install","-y","docker"]
-                if mgr=="pacman": return ["sudo","pacman","-S","--noconfirm","docker"]
-                if mgr=="zypper": return ["sudo","zypper","install","-y","docker"]
-                if mgr=="apk": return ["sudo","apk","add","docker"]
-        return None
-    if os_name=="Windows":
-        if program=="wget2": return None
-        if shutil.which("winget") and program=="docker": return ["winget","install","-e","--id","Docker.DockerDesktop"]
-        if shutil.which("choco") and program=="docker": return ["choco","install","docker-desktop","-y"]
-        return None
-    return None
+        cmd=_DARWIN_INSTALL_CMDS.get(program) if _which("brew") else None
+    elif os_name=="Linux":
+        # first installed manager in preference order wins
+        mgr=next((m for m in _LINUX_INSTALL_CMDS if _which(m)), None)
+        cmd=_LINUX_INSTALL_CMDS[mgr].get(program) if mgr else None
+    elif os_name=="Windows" and program=="docker":
+        cmd=next((c for tool,c in _WINDOWS_DOCKER_CMDS if _which(tool)), None)
+    else:
+        cmd=None
+    return list(cmd) if cmd else None
+
+_IMAGE_EXISTS_TTL = 5.0
+_image_exists_cache: dict = {}  # image name -> monotonic timestamp of last positive inspect
 
 def image_exists_locally(image_name: str) -> bool:
+    """`docker image inspect` probe. Positive answers are reused for _IMAGE_EXISTS_TTL
+    seconds so UI refreshes don't spawn a docker process each time; negatives are never
+    cached (a build may create the image at any moment).
+    """
     if not image_name: return False
+    now=time.monotonic(); hit=_image_exists_cache.get(image_name)
+    if hit is not None and (now-hit) < _IMAGE_EXISTS_TTL: return True
     try:
-        res=subprocess.run(["docker","image","inspect",image_name],capture_output=True,text=True)
-        return res.returncode==0
-    except Exception: return False
+        res=subprocess.run(["docker","image","inspect",image_name],capture_output=True)
+        ok=res.returncode==0
+    except Exception: ok=False
+    if ok: _image_exists_cache[image_name]=now
+    else: _image_exists_cache.pop(image_name,None)
+    return ok
 
+@lru_cache(maxsize=128)
 def normalize_ip(ip_text: str) -> str:
     ip_text=(ip_text or '').strip()
     if ip_text=='': return '127.0.0.1'
@@ -355,46 +600,154 @@ def normalize_ip(ip_text: str) -> str:
         ipaddress.IPv4Address(ip_text); return ip_text
     except Exception: return ''
 
+_LAN_IP_TTL = 60.0
+_lan_ip_cache: dict = {}  # default -> (monotonic timestamp, ip)
+
 def get_primary_lan_ip(default="127.0.0.1"):
+    """Best-effort primary IPv4 (route lookup via an unsent UDP connect).
+    Cached for _LAN_IP_TTL seconds: the address only changes on network reconfiguration.
+    """
+    now=time.monotonic(); hit=_lan_ip_cache.get(default)
+    if hit and (now-hit[0]) < _LAN_IP_TTL: return hit[1]
     try:
-        s=socket.socket(socket.AF_INET,socket.SOCK_DGRAM); s.connect(('8.8.8.8',80)); ip=s.getsockname()[0]; s.close(); return ip
-    except Exception: return default
+        with socket.socket(socket.AF_INET,socket.SOCK_DGRAM) as s:
+            s.connect(('8.8.8.8',80)); ip=s.getsockname()[0]
+    except Exception: ip=default
+    _lan_ip_cache[default]=(now,ip)
+    return ip
 
-def port_in_use(ip: str, port: int) -> bool:
+def _probe_target(ip: str, timeout: float | None):
     target='127.0.0.1' if ip=='0.0.0.0' else ip
-    with socket.socket(socket.AF_INET,socket.SOCK_STREAM) as s:
-        s.settimeout(0.2)
-        try: return s.connect_ex((target,port))==0
-        except Exception: return False
+    if timeout is None: timeout=0.1 if (target or '').startswith('127.') or target=='localhost' else 0.2
+    return target, timeout
+
+def ports_in_use(ip: str, ports, timeout: float | None = None) -> dict:
+    """Probe several TCP ports concurrently; returns {port: in_use}.
+    All connects are issued nonblocking and harvested by a single selector poll, so
+    N ports cost one timeout window instead of N. Loopback defaults to 100ms (RTT is
+    negligible there), other addresses to 200ms.
+    """
+    import selectors, errno
+    target,timeout=_probe_target(ip, timeout)
+    pending_codes={errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EALREADY, getattr(errno,'WSAEWOULDBLOCK',errno.EWOULDBLOCK)}
+    result={}; socks=[]; sel=selectors.DefaultSelector()
+    try:
+        for port in dict.fromkeys(ports):
+            result[port]=False
+            try:
+                s=socket.socket(socket.AF_INET,socket.SOCK_STREAM); socks.append(s); s.setblocking(False)
+                rc=s.connect_ex((target,int(port)))
+            except Exception: continue
+            if rc==0: result[port]=True
+            elif rc in pending_codes: sel.register(s, selectors.EVENT_WRITE, port)
+        deadline=time.monotonic()+timeout
+        while sel.get_map():
+            remaining=deadline-time.monotonic()
+            if remaining<=0: break
+            for key,_ in sel.select(remaining):
+                sel.unregister(key.fileobj)
+                try: result[key.data]=key.fileobj.getsockopt(socket.SOL_SOCKET,socket.SO_ERROR)==0
+                except Exception: pass
+    finally:
+        sel.close()
+        for s in socks: s.close()
+    return result
+
+def port_in_use(ip: str, port: int) -> bool:
+    # one port: a plain timed connect_ex, no selector (epoll fd) setup as in ports_in_use
+    target,timeout=_probe_target(ip, None)
+    try:
+        with socket.socket(socket.AF_INET,socket.SOCK_STREAM) as s:
+            s.settimeout(timeout)
+            return s.connect_ex((target,int(port)))==0
+    except Exception: return False
+
+def find_free_port(ip: str, start: int, span: int = 20) -> int | None:
+    """First port in [start, start+span) with nothing listening (one concurrent probe)."""
+    cands=[p for p in range(int(start), min(65536, int(start)+span)) if p>0]
+    busy=ports_in_use(ip,cands)
+    return next((p for p in cands if not busy.get(p)), None)
+
+_INDEX_NAMES = frozenset({'index.html','index.htm','index.php'})
+_INDEX_NAME_LENS = frozenset(len(n) for n in _INDEX_NAMES)
 
 def find_site_root(base_path):
-    for root,_,files in os.walk(base_path):
-        if any(f.lower() in ('index.html','index.htm','index.php') for f in files): return root
+    """Return the first directory (os.walk top-down order) holding an index page, else base_path.
+    Iterative scandir DFS that stops at the first index entry instead of listing whole
+    directories; the base folder is examined before anything is descended into.
+    """
+    stack=[base_path]
+    while stack:
+        root=stack.pop(); subdirs=[]
+        try: it=os.scandir(root)
+        except OSError: continue
+        with it:
+            for entry in it:
+                try: is_dir=entry.is_dir()
+                except OSError: continue
+                if is_dir:
+                    if not entry.is_symlink(): subdirs.append(entry.path)
+                else:
+                    name=entry.name
+                    # exact hit first (mirrors are nearly always lowercase); only names of a
+                    # matching length are worth lowercasing for the case-insensitive fallback
+                    if name in _INDEX_NAMES or (len(name) in _INDEX_NAME_LENS and name.lower() in _INDEX_NAMES): return root
+        stack.extend(reversed(subdirs))  # keep os.walk's pre-order visiting sequence
     return base_path
 
-def human_quota_suffix(b):
-    if b >= 1024**3: return f"{b//(1024**3)}G"
-    if b >= 1024**2: return f"{b//(1024**2)}M"
-    if b >= 1024: return f"{b//1024}K"
+@dataclass
+class ScanResult:
+    site_root: str
+    html_files: List[str] = field(default_factory=list)
+    total: int = 0
+    partials: int = 0
+
+def scan_output(output_folder: str) -> ScanResult:
+    """Single traversal replacing find_site_root + count_files_and_partials + HTML listing.
+    Visits directories in os.walk pre-order so site_root matches find_site_root.
+    """
+    res=ScanResult(site_root=output_folder); found=False
+    stack=[output_folder]
+    while stack:
+        root=stack.pop(); subdirs=[]
+        try: it=os.scandir(root)
+        except OSError: continue
+        with it:
+            for entry in it:
+                try: is_dir=entry.is_dir()
+                except OSError: continue
+                if is_dir:
+                    if not entry.is_symlink(): subdirs.append(entry.path)
+                    continue
+                res.total += 1; low=entry.name.lower()
+                if low.endswith(_PARTIAL_TUP): res.partials += 1
+                elif low.endswith(_HTML_EXTS): res.html_files.append(entry.path)
+                if not found and low in _INDEX_NAMES: res.site_root=root; found=True
+        stack.extend(reversed(subdirs))
+    return res
+
+_SIZE_UNITS = {'TB':1024**4,'GB':1024**3,'MB':1024**2,'KB':1024,'T':1024**4,'G':1024**3,'M':1024**2,'K':1024}
+_QUOTA_STEPS = ((1024**3,'G'),(1024**2,'M'),(1024,'K'))
+_RATE_STEPS = _QUOTA_STEPS[1:]  # wget2 --limit-rate: K/M only
+
+def _human(b, steps):
+    for threshold, suffix in steps:
+        if b >= threshold: return f"{b//threshold}{suffix}"
     return str(b)
-def human_rate_suffix(bps):
-    if bps >= 1024**2: return f"{bps//(1024**2)}M"
-    if bps >= 1024: return f"{bps//1024}K"
-    return str(bps)
+def human_quota_suffix(b): return _human(b, _QUOTA_STEPS)
+def human_rate_suffix(bps): return _human(bps, _RATE_STEPS)
 
 def parse_size_to_bytes(text: str) -> int | None:
     if not text: return None
     t=text.strip().upper()
-    try:
-        if t.endswith('TB'): return int(float(t[:-2])*(1024**4))
-        if t.endswith('GB'): return int(float(t[:-2])*(1024**3))
-        if t.endswith('MB'): return int(float(t[:-2])*(1024**2))
-        if t.endswith('KB'): return int(float(t[:-2])*1024)
-        if t.endswith('T'): return int(float(t[:-1])*(1024**4))
-        if t.endswith('G'): return int(float(t[:-1])*(1024**3))
-        if t.endswith('M'): return int(float(t[:-1])*(1024**2))
-        if t.endswith('K'): return int(float(t[:-1])*1024)
-        return int(float(t))
+    # two-letter suffix first (TB/GB/...), then single letter, else plain bytes
+    mul=_SIZE_UNITS.get(t[-2:])
+    if mul: t=t[:-2]
+    else:
+        mul=_SIZE_UNITS.get(t[-1:])
+        if mul: t=t[:-1]
+        else: mul=1
+    try: return int(float(t)*mul)
     except Exception: return None
 def parse_rate_to_bps(text: str) -> int | None: return parse_size_to_bytes(text)
 
@@ -488,8 +841,8 @@ def _run_prerender(start_url: str, site_root: str, output_folder: str, max_pages
         origin = f"{origin_parts.scheme}://{origin_parts.netloc}"
     except Exception:
         origin = None
-    allow_res=[re.compile(p) for p in (router_allow or [])]
-    deny_res=[re.compile(p) for p in (router_deny or [])]
+    allow_res=tuple(re.compile(p) for p in (router_allow or []))
+    deny_res=tuple(re.compile(p) for p in (router_deny or []))
     def _route_allowed(norm: str) -> bool:
         try:
             if allow_res and not any(r.search(norm) for r in allow_res): return False
@@ -518,7 +871,7 @@ def _run_prerender(start_url: str, site_root: str, output_folder: str, max_pages
         captured=[]
         storage_snapshots=0
         graphql_captured=[]
-        capture_types = [c.strip().lower() for c in (capture_api_types or ['application/json']) if c.strip()]
+        capture_types = tuple(c.strip().lower() for c in (capture_api_types or ['application/json']) if c.strip())
         # Map of common content-types to extension (fallback logic inside response handler)
         ct_ext_map = {
             'application/json': '.json',
@@ -546,9 +899,9 @@ def _run_prerender(start_url: str, site_root: str, output_folder: str, max_pages
                         except Exception:
                             pass
                     if not is_graphql:
-                        if capture_api and any(ct.startswith(t) for t in capture_types):
+                        if capture_api and ct.startswith(capture_types):
                             should_capture=True
-                        elif capture_api and capture_api_binary and any(ct.startswith(b) for b in binary_prefixes):
+                        elif capture_api and capture_api_binary and ct.startswith(binary_prefixes):
                             should_capture=True; is_binary=True
                         if not should_capture:
                             return
@@ -600,7 +953,7 @@ def _run_prerender(start_url: str, site_root: str, output_folder: str, max_pages
                             except Exception:
                                 pass
                             fname_parts=[op_name or 'graphql', str(len(graphql_captured)+1)]
-                            safe_name='-'.join([re.sub(r'[^a-zA-Z0-9_.-]+','_',p) for p in fname_parts if p])
+                            safe_name='-'.join([_SAFE_NAME_RE.sub('_',p) for p in fname_parts if p])
                             dest=os.path.join(gql_dir, safe_name + '.graphql.json') if gql_dir else None
                             if dest:
                                 os.makedirs(os.path.dirname(dest), exist_ok=True)
@@ -719,7 +1072,6 @@ def _run_prerender(start_url: str, site_root: str, output_folder: str, max_pages
             routing_mode = 'strict'
             if routing_mode == 'strict':
                 try:
-                    import re as _re
                     # Only adjust internal absolute-path links (start with /) so they match saved filenames
                     def _norm_path(p: str) -> str:
                         if not p.startswith('/'):
@@ -735,8 +1087,7 @@ def _run_prerender(start_url: str, site_root: str, output_folder: str, max_pages
                         new_path = _norm_path(path)
                         return f"{attr}={quote}{new_path}{tail}{quote}"
                     # Pattern captures href|src="/path[optional ?# tail]"
-                    html = _re.sub(r'(href|src)=("|\')(/[^"\'#? ]*)([?#][^"\']*)?("|\')',
-                                   lambda m: _rewrite_attr((m.group(1), m.group(2), m.group(3), m.group(4))), html)
+                    html = _ROOT_LINK_ATTR_RE.sub(lambda m: _rewrite_attr((m.group(1), m.group(2), m.group(3), m.group(4))), html)
                 except Exception:
                     pass
             rel='index.html'
@@ -1050,6 +1401,35 @@ def _invoke(cb, name: str, *a):
         try: fn(*a)
         except Exception: pass
 
+def _iter_pipe_chunks(stream, chunk_size: int = 65536):
+    """Yield lists of decoded lines from a binary pipe.
+    Reads whatever is available (up to chunk_size) with one os.read instead of a
+    readline round trip per line; splits on LF, CR and CRLF like universal newlines
+    (wget2 redraws progress with bare carriage returns). A trailing partial line is
+    carried into the next read; terminators are stripped.
+    """
+    fd=stream.fileno(); pending=b''
+    while True:
+        chunk=os.read(fd, chunk_size)
+        if not chunk: break
+        parts=(pending+chunk).splitlines(True)
+        # hold back an unterminated tail, or a bare \r that may be the first half of \r\n
+        pending=parts.pop() if not parts[-1].endswith(b'\n') else b''
+        if parts: yield [ln.rstrip(b'\r\n').decode('utf-8','replace') for ln in parts]
+    if pending: yield [pending.rstrip(b'\r\n').decode('utf-8','replace')]
+
+def _iter_pipe_lines(stream, chunk_size: int = 65536):
+    for lines in _iter_pipe_chunks(stream, chunk_size): yield from lines
+
+# wget2 concurrency flags (str.startswith takes the tuple and checks both in one call).
+_THREAD_FLAG_PREFIXES = ('--max-threads=', '--jobs=')
+
+# wget2 progress-line patterns (compiled once; the reader applies them to every stderr line).
+# _PCT_RE: first whitespace-delimited 'NN%' token.
+_PCT_RE = re.compile(r'(?<!\S)(\d{1,3})%(?!\S)')
+_SPEED_RE = re.compile(r"(?P<val>\d+(?:\.\d+)?)(?P<unit>[KMG]?)(?:B?/s|/s)")
+_HTTP_CODE_RE = re.compile(r'HTTP/\d\.\d\s+(\d{3})')
+
 def _wget2_progress_run(cmd: List[str], cb: Optional[CloneCallbacks], save_path: Optional[str]=None, stream_raw: bool=False,
                         adaptive_tracker: Optional[dict]=None) -> bool:
     """Run wget2 streaming stderr to parse percentage + bandwidth, with enhanced diagnostics.
@@ -1061,58 +1441,65 @@ def _wget2_progress_run(cmd: List[str], cb: Optional[CloneCallbacks], save_path:
         stream_raw: When True, emit each raw stderr line to log (prefixed) for verbose transparency.
     """
     try:
-        proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, bufsize=1)
+        # No preexec_fn/user/group/umask kwargs on purpose: those force CPython's fork()+exec
+        # path, whereas plain Popen launches via vfork/posix_spawn and never copies the
+        # parent's page tables (matters when the GUI process has a large heap).
+        proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
     except FileNotFoundError:
         _invoke(cb, 'log', 'Error: wget2 not found.')
         return False
     last_pct=-1; last_rate=None; last_rate_time=0.0
-    import re
-    speed_re=re.compile(r"(?P<val>\d+(?:\.\d+)?)(?P<unit>[KMG]?)(?:B?/s|/s)")
     stream=proc.stderr; start=time.time()
-    from collections import deque
     last_lines: deque[str]=deque(maxlen=25)
     http_codes: List[int]=[]
+    save_fh=None
+    if save_path:
+        try: save_fh=open(save_path,'a',encoding='utf-8')
+        except Exception: save_fh=None
     if stream is not None:
-        for line in stream:
-            try:
-                if cb and getattr(cb,'is_canceled',None) and cb.is_canceled():
-                    try: proc.terminate()
+        try:
+            for line in _iter_pipe_lines(stream):
+                try:
+                    if cb and getattr(cb,'is_canceled',None) and cb.is_canceled():
+                        try: proc.terminate()
+                        except Exception: pass
+                        _invoke(cb,'log','[cancel] wget2 terminated'); return False
+                except Exception: pass
+                if not line: continue
+                ln=line.rstrip(); last_lines.append(ln)
+                if stream_raw and ln:  # surface raw line for verbose mode (helps diagnosing malformed URLs / ports)
+                    _invoke(cb,'log',f"[wget2] {ln}")
+                if save_fh is not None:
+                    try: save_fh.write(line+'\n')
                     except Exception: pass
-                    _invoke(cb,'log','[cancel] wget2 terminated'); return False
-            except Exception: pass
-            if not line: continue
-            ln=line.rstrip(); last_lines.append(ln)
-            if stream_raw and ln:  # surface raw line for verbose mode (helps diagnosing malformed URLs / ports)
-                _invoke(cb,'log',f"[wget2] {ln}")
-            if save_path:
+                # HTTP code collection
                 try:
-                    with open(save_path,'a',encoding='utf-8') as sf: sf.write(line)
+                    for m in _HTTP_CODE_RE.finditer(line):
+                        code=int(m.group(1));
+                        if 100<=code<=599 and code not in http_codes: http_codes.append(code)
+                except Exception: pass
+                # percent detection (most lines carry no '%'; skip them before touching the regex)
+                if '%' in line:
+                    pm=_PCT_RE.search(line)
+                    if pm:
+                        pct=int(pm.group(1))
+                        if pct<=100 and pct!=last_pct:
+                            last_pct=pct; _invoke(cb,'phase','clone',pct)
+                if 's' in line:
+                    m=_SPEED_RE.search(line)
+                # Adaptive tracking (collect counts)
+                if adaptive_tracker is not None:
+                    adaptive_tracker['lines'] += 1
+                    if any(sig in ln for sig in (' 500',' 502',' 503',' 504',' 429')):
+                        adaptive_tracker['err_lines'] += 1
+                    if m:
+                        unit=m.group('unit') or ''; val=m.group('val'); rate=f"{val}{unit}B/s" if unit else f"{val}B/s"; now=time.time()
+                        if (rate!=last_rate) and (now-last_rate_time)>0.25:
+                            last_rate=rate; last_rate_time=now; _invoke(cb,'bandwidth',rate)
+        finally:
+            if save_fh is not None:
+                try: save_fh.close()
                 except Exception: pass
-            # HTTP code collection
-            try:
-                for m in re.finditer(r'HTTP/\d\.\d\s+(\d{3})', line):
-                    code=int(m.group(1));
-                    if 100<=code<=599 and code not in http_codes: http_codes.append(code)
-            except Exception: pass
-            # percent detection
-            for tok in line.split():
-                if tok.endswith('%'):
-                    try: pct=int(tok[:-1])
-                    except ValueError: continue
-                    if 0<=pct<=100 and pct!=last_pct:
-                        last_pct=pct; _invoke(cb,'phase','clone',pct)
-                    break
-            if 's' in line:
-                m=speed_re.search(line)
-            # Adaptive tracking (collect counts)
-            if adaptive_tracker is not None:
-                adaptive_tracker['lines'] += 1
-                if any(sig in ln for sig in (' 500',' 502',' 503',' 504',' 429')):
-                    adaptive_tracker['err_lines'] += 1
-                if m:
-                    unit=m.group('unit') or ''; val=m.group('val'); rate=f"{val}{unit}B/s" if unit else f"{val}B/s"; now=time.time()
-                    if (rate!=last_rate) and (now-last_rate_time)>0.25:
-                        last_rate=rate; last_rate_time=now; _invoke(cb,'bandwidth',rate)
     proc.wait()
     malformed_host_count = len([l for l in last_lines if 'Missing host/domain in URI' in l])
     # Expose for outer scope manifest enrichment
@@ -1182,7 +1569,7 @@ def _wget2_progress(cmd: List[str], cb: Optional[CloneCallbacks], save_path: Opt
     if not new_jobs or new_jobs >= current_jobs:
         return False
     # Rebuild command removing existing thread flag
-    reduced_cmd=[t for t in cmd if not t.startswith('--max-threads=') and not t.startswith('--jobs=')]
+    reduced_cmd=[t for t in cmd if not t.startswith(_THREAD_FLAG_PREFIXES)]
     # Choose flag present in original or default to --max-threads
     flag='--max-threads'
     for t in cmd:
@@ -1294,6 +1681,99 @@ def _build_repro_command_from_config(cfg: CloneConfig) -> list[str]:
         cmd.append("--cleanup")
     return cmd
 
+# ---------------- Build templates -----------------
+# Build helpers removed by the cleanup phase (Dockerfile last: only when the build succeeded).
+_BUILD_ARTIFACTS = ('nginx.conf', 'Dockerfile')
+_DOCKERFILE_TMPL = ('FROM nginx:alpine\n'
+                    'COPY {rel}/ /usr/share/nginx/html\n'
+                    'COPY nginx.conf /etc/nginx/conf.d/default.conf\n'
+                    'EXPOSE {port}\n'
+                    'CMD ["nginx", "-g", "daemon off;"]\n')
+# Routing modes:
+# strict: 404 on missing files
+# spa: fallback all unknown paths to /index.html
+# ext: attempt extensionless -> add .html (e.g., /about -> /about.html) else 404
+# hybrid: extensionless first, then SPA fallback
+_NGINX_LOCATIONS = {
+    'strict':'location / { try_files $uri $uri/ =404; }',
+    'spa':'location / { try_files $uri $uri/ /index.html; }',
+    'ext':'location / { try_files $uri $uri/ $uri.html =404; }',
+    'hybrid':'location / { try_files $uri $uri/ $uri.html /index.html; }',
+}
+_NGINX_CSP = '    add_header Content-Security-Policy "script-src \'none\'; frame-src \'none\'" always;\n'
+_NGINX_CONF_TMPL = ('server {{\n'
+                    '    listen {port};\n'
+                    '    server_name localhost;\n'
+                    '    root /usr/share/nginx/html;\n'
+                    '    index index.html;\n'
+                    '{csp}'
+                    '    {location}\n'
+                    '}}\n')
+
+def _render_nginx_conf(port: int, routing_mode: str = 'strict', csp: bool = False) -> str:
+    return _NGINX_CONF_TMPL.format(port=int(port), csp=_NGINX_CSP if csp else '',
+                                   location=_NGINX_LOCATIONS.get(routing_mode, _NGINX_LOCATIONS['strict']))
+
+# README fragments: constant text is built once at import; per-run fields are %-substituted.
+_README_REQUIREMENTS = ("## Requirements\n"
+    "- wget2 (parallel mirroring)\n"
+    "- Docker (optional for build/run)\n"
+    "- Python 3.8+ (headless mode)\n"
+    "- Optional: browser_cookie3 (browser cookie import)\n\n")
+_README_FOLDER_CONF = ("server {\n    listen %(container_port)s;\n    server_name localhost;\n    root /usr/share/nginx/html;\n"
+    "    index index.html;\n    location / { try_files $uri $uri/ =404; }\n}\n")
+_README_RUN_TMPL = ("## Paths\n"
+    "Output folder: %(abs_output)s\n\n"
+    "Site root (detected): %(abs_site_root)s\n\n"
+    "## Build / Run\n"
+    "%(build_status)s\n\n"
+    "Run built image:\n\n"
+    "```bash\n%(run_prefix)s %(image_tag)s\n```\n\n"
+    "Serve folder directly (no image build):\n\n"
+    "```bash\ncat > _folder.default.conf <<'CONF'\n" + _README_FOLDER_CONF + "CONF\n\n"
+    "%(run_prefix)s \\\n+  -v %(site_mount)s \\\n"
+    "+  -v \"$(pwd)/_folder.default.conf\":/etc/nginx/conf.d/default.conf:ro \\\n+  nginx:alpine\n```\n\n"
+    "Open: http://%(host_for_url)s:%(host_port)s\n\n"
+    "## Headless Example\n\n"
+    "```bash\npython cw2dt.py --headless --url '%(url)s' --dest '%(dest)s' --docker-name '%(image_tag)s' --jobs %(jobs)s%(flags)s\n```\n")
+_README_WINDOWS_PS = ("\n### Windows (PowerShell) Quick Run\n\n"
+    "```powershell\npy cw2dt.py --headless --url '%(url)s' --dest '%(dest)s' --docker-name '%(image_tag)s' --jobs %(jobs)s%(flags)s\n```\n"
+    "\n### Windows Folder Mode (PowerShell)\n\n"
+    "```powershell\n$conf = @'\n" + _README_FOLDER_CONF + "'@\n"
+    "Set-Content -Path _folder.default.conf -Value $conf -NoNewline\n"
+    "%(run_prefix)s `\n"
+    "  -v %(site_mount)s `\n"
+    "  -v \"$PWD\\_folder.default.conf\":/etc/nginx/conf.d/default.conf:ro `\n  nginx:alpine\n```\n")
+_README_TROUBLESHOOTING = ("\n### Troubleshooting\n"
+    "- wget2 missing: install via brew/apt/etc.\n"
+    "- Docker permission denied: add user to docker group or use sudo.\n"
+    "- Router interception found no routes: increase --router-settle-ms or adjust allow/deny patterns.\n"
+    "- Checksums slow: skip --checksums then verify later.\n"
+    "- Parallel jobs issues: lower --jobs if remote throttles.\n"
+    "- API capture empty: ensure JSON content-type and same-origin.\n"
+    "- Incremental diff: first run seeds state; re-run with --diff-latest.\n")
+_README_SECURITY_NOTE = ("\n### Security Note\nCredentials passed with --auth-user/--auth-pass may be visible in local process listings. "
+    "Consider alternate storage if sensitive.\n")
+
+# Internal link rewriting (post-clone): host-qualified attrs / CSS url()s, malformed schemes, extensionless anchors.
+_LINK_ATTR_RE = re.compile(r'(href|src|action)=("|\')(?:https?:)?//([^/\"\'>]+)(/[^\"\'> ]*)?("|\')', re.IGNORECASE)
+_LINK_CSS_URL_RE = re.compile(r'url\(("|\')?(?:https?:)?//([^/\)"\']+)(/[^\)"\']*)("|\')?\)', re.IGNORECASE)
+_LINK_COLLAPSE_RE = re.compile(r'((?:href|src|action)=)("|\')https?:///+([^"\'>]+)("|\')', re.IGNORECASE)
+_LINK_EXTLESS_RE = re.compile(r'(href)=("|\')(/([a-z0-9\-]+))("|\')', re.IGNORECASE)
+_STRAY_SCHEME_RE = re.compile(r'https?:///+')
+
+# Host of a URL with or without scheme (userinfo and port dropped); compiled once instead of urlparse per call.
+# host is either a bracketed IPv6 literal (group 1, brackets dropped like urlparse().hostname) or a name/IPv4
+_URL_HOST_RE = re.compile(r'^\s*(?:(?:[a-z][a-z0-9+.\-]*:)?//)?(?:[^@/?#]*@)?(?:\[([^\]/?#\s]*)\]|([^/:?#\s\[]+))', re.IGNORECASE)
+
+def _url_host(url: str) -> str:
+    m=_URL_HOST_RE.match(url or '')
+    return (m.group(1) or m.group(2) or '').lower() if m else ''
+
+def _write_text_once(path: str, text: str):
+    """Encode once and hand the whole payload to a single unbuffered write."""
+    with open(path,'wb',buffering=0) as f: f.write(text.encode('utf-8'))
+
 def clone_site(cfg: CloneConfig, callbacks: Optional[CloneCallbacks] = None) -> CloneResult:
     """Orchestrate full clone pipeline (mirroring, prerender, post-processing, docker, plugins, diff).
     Thread-safe for GUI usage (no global mutable state besides optional Playwright)."""
@@ -1306,6 +1786,7 @@ def clone_site(cfg: CloneConfig, callbacks: Optional[CloneCallbacks] = None) ->
     # Structured event context
     run_id = uuid.uuid4().hex
     seq_counter = {'n': 0}
+    j_lock = threading.RLock()  # events may come from the background estimate thread
     # Try to load a tool version if VERSION.txt co-located (best effort)
     tool_version = 'unknown'
     try:
@@ -1321,24 +1802,25 @@ def clone_site(cfg: CloneConfig, callbacks: Optional[CloneCallbacks] = None) ->
         if not cfg.json_logs and not cfg.events_file:
             return
         try:
-            seq_counter['n'] += 1
-            payload = {
-                'event': event,
-                'ts': datetime.now(timezone.utc).isoformat(),
-                'seq': seq_counter['n'],
-                'run_id': run_id,
-                'schema_version': SCHEMA_VERSION,
-                'tool_version': tool_version,
-                **data
-            }
-            if cfg.json_logs:
-                _invoke(callbacks, 'log', json.dumps(payload))
-            if cfg.events_file:
-                try:
-                    with open(cfg.events_file,'a',encoding='utf-8') as ef:
-                        ef.write(json.dumps(payload)+'\n')
-                except Exception:
-                    pass
+            with j_lock:
+                seq_counter['n'] += 1
+                payload = {
+                    'event': event,
+                    'ts': datetime.now(timezone.utc).isoformat(),
+                    'seq': seq_counter['n'],
+                    'run_id': run_id,
+                    'schema_version': SCHEMA_VERSION,
+                    'tool_version': tool_version,
+                    **data
+                }
+                if cfg.json_logs:
+                    _invoke(callbacks, 'log', json.dumps(payload))
+                if cfg.events_file:
+                    try:
+                        with open(cfg.events_file,'a',encoding='utf-8') as ef:
+                            ef.write(json.dumps(payload)+'\n')
+                    except Exception:
+                        pass
         except Exception:
             pass
     # Helper: compute final output folder without duplicating project name if user already included it in dest
@@ -1439,6 +1921,7 @@ def clone_site(cfg: CloneConfig, callbacks: Optional[CloneCallbacks] = None) ->
     loaded_plugins = []
     if cfg.plugins_dir and os.path.isdir(cfg.plugins_dir):
         try:
+            import importlib.util
             for fn in os.listdir(cfg.plugins_dir):
                 if not fn.endswith('.py'): continue
                 path=os.path.join(cfg.plugins_dir, fn); mod_name=f'_cw2dt_plugin_{fn[:-3]}'
@@ -1461,14 +1944,39 @@ def clone_site(cfg: CloneConfig, callbacks: Optional[CloneCallbacks] = None) ->
             try: hook({'url':cfg.url,'dest':cfg.dest,'output_folder':output_folder})
             except Exception: pass
     j('start', url=cfg.url, output=output_folder)
-    if cfg.estimate_first:
+    # Estimate runs in the background so the spider's network round trips overlap the
+    # real clone instead of delaying it; _finish_estimate() stops it once cloning ends.
+    est_state={'thread':None,'proc':None,'stopped':False}
+    def _on_spider_start(proc):
+        est_state['proc']=proc
+        if est_state['stopped']:
+            try: proc.terminate()
+            except Exception: pass
+    def _estimate_bg(url: str):
         try:
-            est=_cli_estimate_with_spider(cfg.url)
-            if est:
+            est=_cli_estimate_with_spider(url, on_start=_on_spider_start)
+            if est and not est_state['stopped']:
                 log(f"[estimate] ~{est} items (pre-spider)")
                 j('estimate', count=est)
         except Exception as e:
             log(f"[estimate] failed: {e}")
+    def _finish_estimate():
+        t=est_state['thread']
+        if t is None: return
+        est_state['thread']=None; est_state['stopped']=True
+        proc=est_state['proc']
+        if t.is_alive() and proc is not None and proc.poll() is None:
+            try: proc.terminate()
+            except Exception: pass
+            log('[estimate] clone finished before the spider; estimate stopped')
+        t.join(timeout=2)
+    # Normalize URL scheme early (avoid bare host causing inconsistent origin parsing downstream);
+    # done before the estimate thread starts, which gets the normalized URL as an argument
+    if '://' not in cfg.url:
+        cfg.url = 'https://' + cfg.url.strip()
+    if cfg.estimate_first:
+        est_state['thread']=threading.Thread(target=_estimate_bg, args=(cfg.url,), name='cw2dt-estimate', daemon=True)
+        est_state['thread'].start()
     # Build command
     # Pre-clone resume statistics
     pre_total = pre_partials = 0
@@ -1478,9 +1986,6 @@ def clone_site(cfg: CloneConfig, callbacks: Optional[CloneCallbacks] = None) ->
             log(f"[resume] before: files={pre_total} partials={pre_partials}")
     except Exception:
         pass
-    # Normalize URL scheme early (avoid bare host causing inconsistent origin parsing downstream)
-    if '://' not in cfg.url:
-        cfg.url = 'https://' + cfg.url.strip()
     wget_cmd = [ 'wget2','-e','robots=off','--mirror','--convert-links','--adjust-extension','--page-requisites','--no-parent','--continue','--progress=dot:mega', cfg.url,'-P', output_folder ]
     # Resilient first-pass network hardening
     if getattr(cfg,'resilient',False):
@@ -1510,24 +2015,14 @@ def clone_site(cfg: CloneConfig, callbacks: Optional[CloneCallbacks] = None) ->
     # Optional browser cookie import (best effort)
     imported_cookie_path=None
     if cfg.import_browser_cookies:
-        from urllib.parse import urlparse
-        parsed=urlparse(cfg.url)
-        domain=parsed.hostname or ''
+        domain=_url_host(cfg.url)  # also works for scheme-less input (urlparse().hostname would be None -> no filter)
         try:
-            try:
-                import browser_cookie3  # type: ignore
-            except ModuleNotFoundError:
-                log('[deps] installing browser_cookie3...')
-                try:
-                    subprocess.check_call([sys.executable,'-m','pip','install','browser_cookie3'])
-                    import browser_cookie3  # type: ignore
-                except Exception as e:
-                    log(f"[cookies] browser_cookie3 install failed: {e}")
-                    browser_cookie3=None  # type: ignore
-            if 'browser_cookie3' in locals() or 'browser_cookie3' in globals():
+            browser_cookie3=_load_browser_cookie3(log)
+            if browser_cookie3:
                 try:
                     cj=browser_cookie3.load()  # type: ignore
-                    lines=[]
+                    lines=[]; seen_keys=set()  # browser_cookie3 merges profiles/browsers: same cookie can repeat
+                    default_exp=str(int(time.time())+3600); bools=('FALSE','TRUE')
                     for c in cj:  # type: ignore
                         try:
                             dom=getattr(c,'domain','') or ''
@@ -1538,17 +2033,17 @@ def clone_site(cfg: CloneConfig, callbacks: Optional[CloneCallbacks] = None) ->
                                 continue
                             value=getattr(c,'value','') or ''
                             path=getattr(c,'path','/') or '/'
-                            secure='TRUE' if getattr(c,'secure',False) else 'FALSE'
-                            expires=str(int(getattr(c,'expires', int(time.time())+3600)))
-                            flag='TRUE' if dom.startswith('.') else 'FALSE'
-                            lines.append(f"{dom}\t{flag}\t{path}\t{secure}\t{expires}\t{name}\t{value}")
+                            key=(dom,path,name)
+                            if key in seen_keys: continue
+                            seen_keys.add(key)
+                            exp=getattr(c,'expires',None)  # None for session cookies
+                            lines.append('\t'.join((dom, bools[dom.startswith('.')], path, bools[bool(getattr(c,'secure',False))],
+                                                     default_exp if exp is None else str(int(exp)), name, value)))
                         except Exception:
                             continue
                     if lines:
                         imported_cookie_path=os.path.join(output_folder,'imported_cookies.txt')
-                        with open(imported_cookie_path,'w',encoding='utf-8') as cf:
-                            cf.write('# Netscape HTTP Cookie File\n')
-                            for ln in lines: cf.write(ln+'\n')
+                        _write_text_once(imported_cookie_path, '# Netscape HTTP Cookie File\n'+'\n'.join(lines)+'\n')
                         wget_cmd += ['--load-cookies', imported_cookie_path]
                         log(f"[cookies] imported {len(lines)} cookies")
                     else:
@@ -1585,7 +2080,7 @@ def clone_site(cfg: CloneConfig, callbacks: Optional[CloneCallbacks] = None) ->
                 new_jobs = 24
                 log(f"[adaptive] reducing initial jobs {cfg.jobs}->${new_jobs} (preemptive)")
                 # Remove previously appended concurrency token if present then re-add
-                wget_cmd[:] = [t for t in wget_cmd if not t.startswith('--max-threads=') and not t.startswith('--jobs=')]
+                wget_cmd[:] = [t for t in wget_cmd if not t.startswith(_THREAD_FLAG_PREFIXES)]
                 if _wget2_supports('--max-threads'):
                     wget_cmd.append(f"--max-threads={new_jobs}")
                 elif _wget2_supports('--jobs'):
@@ -1636,6 +2131,7 @@ def clone_site(cfg: CloneConfig, callbacks: Optional[CloneCallbacks] = None) ->
     log('[clone] Running wget2...')
     j('phase_start', phase='clone')
     if _canceled('clone'):
+        _finish_estimate()
         j('summary', success=False, canceled=True)
         return CloneResult(False, False, output_folder, output_folder, None, None, {})
     stderr_save=None
@@ -1647,12 +2143,12 @@ def clone_site(cfg: CloneConfig, callbacks: Optional[CloneCallbacks] = None) ->
     success=_wget2_progress(wget_cmd, callbacks, save_path=stderr_save, stream_raw=getattr(cfg,'verbose_wget',False),
                             adaptive_enabled=getattr(cfg,'adaptive_concurrency',False), current_jobs=getattr(cfg,'jobs',0),
                             structured_event_cb=lambda p: j(p.get('event','adaptive'), **{k:v for k,v in p.items() if k!='event'}))
+    _finish_estimate()
     # Analyze stderr for failure metrics (even on success we may want ratio)
     failure_stats={}
     def _parse_wget_stderr(path:str)->dict:
         stats={'http_4xx':0,'http_5xx':0,'dns_errors':0,'tls_errors':0,'other_errors':0,'total_urls':0}
         try:
-            import re
             if not os.path.exists(path): return stats
             with open(path,'r',encoding='utf-8',errors='ignore') as sf:
                 for line in sf:
@@ -1661,9 +2157,9 @@ def clone_site(cfg: CloneConfig, callbacks: Optional[CloneCallbacks] = None) ->
                     # crude URL fetched heuristic
                     if l.startswith('URL:') or ' -> ' in l:
                         stats['total_urls']+=1
-                    if 'ERROR 4' in l or re.search(r'ERROR (40[0-9])', l):
+                    if 'ERROR 4' in l:  # also covers 'ERROR 40x'
                         stats['http_4xx']+=1
-                    elif 'ERROR 5' in l or re.search(r'ERROR (50[0-9])', l):
+                    elif 'ERROR 5' in l:
                         stats['http_5xx']+=1
                     elif 'TLS handshake' in l or 'certificate' in l.lower():
                         stats['tls_errors']+=1
@@ -1685,7 +2181,7 @@ def clone_site(cfg: CloneConfig, callbacks: Optional[CloneCallbacks] = None) ->
     if not success and getattr(cfg,'auto_backoff',False) and cfg.jobs and cfg.jobs>4:
         log('[backoff] initial clone failed – attempting single reduced-concurrency retry...')
         reduced=max(2, int(cfg.jobs/2))
-        wget_cmd=[t for t in wget_cmd if not t.startswith('--max-threads=') and not t.startswith('--jobs=')]
+        wget_cmd=[t for t in wget_cmd if not t.startswith(_THREAD_FLAG_PREFIXES)]
         if _wget2_supports('--max-threads'):
             wget_cmd.append(f"--max-threads={reduced}")
         elif _wget2_supports('--jobs'):
@@ -1703,7 +2199,7 @@ def clone_site(cfg: CloneConfig, callbacks: Optional[CloneCallbacks] = None) ->
         log(f"[quality] High error ratio {failure_stats['error_ratio']:.2%} > threshold; adaptive second attempt")
         # Concurrency reduction
         if cfg.jobs and cfg.jobs>2:
-            wget_cmd=[t for t in wget_cmd if not t.startswith('--max-threads=') and not t.startswith('--jobs=')]
+            wget_cmd=[t for t in wget_cmd if not t.startswith(_THREAD_FLAG_PREFIXES)]
             reduced=max(2,int(cfg.jobs/2))
             if _wget2_supports('--max-threads'):
                 wget_cmd.append(f"--max-threads={reduced}")
@@ -1745,10 +2241,12 @@ def clone_site(cfg: CloneConfig, callbacks: Optional[CloneCallbacks] = None) ->
     else:
         j('clone_quality', degraded=False, error_ratio=failure_stats.get('error_ratio',0.0))
     j('phase_end', phase='clone')
-    site_root = find_site_root(output_folder)
+    # One pass for site root, resume counts and the HTML list (reused by the JS strip)
+    post_scan = scan_output(output_folder)
+    site_root = post_scan.site_root
     # Post-clone resume delta
     try:
-        post_total, post_partials = count_files_and_partials(output_folder)
+        post_total, post_partials = post_scan.total, post_scan.partials
         new_downloaded = max(0, post_total - pre_total)
         log(f"[resume] after: files={post_total} partials={post_partials} new={new_downloaded}")
     except Exception:
@@ -1758,6 +2256,7 @@ def clone_site(cfg: CloneConfig, callbacks: Optional[CloneCallbacks] = None) ->
     if cfg.prerender:
         # Lightweight preflight to detect closed event loop
         try:
+            import asyncio
             loop=asyncio.get_event_loop_policy().get_event_loop()
             if getattr(loop,'is_closed',None) and loop.is_closed():
                 log('[prerender] preflight detected closed event loop; skipping prerender')
@@ -1792,10 +2291,12 @@ def clone_site(cfg: CloneConfig, callbacks: Optional[CloneCallbacks] = None) ->
                             except Exception: pass
                     except Exception:
                         pass
+                last_pr_pct=[-1]
                 def _pr_progress(pct):
                     if _canceled('prerender'):
                         raise RuntimeError('__CANCEL_PRERENDER__')
-                    _invoke(callbacks,'phase','prerender',pct)
+                    if pct!=last_pr_pct[0]:
+                        last_pr_pct[0]=pct; _invoke(callbacks,'phase','prerender',pct)
                 prer_stats=_run_prerender(
                     start_url=cfg.url,
                     site_root=site_root,
@@ -1910,31 +2411,13 @@ def clone_site(cfg: CloneConfig, callbacks: Optional[CloneCallbacks] = None) ->
     # Strip JS if requested
     if cfg.disable_js:
         try:
-            import re
-            script_re = re.compile(r"<script\b[^>]*>.*?</script>", re.IGNORECASE | re.DOTALL)
-            stripped=0; scanned=0; scripts_removed=0; inline_removed=0
-            for base,_,files in os.walk(site_root):
-                for fn in files:
-                    if fn.lower().endswith(('.html','.htm')):
-                        scanned += 1
-                        p=os.path.join(base,fn)
-                        try:
-                            with open(p,'r',encoding='utf-8',errors='ignore') as f: txt=f.read()
-                            # Count scripts before removal
-                            scripts = script_re.findall(txt)
-                            if scripts:
-                                for s in scripts:
-                                    if 'src=' in s.lower(): scripts_removed += 1
-                                    else: inline_removed += 1
-                            new_txt=script_re.sub('',txt)
-                            if new_txt!=txt:
-                                with open(p,'w',encoding='utf-8') as f: f.write(new_txt)
-                                stripped += 1
-                        except Exception:
-                            continue
-            js_strip_stats['scanned']=scanned; js_strip_stats['stripped']=stripped
-            js_strip_stats['scripts_removed']=scripts_removed; js_strip_stats['inline_scripts_removed']=inline_removed
-            log(f"[js] stripped <script> from {stripped}/{scanned} HTML files (external={scripts_removed} inline={inline_removed})")
+            # prerender writes pages after the scan; only reuse its HTML list when it did not run
+            html_paths=None
+            if not cfg.prerender:
+                prefix=site_root.rstrip(os.sep)+os.sep
+                html_paths=[p for p in post_scan.html_files if p.startswith(prefix)]
+            js_strip_stats.update(_strip_js_tree(site_root, paths=html_paths))
+            log(f"[js] stripped <script> from {js_strip_stats['stripped']}/{js_strip_stats['scanned']} HTML files (external={js_strip_stats['scripts_removed']} inline={js_strip_stats['inline_scripts_removed']})")
         except Exception as e:
             log(f"[js] strip failed: {e}")
 
@@ -1953,77 +2436,71 @@ def clone_site(cfg: CloneConfig, callbacks: Optional[CloneCallbacks] = None) ->
                 internal_hosts.add(origin_host[4:])
             else:
                 internal_hosts.add('www.'+origin_host)
-            import re as _re
-            attr_pattern=_re.compile(r'(href|src|action)=("|\')(?:https?:)?//([^/\"\'>]+)(/[^\"\'> ]*)?("|\')', _re.IGNORECASE)
-            css_url_pattern=_re.compile(r'url\(("|\')?(?:https?:)?//([^/\)"\']+)(/[^\)"\']*)("|\')?\)', _re.IGNORECASE)
-            collapse_scheme_pattern=_re.compile(r'((?:href|src|action)=)("|\')https?:///+([^"\'>]+)("|\')', _re.IGNORECASE)
+            attr_pattern=_LINK_ATTR_RE; css_url_pattern=_LINK_CSS_URL_RE; collapse_scheme_pattern=_LINK_COLLAPSE_RE
             # Collect top-level html page names for extensionless mapping (strict mode only)
             routing_mode=(getattr(cfg,'routing_mode','strict') or 'strict').lower()
             top_level_html=set()
             if routing_mode=='strict':
                 try:
-                    for _b,_d,_f in os.walk(site_root):
-                        for _fn in _f:
-                            if _fn.lower().endswith('.html'):
-                                rel=os.path.relpath(os.path.join(_b,_fn), site_root)
-                                if '/' not in rel:  # root only
-                                    top_level_html.add(_fn[:-5])  # strip .html
-                        # Do not descend further than root for top-level collection
-                        break
+                    # root only: one scandir of site_root (os.walk + break still built a walker and a relpath per file)
+                    with os.scandir(site_root) as it:
+                        for _e in it:
+                            if _e.name.lower().endswith('.html') and not _e.is_dir():
+                                top_level_html.add(_e.name[:-5])  # strip .html
                 except Exception:
                     pass
             # Regex to locate extensionless internal anchors (strict mode)
-            extless_pattern=_re.compile(r'(href)=("|\')(/([a-z0-9\-]+))("|\')', _re.IGNORECASE)
+            extless_pattern=_LINK_EXTLESS_RE
 
-            for base,_,files in os.walk(site_root):
-                for fn in files:
-                    if not fn.lower().endswith(('.html','.htm','.css')): continue
-                    p=os.path.join(base,fn)
+            for _e in _iter_files(site_root):
+                low=_e.name.lower()
+                if not low.endswith(('.html','.htm','.css')): continue
+                p=_e.path
+                try:
+                    with open(p,'r',encoding='utf-8',errors='ignore') as f: txt=f.read()
+                except Exception:
+                    continue
+                original=txt
+                # Phase 1: host -> relative
+                def _attr_sub(m):
+                    full_host=m.group(3).lower(); path=m.group(4) or '/'
+                    if full_host in internal_hosts:
+                        rewrite_internal_links_stats['rewritten']+=1
+                        return f"{m.group(1)}={m.group(2)}{path}{m.group(5)}"
+                    return m.group(0)
+                txt=attr_pattern.sub(_attr_sub, txt)
+                def _css_sub(m):
+                    full_host=m.group(2).lower(); path=m.group(3) or '/'
+                    if full_host in internal_hosts:
+                        rewrite_internal_links_stats['rewritten']+=1
+                        return f"url({path})"
+                    return m.group(0)
+                if low.endswith('.css') or 'url(' in txt:
+                    txt=css_url_pattern.sub(_css_sub, txt)
+                # Phase 2: collapse malformed schemes (https:///path -> /path)
+                before_collapse=txt
+                def _collapse(m):
+                    rewrite_internal_links_stats['collapsed']+=1
+                    return f"{m.group(1)}{m.group(2)}/{m.group(3)}{m.group(4)}" if m.group(3).startswith('/') else f"{m.group(1)}{m.group(2)}/{m.group(3)}{m.group(4)}"
+                txt=collapse_scheme_pattern.sub(lambda m: f"{m.group(1)}{m.group(2)}/{m.group(3)}{m.group(4)}", txt)
+                # Additionally replace any stray http:/// or https:/// not inside attributes (rare) -> /
+                txt=_STRAY_SCHEME_RE.sub('/', txt)
+                # Phase 3: strict mode extensionless -> .html mapping
+                if routing_mode=='strict' and top_level_html:
+                    def _extless(m):
+                        path_no_slash=m.group(3).lstrip('/')
+                        name=path_no_slash.split('/',1)[0]
+                        if name in top_level_html and name not in ('index','favicon') and '.' not in name:
+                            rewrite_internal_links_stats['ext_added']+=1
+                            return f"{m.group(1)}={m.group(2)}{m.group(3)}.html{m.group(5)}"
+                        return m.group(0)
+                    txt=extless_pattern.sub(_extless, txt)
+                if txt!=original:
                     try:
-                        with open(p,'r',encoding='utf-8',errors='ignore') as f: txt=f.read()
+                        with open(p,'w',encoding='utf-8') as f: f.write(txt)
                     except Exception:
-                        continue
-                    original=txt
-                    # Phase 1: host -> relative
-                    def _attr_sub(m):
-                        full_host=m.group(3).lower(); path=m.group(4) or '/'
-                        if full_host in internal_hosts:
-                            rewrite_internal_links_stats['rewritten']+=1
-                            return f"{m.group(1)}={m.group(2)}{path}{m.group(5)}"
-                        return m.group(0)
-                    txt=attr_pattern.sub(_attr_sub, txt)
-                    def _css_sub(m):
-                        full_host=m.group(2).lower(); path=m.group(3) or '/'
-                        if full_host in internal_hosts:
-                            rewrite_internal_links_stats['rewritten']+=1
-                            return f"url({path})"
-                        return m.group(0)
-                    if fn.lower().endswith('.css') or 'url(' in txt:
-                        txt=css_url_pattern.sub(_css_sub, txt)
-                    # Phase 2: collapse malformed schemes (https:///path -> /path)
-                    before_collapse=txt
-                    def _collapse(m):
-                        rewrite_internal_links_stats['collapsed']+=1
-                        return f"{m.group(1)}{m.group(2)}/{m.group(3)}{m.group(4)}" if m.group(3).startswith('/') else f"{m.group(1)}{m.group(2)}/{m.group(3)}{m.group(4)}"
-                    txt=collapse_scheme_pattern.sub(lambda m: f"{m.group(1)}{m.group(2)}/{m.group(3)}{m.group(4)}", txt)
-                    # Additionally replace any stray http:/// or https:/// not inside attributes (rare) -> /
-                    txt=_re.sub(r'https?:///+','/', txt)
-                    # Phase 3: strict mode extensionless -> .html mapping
-                    if routing_mode=='strict' and top_level_html:
-                        def _extless(m):
-                            path_no_slash=m.group(3).lstrip('/')
-                            name=path_no_slash.split('/',1)[0]
-                            if name in top_level_html and name not in ('index','favicon') and '.' not in name:
-                                rewrite_internal_links_stats['ext_added']+=1
-                                return f"{m.group(1)}={m.group(2)}{m.group(3)}.html{m.group(5)}"
-                            return m.group(0)
-                        txt=extless_pattern.sub(_extless, txt)
-                    if txt!=original:
-                        try:
-                            with open(p,'w',encoding='utf-8') as f: f.write(txt)
-                        except Exception:
-                            pass
-                    rewrite_internal_links_stats['processed']+=1
+                        pass
+                rewrite_internal_links_stats['processed']+=1
             log(f"[rewrite] internal link normalization complete: files={rewrite_internal_links_stats['processed']} replaced={rewrite_internal_links_stats['rewritten']} collapsed={rewrite_internal_links_stats['collapsed']} ext_added={rewrite_internal_links_stats['ext_added']}")
             j('rewrite_links', **rewrite_internal_links_stats)
         except Exception as e:
@@ -2032,35 +2509,12 @@ def clone_site(cfg: CloneConfig, callbacks: Optional[CloneCallbacks] = None) ->
             except Exception: pass
     # Dockerfile & nginx.conf
     rel_root = os.path.relpath(site_root, output_folder)
-    with open(os.path.join(output_folder,'Dockerfile'),'w',encoding='utf-8') as f:
-        f.write('FROM nginx:alpine\n'
-                f'COPY {rel_root}/ /usr/share/nginx/html\n'
-                'COPY nginx.conf /etc/nginx/conf.d/default.conf\n'
-                f'EXPOSE {int(cfg.container_port)}\n'
-                'CMD ["nginx", "-g", "daemon off;"]\n')
-    with open(os.path.join(output_folder,'nginx.conf'),'w',encoding='utf-8') as f:
-        parts=['server {\n', f'    listen {int(cfg.container_port)};\n','    server_name localhost;\n','    root /usr/share/nginx/html;\n','    index index.html;\n']
-        if cfg.disable_js:
-            parts.append('    add_header Content-Security-Policy "script-src \'none\'; frame-src \'none\'" always;\n')
-        # Routing modes:
-        # strict: 404 on missing files (current behavior)
-        # spa: fallback all unknown paths to /index.html
-        # ext: attempt extensionless -> add .html (e.g., /about -> /about.html) else 404
-        # hybrid: extensionless first, then SPA fallback
-        rm=(getattr(cfg,'routing_mode','strict') or 'strict').lower()
-        if rm=='spa':
-            parts.append('    location / { try_files $uri $uri/ /index.html; }\n')
-        elif rm=='ext':
-            parts.append('    location / { try_files $uri $uri/ $uri.html =404; }\n')
-        elif rm=='hybrid':
-            parts.append('    location / { try_files $uri $uri/ $uri.html /index.html; }\n')
-        else:  # strict
-            parts.append('    location / { try_files $uri $uri/ =404; }\n')
-        parts.append('}\n'); f.write(''.join(parts))
+    rm=(getattr(cfg,'routing_mode','strict') or 'strict').lower()
+    conf_txt=_render_nginx_conf(int(cfg.container_port), rm, csp=cfg.disable_js)
+    _write_text_once(os.path.join(output_folder,'Dockerfile'), _DOCKERFILE_TMPL.format(rel=rel_root, port=int(cfg.container_port)))
+    _write_text_once(os.path.join(output_folder,'nginx.conf'), conf_txt)
     # Validate nginx.conf correctness (structure & key directives)
     try:
-        conf_path=os.path.join(output_folder,'nginx.conf')
-        with open(conf_path,'r',encoding='utf-8',errors='ignore') as _cf: conf_txt=_cf.read()
         issues=[]; warnings=[]
         def _expect(fragment, desc):
             if fragment not in conf_txt:
@@ -2068,14 +2522,7 @@ def clone_site(cfg: CloneConfig, callbacks: Optional[CloneCallbacks] = None) ->
         _expect(f"listen {int(cfg.container_port)};","listen directive")
         _expect('root /usr/share/nginx/html;','root directive')
         _expect('index index.html;','index directive')
-        rm=(getattr(cfg,'routing_mode','strict') or 'strict').lower()
-        expected_map={
-            'strict':'location / { try_files $uri $uri/ =404; }',
-            'spa':'location / { try_files $uri $uri/ /index.html; }',
-            'ext':'location / { try_files $uri $uri/ $uri.html =404; }',
-            'hybrid':'location / { try_files $uri $uri/ $uri.html /index.html; }'
-        }
-        _expect(expected_map.get(rm, expected_map['strict']),'location try_files rule')
+        _expect(_NGINX_LOCATIONS.get(rm, _NGINX_LOCATIONS['strict']),'location try_files rule')
         if cfg.disable_js and 'Content-Security-Policy' not in conf_txt:
             warnings.append('CSP header expected (disable_js enabled)')
         if not issues and not warnings:
@@ -2102,19 +2549,14 @@ def clone_site(cfg: CloneConfig, callbacks: Optional[CloneCallbacks] = None) ->
             t_build_start=time.time(); log(f"[docker] building image {cfg.docker_name}")
             j('phase_start', phase='build', image=cfg.docker_name)
             rc=_cli_run_stream(['docker','build','-t', cfg.docker_name, output_folder])
+            build_tail=getattr(rc,'tail',())
             docker_success = (rc == 0)
             docker_built_flag = docker_success
             if not docker_success:
-                # Try to surface last lines of build log by re-running in quiet mode capturing tail (best effort)
-                try:
-                    res=subprocess.run(['docker','build','-t', cfg.docker_name, output_folder],capture_output=True,text=True,timeout=120)
-                    tail='\n'.join((res.stdout.splitlines() if res.stdout else [])[-12:])
-                    log('[docker] build failed')
-                    if tail:
-                        for ln in tail.splitlines():
-                            log('[docker][tail] '+ln)
-                except Exception:
-                    log('[docker] build failed (no detail)')
+                # Surface the last lines of the build log captured while streaming
+                log('[docker] build failed' if build_tail else '[docker] build failed (no detail)')
+                for ln in build_tail:
+                    if ln: log('[docker][tail] '+ln)
             t_build_end=time.time()
             _invoke(callbacks,'phase','build',100)
             j('phase_end', phase='build', success=docker_success)
@@ -2133,22 +2575,7 @@ def clone_site(cfg: CloneConfig, callbacks: Optional[CloneCallbacks] = None) ->
         bind_ip = normalize_ip(cfg.bind_ip); host_p=int(cfg.host_port); cont_p=int(cfg.container_port)
         conf_path=os.path.join(site_root,f'.folder.default.{cont_p}.conf')
         try:
-            with open(conf_path,'w',encoding='utf-8') as f:
-                rm=(getattr(cfg,'routing_mode','strict') or 'strict').lower()
-                if rm=='spa':
-                    loc='    location / { try_files $uri $uri/ /index.html; }\n'
-                elif rm=='ext':
-                    loc='    location / { try_files $uri $uri/ $uri.html =404; }\n'
-                elif rm=='hybrid':
-                    loc='    location / { try_files $uri $uri/ $uri.html /index.html; }\n'
-                else:
-                    loc='    location / { try_files $uri $uri/ =404; }\n'
-                f.write('server {\n'
-                        f'    listen {cont_p};\n'
-                        '    server_name localhost;\n'
-                        '    root /usr/share/nginx/html;\n'
-                        '    index index.html;\n'
-                        f'{loc}' '}' '\n')
+            _write_text_once(conf_path, _render_nginx_conf(cont_p, rm))
         except Exception as e:
             log(f'[serve] config failed: {e}')
         cmd=['docker','run','-d','-p', f'{bind_ip}:{host_p}:{cont_p}','-v', f'{site_root}:/usr/share/nginx/html','-v', f'{conf_path}:/etc/nginx/conf.d/default.conf:ro','nginx:alpine']
@@ -2158,7 +2585,9 @@ def clone_site(cfg: CloneConfig, callbacks: Optional[CloneCallbacks] = None) ->
             url_out=f'http://{host}:{host_p}'; started=True; log(f'[serve] folder served at {url_out} (ID {cid})')
             j('serve_folder', url=url_out, id=cid)
     if started and cfg.open_browser and url_out:
-        try: webbrowser.open(url_out)
+        try:
+            import webbrowser
+            webbrowser.open(url_out)
         except Exception: pass
     # ---------------- README (write prior to manifest so verification append works) ----------------
     # README generation (non-fatal on failure)
@@ -2168,59 +2597,35 @@ def clone_site(cfg: CloneConfig, callbacks: Optional[CloneCallbacks] = None) ->
     abs_output = os.path.abspath(output_folder)
     abs_site_root = os.path.join(abs_output, rel_root)
     readme_path = os.path.join(output_folder, f"README_{image_tag}.md")
+    readme_writer=None
+    def _join_readme():
+        if readme_writer is not None: readme_writer.join()
     try:
-        with open(readme_path,'w',encoding='utf-8') as f:
-            features=["- Resumable cloning (wget2 --continue)","- Parallel downloads (wget2 -j)","- Deterministic Docker image scaffold (nginx:alpine)"]
-            if cfg.prerender: features.append("- Prerender with Playwright (dynamic HTML snapshot)")
-            if cfg.capture_api: features.append("- API JSON capture (_api/)")
-            if cfg.router_intercept: features.append("- SPA router interception (history API)")
-            if cfg.checksums: features.append("- Checksums manifest + verification script")
-            if (cfg.incremental or cfg.diff_latest): features.append("- Incremental state + diff reports")
-            features.append("- Plugin hooks (pre_download, post_asset, finalize)")
-            if cfg.disable_js: features.append("- Optional JS stripping (<script> removal + CSP)")
-            if getattr(cfg,'cleanup',False): features.append("- Cleanup phase to remove build helpers")
-            f.write(
-                f"# Docker Website Container\n\n"
-                f"Cloned from: {cfg.url}\n\n"
-                "## Requirements\n"
-                "- wget2 (parallel mirroring)\n"
-                "- Docker (optional for build/run)\n"
-                "- Python 3.8+ (headless mode)\n"
-                "- Optional: browser_cookie3 (browser cookie import)\n\n"
-                "## Features\n"+"\n".join(features)+"\n\n"
-                "## Paths\n"
-                f"Output folder: {abs_output}\n\n"
-                f"Site root (detected): {abs_site_root}\n\n"
-                "## Build / Run\n"
-                + (f"Built image tag: `{image_tag}`\n\n" if docker_success else f"Not built yet. Build with: `docker build -t {image_tag} .`\n\n")
-                + "Run built image:\n\n"
-                + f"```bash\ndocker run -d -p {bind_ip_for_cmd}:{cfg.host_port}:{cfg.container_port} {image_tag}\n```\n\n"
-                + "Serve folder directly (no image build):\n\n"
-                + f"```bash\ncat > _folder.default.conf <<'CONF'\nserver {{\n    listen {cfg.container_port};\n    server_name localhost;\n    root /usr/share/nginx/html;\n    index index.html;\n    location / {{ try_files $uri $uri/ =404; }}\n}}\nCONF\n\n"
-                + f"docker run -d -p {bind_ip_for_cmd}:{cfg.host_port}:{cfg.container_port} \\\n+  -v \"{abs_site_root}\":/usr/share/nginx/html \\\n+  -v \"$(pwd)/_folder.default.conf\":/etc/nginx/conf.d/default.conf:ro \\\n+  nginx:alpine\n```\n\n"
-                + f"Open: http://{host_for_url}:{cfg.host_port}\n\n"
-                + "## Headless Example\n\n"
-                + f"```bash\npython cw2dt.py --headless --url '{cfg.url}' --dest '{cfg.dest}' --docker-name '{image_tag}' --jobs {cfg.jobs}"
-                  f"{' --build' if cfg.build else ''}{' --prerender' if cfg.prerender else ''}{' --checksums' if cfg.checksums else ''}\n```\n"
-                + "\n### Windows (PowerShell) Quick Run\n\n"
-                + f"```powershell\npy cw2dt.py --headless --url '{cfg.url}' --dest '{cfg.dest}' --docker-name '{image_tag}' --jobs {cfg.jobs}"
-                  f"{' --build' if cfg.build else ''}{' --prerender' if cfg.prerender else ''}{' --checksums' if cfg.checksums else ''}\n```\n"
-                + "\n### Windows Folder Mode (PowerShell)\n\n"
-                + "```powershell\n$conf = @'\nserver {\n    listen {0};\n    server_name localhost;\n    root /usr/share/nginx/html;\n    index index.html;\n    location / { try_files $uri $uri/ =404; }\n}\n'@\n".format(cfg.container_port)
-                + "Set-Content -Path _folder.default.conf -Value $conf -NoNewline\n"
-                + f"docker run -d -p {bind_ip_for_cmd}:{cfg.host_port}:{cfg.container_port} `\n"
-                + f"  -v \"{abs_site_root}\":/usr/share/nginx/html `\n"
-                + "  -v \"$PWD\\_folder.default.conf\":/etc/nginx/conf.d/default.conf:ro `\n  nginx:alpine\n```\n"
-                + "\n### Troubleshooting\n"
-                + "- wget2 missing: install via brew/apt/etc.\n"
-                + "- Docker permission denied: add user to docker group or use sudo.\n"
-                + "- Router interception found no routes: increase --router-settle-ms or adjust allow/deny patterns.\n"
-                + "- Checksums slow: skip --checksums then verify later.\n"
-                + "- Parallel jobs issues: lower --jobs if remote throttles.\n"
-                + "- API capture empty: ensure JSON content-type and same-origin.\n"
-                + "- Incremental diff: first run seeds state; re-run with --diff-latest.\n"
-                + ("\n### Security Note\nCredentials passed with --auth-user/--auth-pass may be visible in local process listings. Consider alternate storage if sensitive.\n" if cfg.auth_user else "")
-            )
+        features=["- Resumable cloning (wget2 --continue)","- Parallel downloads (wget2 -j)","- Deterministic Docker image scaffold (nginx:alpine)"]
+        if cfg.prerender: features.append("- Prerender with Playwright (dynamic HTML snapshot)")
+        if cfg.capture_api: features.append("- API JSON capture (_api/)")
+        if cfg.router_intercept: features.append("- SPA router interception (history API)")
+        if cfg.checksums: features.append("- Checksums manifest + verification script")
+        if (cfg.incremental or cfg.diff_latest): features.append("- Incremental state + diff reports")
+        features.append("- Plugin hooks (pre_download, post_asset, finalize)")
+        if cfg.disable_js: features.append("- Optional JS stripping (<script> removal + CSP)")
+        if getattr(cfg,'cleanup',False): features.append("- Cleanup phase to remove build helpers")
+        fields = {
+            'url': cfg.url, 'dest': cfg.dest, 'jobs': cfg.jobs, 'image_tag': image_tag,
+            'host_port': cfg.host_port, 'container_port': cfg.container_port,
+            'host_for_url': host_for_url, 'abs_output': abs_output, 'abs_site_root': abs_site_root,
+            # shared by the bash and PowerShell run examples
+            'run_prefix': f"docker run -d -p {bind_ip_for_cmd}:{cfg.host_port}:{cfg.container_port}",
+            'site_mount': f'"{abs_site_root}":/usr/share/nginx/html',
+            'build_status': f"Built image tag: `{image_tag}`" if docker_success else f"Not built yet. Build with: `docker build -t {image_tag} .`",
+            'flags': f"{' --build' if cfg.build else ''}{' --prerender' if cfg.prerender else ''}{' --checksums' if cfg.checksums else ''}",
+        }
+        # Sections are collected and written once (single encode/write instead of one per section)
+        parts: list[str] = [f"# Docker Website Container\n\nCloned from: {cfg.url}\n\n", _README_REQUIREMENTS,
+                            "## Features\n", "\n".join(features), "\n\n",
+                            _README_RUN_TMPL % fields, _README_WINDOWS_PS % fields, _README_TROUBLESHOOTING]
+        if cfg.auth_user:
+            parts.append(_README_SECURITY_NOTE)
         # Append summary (best effort) inside outer try only
         try:
             repro_cmd = _build_repro_command_from_config(cfg)
@@ -2228,27 +2633,34 @@ def clone_site(cfg: CloneConfig, callbacks: Optional[CloneCallbacks] = None) ->
             repro_cmd = None
         if repro_cmd:
             try:
-                with open(readme_path,'a',encoding='utf-8') as f:
-                    f.write("\n\n---\n## Clone Summary\n")
-                    f.write(f"- Prerender: {'yes' if cfg.prerender else 'no'}\n")
-                    if cfg.prerender:
-                        _ps = locals().get('prer_stats') if 'prer_stats' in locals() else None
-                        if cfg.capture_api:
-                            f.write(f"  - API captured: {_ps.get('api_captured',0) if isinstance(_ps,dict) else '?'}\n")
-                        if cfg.router_intercept:
-                            f.write(f"  - Router routes: {_ps.get('routes_discovered',0) if isinstance(_ps,dict) else '?'}\n")
-                    if cfg.checksums:
-                        f.write("  - Checksums: yes\n")
-                        if cfg.checksum_ext:
-                            f.write(f"    * Extra extensions: {cfg.checksum_ext}\n")
-                    if cfg.incremental or cfg.diff_latest:
-                        f.write(f"- Incremental state: {'yes' if cfg.incremental else 'no'} diff_latest={'yes' if cfg.diff_latest else 'no'}\n")
-                    if cfg.plugins_dir:
-                        f.write(f"- Plugins directory: {cfg.plugins_dir}\n")
-                    f.write("\n### Reproduce (approx)\n")
-                    f.write("```bash\n"+" \\\n+  ".join(repro_cmd)+"\n```\n")
+                summary=["\n\n---\n## Clone Summary\n", f"- Prerender: {'yes' if cfg.prerender else 'no'}\n"]
+                if cfg.prerender:
+                    _ps = locals().get('prer_stats') if 'prer_stats' in locals() else None
+                    if cfg.capture_api:
+                        summary.append(f"  - API captured: {_ps.get('api_captured',0) if isinstance(_ps,dict) else '?'}\n")
+                    if cfg.router_intercept:
+                        summary.append(f"  - Router routes: {_ps.get('routes_discovered',0) if isinstance(_ps,dict) else '?'}\n")
+                if cfg.checksums:
+                    summary.append("  - Checksums: yes\n")
+                    if cfg.checksum_ext:
+                        summary.append(f"    * Extra extensions: {cfg.checksum_ext}\n")
+                if cfg.incremental or cfg.diff_latest:
+                    summary.append(f"- Incremental state: {'yes' if cfg.incremental else 'no'} diff_latest={'yes' if cfg.diff_latest else 'no'}\n")
+                if cfg.plugins_dir:
+                    summary.append(f"- Plugins directory: {cfg.plugins_dir}\n")
+                repro_body=" \\\n+  ".join(repro_cmd)
+                summary.append(f"\n### Reproduce (approx)\n```bash\n{repro_body}\n```\n")
+                parts.extend(summary)
             except Exception:
                 pass
+        # The write overlaps only work that never reads output_folder (loading the previous state,
+        # assembling the manifest); _join_readme() runs before the diff snapshot, checksums and
+        # plugins, which walk the folder holding the README, and before verification appends to it.
+        def _write_readme(text: str):
+            try: _write_text_once(readme_path, text)
+            except Exception: pass
+        readme_writer=threading.Thread(target=_write_readme, args=("".join(parts),), name='cw2dt-readme', daemon=True)
+        readme_writer.start()
     except Exception:
         pass  # README is non-critical
     # Incremental diff
@@ -2256,7 +2668,8 @@ def clone_site(cfg: CloneConfig, callbacks: Optional[CloneCallbacks] = None) ->
     if cfg.incremental or cfg.diff_latest:
         try:
             prev=_load_state(output_folder)
-            current={'schema':1,'timestamp':_timestamp(),'files':_snapshot_file_hashes(site_root)}
+            _join_readme()  # the snapshot walks site_root, which may be output_folder
+            current={'schema':1,'timestamp':_timestamp(),'files':_snapshot_file_hashes(site_root, prev=prev)}
             _save_state(output_folder,current)
             if cfg.diff_latest and prev:
                 diff_summary=_compute_diff(prev,current)
@@ -2385,7 +2798,7 @@ def clone_site(cfg: CloneConfig, callbacks: Optional[CloneCallbacks] = None) ->
                 manifest['environment']={
                     'python': _sys.version.split()[0],
                     'platform': platform.platform(),
-                    'system': platform.system(),
+                    'system': _OS,
                     'release': platform.release()
                 }
             except Exception:
@@ -2398,7 +2811,7 @@ def clone_site(cfg: CloneConfig, callbacks: Optional[CloneCallbacks] = None) ->
             if cfg.checksums:
                 canceled_flag={'c':False}
                 def _chk(p,t):
-                    pct=int(p*100/t) if t else 100
+                    pct=p*100//t if t else 100  # p<=t, so already within 0..100
                     _invoke(callbacks,'checksum',pct)
                 def _cancel_probe():
                     try:
@@ -2407,6 +2820,7 @@ def clone_site(cfg: CloneConfig, callbacks: Optional[CloneCallbacks] = None) ->
                     except Exception:
                         return True
                     return False
+                _join_readme()  # a partly written README must not be hashed (--checksum-ext md)
                 manifest['checksums_sha256']=compute_checksums(output_folder, extra, progress_cb=_chk, cancel_cb=_cancel_probe)
                 if canceled_flag['c']:
                     j('checksums_canceled', counted=len(manifest.get('checksums_sha256') or {}))
@@ -2450,6 +2864,7 @@ def clone_site(cfg: CloneConfig, callbacks: Optional[CloneCallbacks] = None) ->
                 except Exception: pass
         except Exception as e:
             log(f"[manifest] failed: {e}")
+    _join_readme()
     # ---------------- Plugin post_asset (with content mutation parity) ----------------
     manifest_data = None
     if loaded_plugins:
@@ -2463,17 +2878,14 @@ def clone_site(cfg: CloneConfig, callbacks: Optional[CloneCallbacks] = None) ->
                 manifest_data = None
         try:
             interesting_exts = ('.html','.htm','.json','.css','.js')
-            candidates=[]
-            for base,_,files in os.walk(site_root):
-                for fn in files:
-                    if fn.lower().endswith(interesting_exts):
-                        candidates.append((base,fn))
+            candidates=[e.path for e in _iter_files(site_root) if e.name.lower().endswith(interesting_exts)]
             total_assets=len(candidates); processed_assets=0; modified_assets=0; plugin_mod_counts={}
-            for base,fn in candidates:
+            cut=len(os.path.join(site_root,''))
+            for ap in candidates:
                 if _canceled('post_asset'): return CloneResult(False, False, output_folder, site_root, manifest_path, None, {})
-                rel=os.path.relpath(os.path.join(base,fn), site_root)
+                rel=ap[cut:]
                 try:
-                    with open(os.path.join(base,fn),'rb') as f: original=f.read()
+                    with open(ap,'rb') as f: original=f.read()
                 except Exception:
                     processed_assets +=1; continue
                 updated=original; modifiers=[]
@@ -2498,7 +2910,7 @@ def clone_site(cfg: CloneConfig, callbacks: Optional[CloneCallbacks] = None) ->
                     modified_assets +=1
                     for m in set(modifiers): plugin_mod_counts[m]=plugin_mod_counts.get(m,0)+1
                     try:
-                        with open(os.path.join(base,fn),'wb') as f: f.write(updated)
+                        with open(ap,'wb') as f: f.write(updated)
                         if cfg.json_logs:
                             log(json.dumps({"event":"post_asset_modified","path":rel,"modifiers":modifiers}))
                         else:
@@ -2557,16 +2969,11 @@ def clone_site(cfg: CloneConfig, callbacks: Optional[CloneCallbacks] = None) ->
         j('phase_start', phase='cleanup')
         removed=[]
         try:
-            targets=['nginx.conf']
             # Only remove Dockerfile if build succeeded (content reproducible)
-            if docker_success:
-                targets.append('Dockerfile')
-            for t in targets:
-                p=os.path.join(output_folder,t)
-                if os.path.exists(p):
-                    try:
-                        os.remove(p); removed.append(t)
-                    except Exception: pass
+            for t in (_BUILD_ARTIFACTS if docker_success else _BUILD_ARTIFACTS[:1]):
+                try:
+                    os.remove(os.path.join(output_folder,t)); removed.append(t)
+                except OSError: pass  # missing (or not removable): nothing to report
             j('cleanup_removed', files=removed)
             _invoke(callbacks,'phase','cleanup',100)
             j('phase_end', phase='cleanup', removed=len(removed))
@@ -2647,32 +3054,77 @@ def clone_site(cfg: CloneConfig, callbacks: Optional[CloneCallbacks] = None) ->
     return CloneResult(True, docker_success, output_folder, site_root, manifest_path, diff_summary, timings, run_id)
 
 # ---------- headless CLI ----------
+class _StreamExit(int):
+    """Exit code of _cli_run_stream carrying the last output lines (.tail), so a failed build
+    can be reported without re-running it. Still a plain int to callers and test stubs."""
+    tail: tuple = ()
+
 def _cli_run_stream(cmd: list[str]) -> int:
-    try: proc=subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1)
+    """Stream a command's combined output to stdout; returns a _StreamExit."""
+    tail: deque[str] = deque(maxlen=12)  # per call: concurrent clones never share it
+    try: proc=subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
     except Exception as e:
         print(f"[error] Failed to start: {e}"); return 1
     try:
         if proc.stdout is not None:
-            for line in proc.stdout:
-                if not line: continue
-                print(line.rstrip())
+            # one write per pipe read rather than one print per line
+            for lines in _iter_pipe_chunks(proc.stdout):
+                lines=[ln.rstrip() for ln in lines]
+                tail.extend(lines)
+                sys.stdout.write(''.join(ln+'\n' for ln in lines))
     finally: proc.wait()
-    return proc.returncode or 0
+    rc=_StreamExit(proc.returncode or 0); rc.tail=tuple(tail)
+    return rc
+
+_URL_RE = re.compile(r'(?<!\S)https?://\S+')  # whitespace-delimited tokens that start with a URL scheme
+
+class _DistinctCounter:
+    """Count distinct strings with bounded memory.
+    Only a 64-bit hash of each item is kept (str.__hash__ is computed once and cached
+    on the string), never the string itself. Exact (a set of ints) up to exact_limit
+    entries; beyond that the hashes migrate into a Bloom filter sized for `capacity`
+    items at `error_rate`, so the count becomes a slight undercount (false positives
+    are treated as already seen). ~1.2 MB for 1M items @ 1% instead of tens of MB of
+    str objects.
+    """
+    _MASK=(1<<64)-1
+    def __init__(self, exact_limit: int = 50_000, capacity: int = 1_000_000, error_rate: float = 0.01):
+        import math
+        self.count=0; self._exact: set[int] | None = set(); self._limit=exact_limit
+        self._m=max(8, int(-capacity*math.log(error_rate)/(math.log(2)**2)))
+        self._k=max(1, round(self._m/capacity*math.log(2))); self._bits: bytearray | None = None
+    def _bloom_add(self, h1: int) -> bool:
+        # second probe stride derived from h1 with a splitmix64 finalizer step (odd => full period)
+        h2=(((h1 ^ (h1>>31)) * 0xBF58476D1CE4E5B9) & self._MASK) | 1
+        bits=self._bits; m=self._m; new=False
+        for i in range(self._k):
+            pos=(h1+i*h2) % m; byte=pos>>3; mask=1<<(pos&7)
+            if not bits[byte] & mask: bits[byte] |= mask; new=True
+        return new
+    def add(self, item: str):
+        h=hash(item) & self._MASK
+        if self._exact is not None:
+            if h in self._exact: return
+            self._exact.add(h); self.count+=1
+            if len(self._exact) > self._limit:
+                self._bits=bytearray((self._m+7)//8)
+                for it in self._exact: self._bloom_add(it)
+                self._exact=None
+        elif self._bloom_add(h):
+            self.count+=1
+    def __len__(self): return self.count
 
-def _cli_estimate_with_spider(url: str) -> int:
-    try: proc=subprocess.Popen(['wget2','--spider','-e','robots=off','--recursive','--no-parent', url], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1)
+def _cli_estimate_with_spider(url: str, on_start=None) -> int:
+    try: proc=subprocess.Popen(['wget2','--spider','-e','robots=off','--recursive','--no-parent', url], stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
     except Exception: return 0
-    seen=set(); stream=proc.stdout
+    if on_start:
+        try: on_start(proc)
+        except Exception: pass
+    seen=_DistinctCounter(); stream=proc.stdout
     if stream is not None:
-        for line in stream:
-            if not line: continue
-            line=line.strip()
-            if line.startswith('--'):
-                parts=line.split();
-                if len(parts)>=2 and parts[1].startswith('http'): seen.add(parts[1])
-            elif 'http://' in line or 'https://' in line:
-                for tok in line.split():
-                    if tok.startswith(('http://','https://')): seen.add(tok)
+        for line in _iter_pipe_lines(stream):
+            if 'http' not in line: continue
+            for u in _URL_RE.findall(line): seen.add(u)
     proc.wait(); return len(seen)
 
 def estimate_site_items(url: str) -> int:
@@ -2686,6 +3138,131 @@ def _selftest_verification_parsing():  # lightweight internal self-test
     print('[selftest] verification parsing ' + ('passed' if ok else f'FAILED -> {stats}'))
     return 0 if ok else 1
 
+# Headless CLI spec: (flag, argparse.add_argument kwargs). Kept as plain data so the
+# common invocation can be parsed without building an ArgumentParser (see
+# _fast_parse_headless); argparse is only constructed for --help and errors.
+_ARG_SUPPRESS = '==SUPPRESS=='  # same sentinel value as argparse.SUPPRESS
+_HEADLESS_ARGS: list[tuple[str, dict]] = [
+    ('--headless', dict(action='store_true', help=_ARG_SUPPRESS)),
+    ('--print-repro', dict(action='store_true', help='Print reproduction command for given flags and exit')),
+    ('--dry-run', dict(action='store_true', help='Validate environment & config; show planned actions without cloning')),
+    ('--url', dict(required=True, help='Website URL to mirror')),
+    ('--dest', dict(required=True, help='Destination base folder')),
+    ('--docker-name', dict(default='site', help='Docker image name / project folder name')),
+    ('--build', dict(action='store_true', help='Build Docker image after clone')),
+    ('--bind-ip', dict(default='127.0.0.1', help='Host bind IP (e.g., 127.0.0.1 or 0.0.0.0)')),
+    ('--host-port', dict(type=int, default=8080, help='Host port to map')),
+    ('--container-port', dict(type=int, default=80, help='Container port to expose')),
+    ('--size-cap', dict(default=None, help='Optional download quota (e.g., 500M, 2G)')),
+    ('--throttle', dict(default=None, help='Optional download limit (e.g., 500K, 4M)')),
+    ('--auth-user', dict(default=None)),
+    ('--auth-pass', dict(default=None)),
+    ('--cookies-file', dict(default=None, help='Path to existing cookies.txt (Netscape format) to load')),
+    ('--import-browser-cookies', dict(action='store_true', help='Attempt to import browser cookies (browser_cookie3)')),
+    ('--estimate', dict(action='store_true', help='Estimate number of items before cloning')),
+    ('--cleanup', dict(action='store_true', help='Remove helper build files (Dockerfile/nginx.conf) after successful build')),
+    ('--jobs', dict(type=int, default=max(4, min(16, (os.cpu_count() or 4))), help='Parallel jobs for wget2')),
+    ('--disable-js', dict(action='store_true', help='Disable JavaScript (strip scripts and set CSP)')),
+    ('--allow-js', dict(action='store_true', help=_ARG_SUPPRESS)),  # back-compat no-op
+    ('--run-built', dict(action='store_true', help='Run the built image (requires --build)')),
+    ('--serve-folder', dict(action='store_true', help='Serve directly from folder (nginx:alpine)')),
+    ('--open-browser', dict(action='store_true', help='Open the URL after starting container')),
+    ('--prerender', dict(action='store_true', help='After clone, prerender dynamic pages with Playwright (optional)')),
+    ('--prerender-max-pages', dict(type=int, default=40)),
+    ('--prerender-scroll', dict(type=int, default=0, help='Number of incremental scroll passes per prerendered page to trigger lazy loading (0=disabled)')),
+    ('--dom-stable-ms', dict(type=int, default=0, help='Require this many ms of no DOM mutations before capturing each prerendered page (heuristic). 0=disabled')),
+    ('--dom-stable-timeout-ms', dict(type=int, default=4000, help='Maximum additional wait per page attempting to reach a stable DOM (ignored if dom-stable-ms=0)')),
+    ('--capture-api', dict(action='store_true', help='Capture API responses during prerender (JSON by default)')),
+    ('--capture-api-types', dict(default=None, help='Slash- or comma-separated list of content-type prefixes to capture (e.g. application/json,text/csv)')),
+    ('--capture-api-binary', dict(action='store_true', help='Also capture common binary types (pdf, images, octet-stream)')),
+    ('--capture-storage', dict(action='store_true', help='Capture localStorage/sessionStorage snapshots during prerender')),
+    ('--capture-graphql', dict(action='store_true', help='Capture GraphQL request/response pairs during prerender into _graphql/')),
+    ('--hook-script', dict(default=None, help='Path to Python script exposing on_page(page,url,context)')),
+    ('--no-url-rewrite', dict(action='store_true', help='Disable rewriting absolute origin URLs to relative')),
+    ('--router-intercept', dict(action='store_true', help='Intercept SPA router (history API)')),
+    ('--router-include-hash', dict(action='store_true', help='Treat #hash as distinct route')),
+    ('--router-max-routes', dict(type=int, default=200)),
+    ('--router-settle-ms', dict(type=int, default=350)),
+    ('--router-wait-selector', dict(default=None)),
+    ('--router-allow', dict(default=None, help='Comma-separated regex allow list')),
+    ('--router-deny', dict(default=None, help='Comma-separated regex deny list')),
+    ('--router-quiet', dict(action='store_true')),
+    ('--no-manifest', dict(action='store_true', help='Skip writing clone_manifest.json')),
+    ('--checksums', dict(action='store_true', help='Compute SHA256 checksums (HTML/API + extras)')),
+    ('--checksum-ext', dict(default=None, help='Comma-separated extra file extensions (css,js,png,...)')),
+    ('--verify-checksums', dict(action='store_true', help=_ARG_SUPPRESS)),  # deprecated alias
+    ('--verify-after', dict(action='store_true', help='Verify manifest after clone')),
+    ('--verify-deep', dict(action='store_true', help='Deep verification (do not skip missing)')),
+    ('--verify-fast', dict(action='store_true', help='Alias of --verify-after (fast)')),
+    ('--selftest-verification', dict(action='store_true', help='Run internal verification parsing self-test and exit')),
+    ('--config', dict(default=None, help='Optional config file (JSON/YAML)')),
+    ('--incremental', dict(action='store_true', help='Enable conditional fetching (-N) & store state')),
+    ('--diff-latest', dict(action='store_true', help='Produce diff report vs last stored state')),
+    ('--json-logs', dict(action='store_true', help='Emit machine-readable JSON log lines')),
+    ('--plugins-dir', dict(default=None, help='Directory containing plugin .py files (post_asset/finalize)')),
+    ('--profile', dict(action='store_true', help='Emit JSON timing metrics at end')),
+    ('--report', dict(choices=['json','md'], default=None, help='Generate a clone_report.json or clone_report.md summary file')),
+    ('--events-file', dict(default=None, help='Write JSON events (when --json-logs) additionally to this NDJSON file')),
+    ('--progress', dict(choices=['plain','rich'], default='plain', help='Progress rendering mode (rich requires optional dependency)')),
+    ('--user-agent', dict(default=None, help='Override User-Agent for wget2 and prerender network requests')),
+    ('--extra-wget-args', dict(default=None, help='Raw extra arguments appended to wget2 (advanced troubleshooting)')),
+    ('--auto-backoff', dict(action='store_true', help='On server error, retry once with reduced threads and retry/backoff flags')),
+    ('--log-redirect-chain', dict(action='store_true', help='Resolve and log HTTP redirect chain before cloning')),
+    ('--save-wget-stderr', dict(action='store_true', help='Save full wget2 stderr to file (wget_stderr.log) in output folder')),
+    ('--insecure', dict(action='store_true', help='IGNORE TLS certificate validation (adds --no-check-certificate to wget2). Diagnostic-only; do not use routinely.')),
+    ('--routing-mode', dict(choices=['strict','spa','ext','hybrid'], default='strict', help='Routing: strict(404), spa(fallback /index.html), ext(extensionless .html), hybrid(ext then SPA)')),
+    ('--resilient', dict(action='store_true', help='Enable broader retry set & sturdier network flags on first attempt')),
+    ('--relaxed-tls', dict(action='store_true', help='Apply TLS fallback set (also implies --insecure)')),
+    ('--failure-threshold', dict(type=float, default=0.15, help='Error ratio triggering adaptive retry (0-1)')),
+    ('--allow-degraded', dict(action='store_true', help='Do not mark clone failed if error ratio exceeds threshold')),
+    ('--adaptive-concurrency', dict(action='store_true', help='Experimental: lower concurrency if high error rate detected')),
+]
+
+def _build_headless_parser():
+    import argparse
+    parser = argparse.ArgumentParser(description="Clone website to a Docker-ready folder (headless mode)")
+    for flag, kw in _HEADLESS_ARGS:
+        parser.add_argument(flag, **kw)
+    return parser
+
+@lru_cache(maxsize=1)
+def _headless_arg_index() -> dict:
+    """flag -> (dest, kwargs) lookup for the fast parser."""
+    return {flag: (flag[2:].replace('-','_'), kw) for flag, kw in _HEADLESS_ARGS}
+
+def _headless_defaults() -> dict:
+    return {dest: kw.get('default', False if kw.get('action')=='store_true' else None) for dest, kw in _headless_arg_index().values()}
+
+def _fast_parse_headless(argv: list[str]):
+    """Parse exact long flags against _HEADLESS_ARGS without argparse.
+    Returns None whenever argparse semantics are needed (help, unknown or abbreviated
+    flags, bad types/choices, missing required values) so the caller can fall back
+    and get argparse's usual messages and exit codes.
+    """
+    from types import SimpleNamespace
+    index=_headless_arg_index(); values=_headless_defaults(); seen=set(); i=0
+    while i < len(argv):
+        tok=argv[i]; i+=1
+        flag,eq,val=tok.partition('=')
+        ent=index.get(flag)
+        if ent is None: return None
+        dest,kw=ent; seen.add(dest)
+        if kw.get('action')=='store_true':
+            if eq: return None
+            values[dest]=True; continue
+        if not eq:
+            if i >= len(argv) or argv[i].startswith('-'): return None
+            val=argv[i]; i+=1
+        conv=kw.get('type')
+        if conv is not None:
+            try: val=conv(val)
+            except (TypeError, ValueError): return None
+        if 'choices' in kw and val not in kw['choices']: return None
+        values[dest]=val
+    for flag, kw in _HEADLESS_ARGS:
+        if kw.get('required') and index[flag][0] not in seen: return None
+    return SimpleNamespace(**values)
+
 def headless_main(argv: list[str]) -> int:
     """Advanced headless CLI (full feature set migrated from legacy monolith).
 
@@ -2693,82 +3270,9 @@ def headless_main(argv: list[str]) -> int:
     incremental state + diff, plugins, checksum & verification, router interception,
     Docker build/run, folder-serve, manifest/README generation, profiling.
     """
-    import argparse
-    parser = argparse.ArgumentParser(description="Clone website to a Docker-ready folder (headless mode)")
-    parser.add_argument('--headless', action='store_true', help=argparse.SUPPRESS)
-    parser.add_argument('--print-repro', action='store_true', help='Print reproduction command for given flags and exit')
-    parser.add_argument('--dry-run', action='store_true', help='Validate environment & config; show planned actions without cloning')
-    parser.add_argument('--url', required=True, help='Website URL to mirror')
-    parser.add_argument('--dest', required=True, help='Destination base folder')
-    parser.add_argument('--docker-name', default='site', help='Docker image name / project folder name')
-    parser.add_argument('--build', action='store_true', help='Build Docker image after clone')
-    parser.add_argument('--bind-ip', default='127.0.0.1', help='Host bind IP (e.g., 127.0.0.1 or 0.0.0.0)')
-    parser.add_argument('--host-port', type=int, default=8080, help='Host port to map')
-    parser.add_argument('--container-port', type=int, default=80, help='Container port to expose')
-    parser.add_argument('--size-cap', default=None, help='Optional download quota (e.g., 500M, 2G)')
-    parser.add_argument('--throttle', default=None, help='Optional download limit (e.g., 500K, 4M)')
-    parser.add_argument('--auth-user', default=None)
-    parser.add_argument('--auth-pass', default=None)
-    parser.add_argument('--cookies-file', default=None, help='Path to existing cookies.txt (Netscape format) to load')
-    parser.add_argument('--import-browser-cookies', action='store_true', help='Attempt to import browser cookies (browser_cookie3)')
-    parser.add_argument('--estimate', action='store_true', help='Estimate number of items before cloning')
-    parser.add_argument('--cleanup', action='store_true', help='Remove helper build files (Dockerfile/nginx.conf) after successful build')
-    parser.add_argument('--jobs', type=int, default=max(4, min(16, (os.cpu_count() or 4))), help='Parallel jobs for wget2')
-    parser.add_argument('--disable-js', action='store_true', help='Disable JavaScript (strip scripts and set CSP)')
-    parser.add_argument('--allow-js', action='store_true', help=argparse.SUPPRESS)  # back-compat no-op
-    parser.add_argument('--run-built', action='store_true', help='Run the built image (requires --build)')
-    parser.add_argument('--serve-folder', action='store_true', help='Serve directly from folder (nginx:alpine)')
-    parser.add_argument('--open-browser', action='store_true', help='Open the URL after starting container')
-    parser.add_argument('--prerender', action='store_true', help='After clone, prerender dynamic pages with Playwright (optional)')
-    parser.add_argument('--prerender-max-pages', type=int, default=40)
-    parser.add_argument('--prerender-scroll', type=int, default=0, help='Number of incremental scroll passes per prerendered page to trigger lazy loading (0=disabled)')
-    parser.add_argument('--dom-stable-ms', type=int, default=0, help='Require this many ms of no DOM mutations before capturing each prerendered page (heuristic). 0=disabled')
-    parser.add_argument('--dom-stable-timeout-ms', type=int, default=4000, help='Maximum additional wait per page attempting to reach a stable DOM (ignored if dom-stable-ms=0)')
-    parser.add_argument('--capture-api', action='store_true', help='Capture API responses during prerender (JSON by default)')
-    parser.add_argument('--capture-api-types', default=None, help='Slash- or comma-separated list of content-type prefixes to capture (e.g. application/json,text/csv)')
-    parser.add_argument('--capture-api-binary', action='store_true', help='Also capture common binary types (pdf, images, octet-stream)')
-    parser.add_argument('--capture-storage', action='store_true', help='Capture localStorage/sessionStorage snapshots during prerender')
-    parser.add_argument('--capture-graphql', action='store_true', help='Capture GraphQL request/response pairs during prerender into _graphql/')
-    parser.add_argument('--hook-script', default=None, help='Path to Python script exposing on_page(page,url,context)')
-    parser.add_argument('--no-url-rewrite', action='store_true', help='Disable rewriting absolute origin URLs to relative')
-    parser.add_argument('--router-intercept', action='store_true', help='Intercept SPA router (history API)')
-    parser.add_argument('--router-include-hash', action='store_true', help='Treat #hash as distinct route')
-    parser.add_argument('--router-max-routes', type=int, default=200)
-    parser.add_argument('--router-settle-ms', type=int, default=350)
-    parser.add_argument('--router-wait-selector', default=None)
-    parser.add_argument('--router-allow', default=None, help='Comma-separated regex allow list')
-    parser.add_argument('--router-deny', default=None, help='Comma-separated regex deny list')
-    parser.add_argument('--router-quiet', action='store_true')
-    parser.add_argument('--no-manifest', action='store_true', help='Skip writing clone_manifest.json')
-    parser.add_argument('--checksums', action='store_true', help='Compute SHA256 checksums (HTML/API + extras)')
-    parser.add_argument('--checksum-ext', default=None, help='Comma-separated extra file extensions (css,js,png,...)')
-    parser.add_argument('--verify-checksums', action='store_true', help=argparse.SUPPRESS)  # deprecated alias
-    parser.add_argument('--verify-after', action='store_true', help='Verify manifest after clone')
-    parser.add_argument('--verify-deep', action='store_true', help='Deep verification (do not skip missing)')
-    parser.add_argument('--verify-fast', action='store_true', help='Alias of --verify-after (fast)')
-    parser.add_argument('--selftest-verification', action='store_true', help='Run internal verification parsing self-test and exit')
-    parser.add_argument('--config', default=None, help='Optional config file (JSON/YAML)')
-    parser.add_argument('--incremental', action='store_true', help='Enable conditional fetching (-N) & store state')
-    parser.add_argument('--diff-latest', action='store_true', help='Produce diff report vs last stored state')
-    parser.add_argument('--json-logs', action='store_true', help='Emit machine-readable JSON log lines')
-    parser.add_argument('--plugins-dir', default=None, help='Directory containing plugin .py files (post_asset/finalize)')
-    parser.add_argument('--profile', action='store_true', help='Emit JSON timing metrics at end')
-    parser.add_argument('--report', choices=['json','md'], default=None, help='Generate a clone_report.json or clone_report.md summary file')
-    parser.add_argument('--events-file', default=None, help='Write JSON events (when --json-logs) additionally to this NDJSON file')
-    parser.add_argument('--progress', choices=['plain','rich'], default='plain', help='Progress rendering mode (rich requires optional dependency)')
-    parser.add_argument('--user-agent', default=None, help='Override User-Agent for wget2 and prerender network requests')
-    parser.add_argument('--extra-wget-args', default=None, help='Raw extra arguments appended to wget2 (advanced troubleshooting)')
-    parser.add_argument('--auto-backoff', action='store_true', help='On server error, retry once with reduced threads and retry/backoff flags')
-    parser.add_argument('--log-redirect-chain', action='store_true', help='Resolve and log HTTP redirect chain before cloning')
-    parser.add_argument('--save-wget-stderr', action='store_true', help='Save full wget2 stderr to file (wget_stderr.log) in output folder')
-    parser.add_argument('--insecure', action='store_true', help='IGNORE TLS certificate validation (adds --no-check-certificate to wget2). Diagnostic-only; do not use routinely.')
-    parser.add_argument('--routing-mode', choices=['strict','spa','ext','hybrid'], default='strict', help='Routing: strict(404), spa(fallback /index.html), ext(extensionless .html), hybrid(ext then SPA)')
-    parser.add_argument('--resilient', action='store_true', help='Enable broader retry set & sturdier network flags on first attempt')
-    parser.add_argument('--relaxed-tls', action='store_true', help='Apply TLS fallback set (also implies --insecure)')
-    parser.add_argument('--failure-threshold', type=float, default=0.15, help='Error ratio triggering adaptive retry (0-1)')
-    parser.add_argument('--allow-degraded', action='store_true', help='Do not mark clone failed if error ratio exceeds threshold')
-    parser.add_argument('--adaptive-concurrency', action='store_true', help='Experimental: lower concurrency if high error rate detected')
-    args = parser.parse_args(argv)
+    args = _fast_parse_headless(argv)
+    if args is None:
+        args = _build_headless_parser().parse_args(argv)
 
     if args.selftest_verification:
         rc=_selftest_verification_parsing()
@@ -2779,7 +3283,7 @@ def headless_main(argv: list[str]) -> int:
     if args.config:
         cfg_file = _load_config_file(args.config)
         # Build mapping of dest -> default
-        defaults = {a.dest: a.default for a in parser._actions if hasattr(a,'dest')}
+        defaults = _headless_defaults()
         for k,v in cfg_file.items():
             if not hasattr(args,k):
                 continue
@@ -3002,8 +3506,8 @@ def headless_main(argv: list[str]) -> int:
 
 __all__ = [
     'parse_verification_summary','validate_required_fields','run_verification','compute_checksums','is_wget2_available',
-    'count_files_and_partials','docker_available','docker_install_instructions','get_install_cmd','normalize_ip','get_primary_lan_ip',
-    'port_in_use','find_site_root','human_quota_suffix','human_rate_suffix','parse_size_to_bytes','parse_rate_to_bps','image_exists_locally',
+    'count_files_and_partials','docker_available','refresh_tool_availability','docker_install_instructions','get_install_cmd','normalize_ip','get_primary_lan_ip',
+    'port_in_use','ports_in_use','find_free_port','find_site_root','scan_output','ScanResult','human_quota_suffix','human_rate_suffix','parse_size_to_bytes','parse_rate_to_bps','image_exists_locally',
     '_load_config_file','_snapshot_file_hashes','_compute_diff','_timestamp','_ensure_state_dir','_load_state','_save_state',
     'headless_main','CloneConfig','CloneResult','CloneCallbacks','clone_site','estimate_site_items','DEFAULT_PRERENDER_MAX_PAGES','DEFAULT_ROUTER_MAX_ROUTES',
     'DEFAULT_ROUTER_SETTLE_MS','DEFAULT_CONTAINER_PORT','DEFAULT_HOST_PORT','PARTIAL_SUFFIXES'
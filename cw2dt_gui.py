@@ -5,43 +5,105 @@ MRU dropdown history, and phase timing summary.
 """
 from __future__ import annotations
 
-import os, sys, json, webbrowser, time, re
+import os, sys, json, time, re, threading
+from functools import lru_cache
+from collections import OrderedDict
 from PySide6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel, QLineEdit, QPushButton,
     QFileDialog, QTextEdit, QCheckBox, QSpinBox, QDoubleSpinBox, QMessageBox, QProgressBar, QGroupBox, QComboBox, QSplitter,
     QScrollArea, QToolButton, QFrame, QSizePolicy, QMenuBar
 )
-from PySide6.QtCore import Qt, QThread, Signal, QEvent, QSize
+from PySide6.QtCore import Qt, QThread, Signal, Slot, QEvent, QSize, QTimer, QSignalBlocker
 from PySide6.QtGui import QPixmap, QIcon, QAction
 
 from cw2dt_core import (
-    validate_required_fields, is_wget2_available, docker_available,
-    port_in_use, CloneConfig, CloneResult, clone_site, CloneCallbacks, image_exists_locally
+    validate_required_fields, is_wget2_available, docker_available, refresh_tool_availability,
+    port_in_use, find_free_port, CloneConfig, CloneResult, clone_site, CloneCallbacks, image_exists_locally
 )
 from typing import List
-try:
-    from ai_chat import ChatAssistantDialog, WHITELIST as AI_WHITELIST
-except Exception:
-    ChatAssistantDialog=None; AI_WHITELIST=set()
+# ai_chat pulls in httpx and its own Qt dialogs; load it on first use of the assistant
+# instead of on every GUI start.
+ChatAssistantDialog=None; AI_WHITELIST=set(); _AI_CHAT_LOADED=False
+def _load_ai_chat():
+    global ChatAssistantDialog, AI_WHITELIST, _AI_CHAT_LOADED
+    if not _AI_CHAT_LOADED:
+        _AI_CHAT_LOADED=True
+        try: from ai_chat import ChatAssistantDialog, WHITELIST as AI_WHITELIST
+        except Exception: pass
+    return ChatAssistantDialog
 try:
     from auto_retry import AutoRetryManager
 except Exception:  # pragma: no cover - optional import (file may not exist in some stripped builds)
     AutoRetryManager=None
 
+# Image lookup: candidate directories resolved once; hits/misses and scaled pixmaps are
+# cached so rebuilding the banner (or another window) does not re-stat or re-decode.
+_APP_DIR=os.path.dirname(os.path.abspath(__file__))
+_IMAGE_DIRS=(os.path.join(_APP_DIR,'images'), _APP_DIR)
+_PIXMAP_CACHE: dict = {}
+# Button variants keyed off the dynamic "kind" property set in _normalize_buttons.
+_BUTTON_QSS="""
+QPushButton {
+    padding:4px 10px;
+    font-weight:500;
+    border:1px solid #5a5a5a;
+    border-radius:4px;
+    background:#2e2e2e;
+    color:#f0f0f0;
+}
+QPushButton[kind="primary"] { background:#1e6ad6; border-color:#1e6ad6; }
+QPushButton[kind="primary"]:hover { background:#2578ef; }
+QPushButton[kind="primary"]:pressed { background:#1857a6; }
+
+QPushButton[kind="danger"] { background:#b3261e; border-color:#b3261e; }
+QPushButton[kind="danger"]:hover { background:#c63a31; }
+QPushButton[kind="danger"]:pressed { background:#8d1d17; }
+
+QPushButton[kind="accent"] { background:#1f8d49; border-color:#1f8d49; }
+QPushButton[kind="accent"]:hover { background:#25a658; }
+QPushButton[kind="accent"]:pressed { background:#146634; }
+
+QPushButton[kind="secondary"] { background:#3a3a3a; border-color:#5a5a5a; }
+QPushButton[kind="secondary"]:hover { background:#474747; }
+QPushButton[kind="secondary"]:pressed { background:#2f2f2f; }
+
+QPushButton:disabled { background:#2e2e2e; color:#888; border-color:#3a3a3a; }
+"""
+
+@lru_cache(maxsize=None)
+def _find_image(name: str, images_only: bool=False):
+    for d in (_IMAGE_DIRS[:1] if images_only else _IMAGE_DIRS):
+        p=os.path.join(d,name)
+        if os.path.exists(p): return p
+    return None
+
+def _scaled_pixmap(name: str, height: int):
+    key=(name,height)
+    if key not in _PIXMAP_CACHE:
+        path=_find_image(name, images_only=True); pm=QPixmap(path) if path else None
+        _PIXMAP_CACHE[key]=pm.scaledToHeight(height, Qt.TransformationMode.SmoothTransformation) if pm is not None and not pm.isNull() else None
+    return _PIXMAP_CACHE[key]
+
 class _GuiCallbacks(CloneCallbacks):
-    def __init__(self, owner: 'DockerClonerGUI'): self._owner=owner
+    def __init__(self, owner: 'DockerClonerGUI'): self._owner=owner; self._last_pct={}
     def _pause_gate(self):
-        # If paused, spin until resumed or canceled
-        from PySide6.QtCore import QCoreApplication
+        # If paused, block (no polling) until resumed or canceled; both set _resume_evt
+        evt=self._owner._resume_evt
         while getattr(self._owner,'_paused',False) and not self.is_canceled():
-            QCoreApplication.processEvents()
-            time.sleep(0.05)
+            evt.wait()
     def log(self, message: str): self._pause_gate(); self._owner.sig_log.emit(message)
-    def phase(self, phase: str, pct: int): self._pause_gate(); self._owner.sig_phase.emit(phase, pct)
+    def phase(self, phase: str, pct: int):
+        self._pause_gate()
+        # Repeated percentages are dropped here so they never cross the queued thread boundary
+        if self._last_pct.get(phase)==pct: return
+        self._last_pct[phase]=pct; self._owner.sig_phase.emit(phase, pct)
     def bandwidth(self, rate: str): self._pause_gate(); self._owner.sig_bandwidth.emit(rate)
     def api_capture(self, count: int): self._pause_gate(); self._owner.sig_api.emit(count)
     def router_count(self, count: int): self._pause_gate(); self._owner.sig_router.emit(count)
-    def checksum(self, pct: int): self._pause_gate(); self._owner.sig_checksum.emit(pct)
+    def checksum(self, pct: int):
+        self._pause_gate()
+        if self._last_pct.get('checksum')==pct: return
+        self._last_pct['checksum']=pct; self._owner.sig_checksum.emit(pct)
     def is_canceled(self)->bool:
         w=self._owner.worker
         return bool(getattr(w,'_cancel',False)) if w else False
@@ -54,6 +116,16 @@ class _CloneWorker(QThread):
     def run(self):
         res=clone_site(self.cfg,self.cb); self.finished.emit(res)
 
+class _TaskWorker(QThread):
+    """Run fn(*args) off the GUI thread; finished carries the result (None on error)."""
+    finished = Signal(object)
+    def __init__(self, fn, *args):
+        super().__init__(); self._fn=fn; self._args=args
+    def run(self):
+        try: res=self._fn(*self._args)
+        except Exception: res=None
+        self.finished.emit(res)
+
 class _AutoRetryWorker(QThread):
     """Worker wrapping AutoRetryManager for multi-attempt adaptive cloning."""
     finished = Signal(object)
@@ -114,6 +186,7 @@ class _CollapsibleBox(QWidget):
         sep=QFrame(); sep.setFrameShape(QFrame.Shape.HLine); sep.setFrameShadow(QFrame.Shadow.Sunken); lay.addWidget(sep)
     def addWidget(self,w): self._content_lay.addWidget(w)
     def addLayout(self,l): self._content_lay.addLayout(l)
+    @Slot()
     def _on_toggled(self):
         o=self._toggle.isChecked(); self._toggle.setArrowType(Qt.ArrowType.DownArrow if o else Qt.ArrowType.RightArrow); self._content.setVisible(o); self.toggled.emit(o)
 
@@ -122,6 +195,7 @@ class DockerClonerGUI(QWidget):
     def __init__(self):
         super().__init__(); self.setWindowTitle('Clone Website to Docker Tool')
         self.worker=None; self._paused=False; self._last_result=None; self._serve_httpd=None; self._serve_thread=None
+        self._resume_evt=threading.Event(); self._resume_evt.set()  # cleared while paused; worker callbacks wait on it
         self._ai_applied_history=[]  # stack of (inverse_changes, timestamp)
         # Port error and dynamic guidance state
         self._port_error_count=0
@@ -130,32 +204,32 @@ class DockerClonerGUI(QWidget):
         # Track geometry to enforce right-edge-only horizontal resizing
         self._anchor_left=None
         self._last_size=None
+        # Interactive resizes deliver a resizeEvent per pixel; the left-edge anchor correction
+        # is coalesced to at most one move() per frame.
+        self._anchor_timer=QTimer(self); self._anchor_timer.setSingleShot(True); self._anchor_timer.setInterval(16)
+        self._anchor_timer.timeout.connect(self._restore_anchor)
+        # Worker log lines arrive in bursts (one queued signal each); they are queued and drained
+        # once per frame, with all console output of a drain appended under one repaint/scroll
+        # instead of one per line.
+        self._log_queue=[]; self._console_batch=None
+        self._log_timer=QTimer(self); self._log_timer.setSingleShot(True); self._log_timer.setInterval(16)
+        self._log_timer.timeout.connect(self._drain_log_queue)
+        self._last_deps=None  # last missing-deps tuple shown; banner widgets are only touched on change
         self._build_ui(); self._connect_signals(); self._update_dependency_banner()
         self._weighted={}; self._phase_pct={}; self._phase_start={}; self._phase_end={}
 
     def _add_banner_images(self, layout: QHBoxLayout):
         """Center three specific logos (web_logo.png, arrow_right.png, docker_logo.png) and set app icon icon.png."""
         try:
-            base=os.path.join(os.path.dirname(__file__),'images')
-            # Set window icon from icon.png if present
-            ic_png=os.path.join(base,'icon.png')
-            if os.path.exists(ic_png):
-                self.setWindowIcon(QIcon(ic_png))
-            else:
-                # fallback chain: root icon.icns, root icon.ico, root icon.png
-                root_dir=os.path.dirname(__file__)
-                for ic in ('icon.icns','icon.ico','icon.png'):
-                    ip=os.path.join(root_dir,ic)
-                    if os.path.exists(ip):
-                        self.setWindowIcon(QIcon(ip)); break
+            # Window icon: images/icon.png, else fallback chain root icon.icns, icon.ico, icon.png
+            ic=_find_image('icon.png', images_only=True) or next((p for p in map(_find_image,('icon.icns','icon.ico','icon.png')) if p), None)
+            if ic: self.setWindowIcon(QIcon(ic))
             logos=['web_logo.png','arrow_right.png','docker_logo.png']
             layout.addStretch(1)
             for name in logos:
-                path=os.path.join(base,name)
-                if os.path.exists(path):
-                    pm=QPixmap(path)
-                    if not pm.isNull():
-                        lbl=QLabel(); lbl.setPixmap(pm.scaledToHeight(56, Qt.TransformationMode.SmoothTransformation)); layout.addWidget(lbl)
+                pm=_scaled_pixmap(name,56)
+                if pm is not None:
+                    lbl=QLabel(); lbl.setPixmap(pm); layout.addWidget(lbl)
             layout.addStretch(1)
         except Exception:
             pass
@@ -229,7 +303,7 @@ class DockerClonerGUI(QWidget):
         self.api_types_in=QLineEdit(); self.api_types_in.setPlaceholderText('API content-types e.g. application/json,text/csv')
         api_types_row=QHBoxLayout(); api_types_row.addWidget(QLabel('API Types:')); api_types_row.addWidget(self.api_types_in)
         self.hook_in=QLineEdit()
-        hr=QHBoxLayout(); hr.addWidget(QLabel('Hook Script:')); hr.addWidget(self.hook_in); hb=QPushButton('...'); hr.addWidget(hb); hb.clicked.connect(lambda: self._pick_file(self.hook_in))
+        hr=QHBoxLayout(); hr.addWidget(QLabel('Hook Script:')); hr.addWidget(self.hook_in); hb=QPushButton('...'); hr.addWidget(hb); hb.clicked.connect(self._pick_hook_script)
         dyn.addWidget(self.chk_prerender)
         dyn.addWidget(QLabel('Max Pages:')); dyn.addWidget(self.spin_prer_pages)
         dyn.addWidget(QLabel('Scroll Passes:')); dyn.addWidget(self.spin_prer_scroll)
@@ -262,9 +336,9 @@ class DockerClonerGUI(QWidget):
         self.auth_pass=QLineEdit(); self.auth_pass.setPlaceholderText('Auth pass')
         self.cookies_file=QLineEdit(); self.cookies_file.setPlaceholderText('cookies.txt')
         self.chk_import_browser_cookies=QCheckBox('Import Browser Cookies')
-        cr=QHBoxLayout(); cr.addWidget(self.cookies_file); cbbtn=QPushButton('...'); cr.addWidget(cbbtn); cbbtn.clicked.connect(lambda: self._pick_file(self.cookies_file))
+        cr=QHBoxLayout(); cr.addWidget(self.cookies_file); cbbtn=QPushButton('...'); cr.addWidget(cbbtn); cbbtn.clicked.connect(self._pick_cookies_file)
         self.plugins_dir=QLineEdit(); self.plugins_dir.setPlaceholderText('Plugins directory')
-        pr=QHBoxLayout(); pr.addWidget(self.plugins_dir); pbtn=QPushButton('...'); pr.addWidget(pbtn); pbtn.clicked.connect(lambda: self._pick_dir(self.plugins_dir))
+        pr=QHBoxLayout(); pr.addWidget(self.plugins_dir); pbtn=QPushButton('...'); pr.addWidget(pbtn); pbtn.clicked.connect(self._pick_plugins_dir)
         for w in (self.chk_disable_js, QLabel('Download Threads:'), self.spin_threads, self.size_cap, self.throttle, self.auth_user, self.auth_pass, self.chk_import_browser_cookies):
             misc.addWidget(w)
         misc.addLayout(cr); misc.addLayout(pr); config_v.addWidget(misc)
@@ -301,7 +375,7 @@ class DockerClonerGUI(QWidget):
         for w in (self.chk_resilient,self.chk_relaxed_tls,self.chk_allow_degraded,self.chk_adaptive_conc): resilience.addWidget(w)
         resilience.addLayout(ft_row)
         # Auto-mark insecure when relaxed TLS is enabled
-        self.chk_relaxed_tls.toggled.connect(lambda on: (self.chk_insecure_tls.setChecked(True) if on else None))
+        self.chk_relaxed_tls.toggled.connect(self._on_relaxed_tls_toggled)
         config_v.addWidget(resilience)
         # Automation / AI Assist section
         auto=_CollapsibleBox('Automation / AI Assist'); self._sections.append(auto)
@@ -376,15 +450,15 @@ class DockerClonerGUI(QWidget):
         self.btn_copy_addr.clicked.connect(self._copy_address)
         self.btn_open_addr.clicked.connect(self._open_address)
         # Dynamic interlocks
-        self.chk_prerender.toggled.connect(self._on_prerender_toggled)
+        # Capture checkboxes mirror prerender's state: wired straight to setEnabled (no Python hop)
         for cap in (self.chk_capture_api,self.chk_capture_api_binary,self.chk_capture_graphql,self.chk_capture_storage):
+            self.chk_prerender.toggled.connect(cap.setEnabled)
             cap.toggled.connect(self._on_capture_flag_toggled)
+        self.chk_prerender.toggled.connect(self._on_prerender_toggled)
         # Enable Wizard only when a non-empty URL is present
-        def _update_wizard_enabled(txt:str):
-            self.btn_wizard.setEnabled(bool(txt.strip()))
-        self.url_in.textChanged.connect(_update_wizard_enabled)
+        self.url_in.textChanged.connect(self._update_wizard_enabled)
         # Initialize state based on any pre-populated URL (e.g., history load)
-        _update_wizard_enabled(self.url_in.text())
+        self._update_wizard_enabled(self.url_in.text())
         self.btn_save_cfg.clicked.connect(self._save_profile_dialog)
         self.btn_load_cfg.clicked.connect(self._load_profile_dialog)
         self._load_history()
@@ -426,7 +500,7 @@ class DockerClonerGUI(QWidget):
         act_diag=QAction('Diagnose Last Error', self); act_diag.triggered.connect(self._run_diagnostics); tools.addAction(act_diag)
         help_m=self.menubar.addMenu('&Help')
         act_help=QAction('Help Contents', self); act_help.triggered.connect(self._open_help); help_m.addAction(act_help)
-        act_index=QAction('Feature Index', self); act_index.triggered.connect(lambda: self._open_help(show_index=True)); help_m.addAction(act_index)
+        act_index=QAction('Feature Index', self); act_index.triggered.connect(self._open_help_index); help_m.addAction(act_index)
         help_m.addSeparator()
         # AI Chat Assistant entry
         act_ai=QAction('Start AI Chat', self)
@@ -437,6 +511,9 @@ class DockerClonerGUI(QWidget):
         help_m.addAction(act_ai_undo)
         help_m.addSeparator(); act_about=QAction('About', self); act_about.triggered.connect(self._show_about); help_m.addAction(act_about)
 
+    @Slot()
+    def _open_help_index(self): self._open_help(show_index=True)
+    @Slot()
     def _open_help(self, show_index: bool=False):
         try:
             from help_viewer import HelpViewer
@@ -446,8 +523,9 @@ class DockerClonerGUI(QWidget):
         dlg=HelpViewer(self, show_index=show_index)
         dlg.exec()
 
+    @Slot()
     def _open_ai_chat(self):
-        if ChatAssistantDialog is None:
+        if _load_ai_chat() is None:
             QMessageBox.warning(self,'AI Chat','AI chat module unavailable (missing ai_chat.py).')
             return
         if getattr(self,'_ai_chat_dialog',None) and self._ai_chat_dialog.isVisible():
@@ -473,6 +551,7 @@ class DockerClonerGUI(QWidget):
 
     def apply_ai_changes(self, changes: dict) -> List[str]:
         """Apply whitelisted field changes from AI to GUI widgets. Returns list of applied keys."""
+        _load_ai_chat()
         applied=[]
         inverse={}
         for k,v in (changes or {}).items():
@@ -540,6 +619,7 @@ class DockerClonerGUI(QWidget):
         except Exception:
             pass
 
+    @Slot()
     def _undo_last_ai_changes(self):
         if not self._ai_applied_history:
             QMessageBox.information(self,'AI Undo','No AI changes to undo.')
@@ -558,10 +638,12 @@ class DockerClonerGUI(QWidget):
         else:
             self._on_log('[ai] undo had no applicable fields')
 
+    @Slot()
     def _show_about(self):
         QMessageBox.information(self,'About','Clone Website to Docker Tool\nStatic + dynamic capture → Docker image.\nSee Help > Contents for documentation.')
 
     # Helpers
+    @Slot()
     def _browse_dest(self):
         p=QFileDialog.getExistingDirectory(self,'Select Destination');
         if p: self.dest_in.setText(p)
@@ -571,9 +653,15 @@ class DockerClonerGUI(QWidget):
     def _pick_dir(self, target: QLineEdit):
         p=QFileDialog.getExistingDirectory(self,'Select Directory');
         if p: target.setText(p)
+    @Slot()
+    def _pick_hook_script(self): self._pick_file(self.hook_in)
+    @Slot()
+    def _pick_cookies_file(self): self._pick_file(self.cookies_file)
+    @Slot()
+    def _pick_plugins_dir(self): self._pick_dir(self.plugins_dir)
 
     def _connect_signals(self):
-        self.sig_log.connect(self._on_log); self.sig_phase.connect(self._on_phase); self.sig_bandwidth.connect(lambda r: self._update_metric(rate=r)); self.sig_api.connect(lambda n: self._update_metric(api=n)); self.sig_router.connect(lambda n: self._update_metric(router=n)); self.sig_checksum.connect(lambda p: self._update_metric(chk=p))
+        self.sig_log.connect(self._queue_log); self.sig_phase.connect(self._on_phase); self.sig_bandwidth.connect(self._on_bandwidth); self.sig_api.connect(self._on_api_count); self.sig_router.connect(self._on_router_count); self.sig_checksum.connect(self._on_checksum)
         # Attempt to auto-load persisted AI key once signals are wired (console ready)
         self._load_persisted_api_key()
 
@@ -603,6 +691,7 @@ class DockerClonerGUI(QWidget):
         except Exception:
             pass
 
+    @Slot()
     def _prompt_set_api_key(self):
         from PySide6.QtWidgets import QInputDialog, QMessageBox
         current=getattr(self,'_persisted_ai_key', '') or (self.ai_api_key_in.text().strip() if hasattr(self,'ai_api_key_in') else '')
@@ -742,15 +831,13 @@ class DockerClonerGUI(QWidget):
         if not buttons: return
         # Determine a reasonable min width (longest text + padding heuristic)
         fm=self.fontMetrics()
-        max_text_w=max(fm.horizontalAdvance(b.text()) for b in buttons)+28  # padding allowance
+        # Shape each distinct caption once; the widest one sets the uniform width
+        max_text_w=max(map(fm.horizontalAdvance, {b.text() for b in buttons}))+28  # padding allowance
         # Force a uniform width so all buttons match exactly (user requested uniform size)
         target_w=min(max(130, max_text_w), 220)  # slightly higher minimum for consistency
         for b in buttons:
             try:
-                b.setMinimumHeight(32)
-                b.setMaximumHeight(32)
-                b.setMinimumWidth(target_w)
-                b.setMaximumWidth(target_w)
+                b.setFixedSize(target_w, 32)  # one geometry update instead of four min/max setters
                 # Fixed size policy to avoid stretch making widths drift
                 b.setSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed)
                 b.setIconSize(QSize(16,16))
@@ -764,38 +851,11 @@ class DockerClonerGUI(QWidget):
         # Remaining default to secondary; optionally mark explicitly
         for name in ('btn_estimate','btn_pause','btn_build_now','btn_run_docker','btn_serve','btn_copy_addr','btn_open_addr'):
             if hasattr(self,name): getattr(self,name).setProperty('kind','secondary')
-        # Apply a stylesheet with variant colors
-        style="""
-QPushButton {
-    padding:4px 10px;
-    font-weight:500;
-    border:1px solid #5a5a5a;
-    border-radius:4px;
-    background:#2e2e2e;
-    color:#f0f0f0;
-}
-QPushButton[kind="primary"] { background:#1e6ad6; border-color:#1e6ad6; }
-QPushButton[kind="primary"]:hover { background:#2578ef; }
-QPushButton[kind="primary"]:pressed { background:#1857a6; }
-
-QPushButton[kind="danger"] { background:#b3261e; border-color:#b3261e; }
-QPushButton[kind="danger"]:hover { background:#c63a31; }
-QPushButton[kind="danger"]:pressed { background:#8d1d17; }
-
-QPushButton[kind="accent"] { background:#1f8d49; border-color:#1f8d49; }
-QPushButton[kind="accent"]:hover { background:#25a658; }
-QPushButton[kind="accent"]:pressed { background:#146634; }
-
-QPushButton[kind="secondary"] { background:#3a3a3a; border-color:#5a5a5a; }
-QPushButton[kind="secondary"]:hover { background:#474747; }
-QPushButton[kind="secondary"]:pressed { background:#2f2f2f; }
-
-QPushButton:disabled { background:#2e2e2e; color:#888; border-color:#3a3a3a; }
-"""
+        # Apply a stylesheet with variant colors (built once at import, see _BUTTON_QSS)
         # Merge with any existing stylesheet on the root widget
         prev=self.styleSheet() or ''
         if 'QPushButton' not in prev:  # avoid duplicating if already applied
-            self.setStyleSheet(prev + ('\n' if prev else '') + style)
+            self.setStyleSheet(prev + ('\n' if prev else '') + _BUTTON_QSS)
 
     # ------------------- Section Bulk Controls -------------------
     def _expand_all_sections(self):
@@ -835,6 +895,7 @@ QPushButton:disabled { background:#2e2e2e; color:#888; border-color:#3a3a3a; }
         except Exception:
             pass
 
+    @Slot()
     def _toggle_all_sections(self):
         # Decide based on current uniformity: if all expanded -> collapse; else expand
         try:
@@ -850,28 +911,38 @@ QPushButton:disabled { background:#2e2e2e; color:#888; border-color:#3a3a3a; }
         msgs=[]
         if not is_wget2_available(): msgs.append('wget2 missing')
         if self.chk_build.isChecked() and not docker_available(): msgs.append('docker missing')
+        # status_lbl is shared with other messages, so it is re-asserted every call; the banner
+        # is only owned here and is left alone while the missing set is unchanged.
+        if msgs: self.status_lbl.setText(' / '.join(msgs))
+        if tuple(msgs)==self._last_deps or not self.dep_banner: return
+        self._last_deps=tuple(msgs)
         if msgs:
-            self.status_lbl.setText(' / '.join(msgs))
-            if self.dep_banner:
-                self.dep_banner_lbl.setText('Missing: '+', '.join(msgs))
-                self.dep_banner.setVisible(True)
+            self.dep_banner_lbl.setText('Missing: '+', '.join(msgs))
+            self.dep_banner.setVisible(True)
         else:
-            if self.dep_banner:
-                self.dep_banner.setVisible(False)
+            self.dep_banner.setVisible(False)
 
     # -------- Dynamic Interlocks --------
+    @Slot(bool)
+    def _on_relaxed_tls_toggled(self, on: bool):
+        if on: self.chk_insecure_tls.setChecked(True)
+    @Slot(str)
+    def _update_wizard_enabled(self, txt: str):
+        self.btn_wizard.setEnabled(bool(txt.strip()))
+    @Slot(bool)
     def _on_prerender_toggled(self, on: bool):
-        # Disable capture checkboxes if prerender off (visual guidance) but keep state so if re-enabled they come back.
-        for cap in (self.chk_capture_api,self.chk_capture_api_binary,self.chk_capture_graphql,self.chk_capture_storage):
-            cap.setEnabled(on)
+        # Capture checkboxes are enabled/disabled by their direct toggled->setEnabled connections
+        # (state is kept so they come back when prerender is re-enabled); this only reports.
+        caps=(self.chk_capture_api,self.chk_capture_api_binary,self.chk_capture_graphql,self.chk_capture_storage)
         if not on:
             # Show a gentle hint in console if any were checked
-            if any(c.isChecked() for c in (self.chk_capture_api,self.chk_capture_api_binary,self.chk_capture_graphql,self.chk_capture_storage)):
+            if any(c.isChecked() for c in caps):
                 self._on_log('[gui] prerender disabled – dynamic capture flags will be ignored until re-enabled')
         else:
             self._on_log('[gui] prerender enabled')
         self._update_dependency_banner()
 
+    @Slot(bool)
     def _on_capture_flag_toggled(self, on: bool):
         if on and not self.chk_prerender.isChecked():
             # Auto-enable prerender since captures depend on it
@@ -879,71 +950,83 @@ QPushButton:disabled { background:#2e2e2e; color:#888; border-color:#3a3a3a; }
             self.chk_prerender.setChecked(True)
 
     # -------- Reset Defaults --------
+    @Slot()
     def _reset_defaults(self):
         from PySide6.QtWidgets import QMessageBox
         resp=QMessageBox.question(self,'Reset Defaults','Reset all configuration fields to default values?')
         if resp!=QMessageBox.StandardButton.Yes:
             return
-        # Basic fields
-        self.url_in.setText('')
-        self.dest_in.setText('')
-        self.name_in.setText('site')
-        self.ip_in.setText('127.0.0.1')
-        self.host_port.setValue(8080)
-        self.cont_port.setValue(80)
-        # Clone options
-        for cb in (self.chk_build,self.chk_run_built,self.chk_serve,self.chk_open_browser,self.chk_incremental,self.chk_diff,self.chk_estimate_first,self.chk_cleanup):
-            cb.setChecked(False)
-        # Dynamic / prerender
-        self.chk_prerender.setChecked(False)
-        self.spin_prer_pages.setValue(40)
-        self.spin_prer_scroll.setValue(0)
-        self.spin_dom_stable.setValue(0)
-        self.spin_dom_stable_timeout.setValue(4000)
-        for cb in (self.chk_capture_api,self.chk_capture_api_binary,self.chk_capture_graphql,self.chk_capture_storage):
-            cb.setChecked(False)
-        self.api_types_in.setText('')
-        self.hook_in.setText('')
-        # Router
-        self.chk_router.setChecked(False)
-        self.chk_route_hash.setChecked(False)
-        self.chk_router_quiet.setChecked(False)
-        self.spin_router_max.setValue(200)
-        self.spin_router_settle.setValue(350)
-        self.router_wait_sel.setText('')
-        self.router_allow.setText('')
-        self.router_deny.setText('')
-        # Integrity
-        for cb in (self.chk_checksums,self.chk_verify_after,self.chk_verify_deep):
-            cb.setChecked(False)
-        self.checksum_ext.setText('')
-        # Misc / Perf
-        self.chk_disable_js.setChecked(False)
-        self.size_cap.setText('')
-        self.throttle.setText('')
-        if hasattr(self,'spin_threads'): self.spin_threads.setValue(12)
-        self.auth_user.setText('')
-        self.auth_pass.setText('')
-        self.cookies_file.setText('')
-        self.chk_import_browser_cookies.setChecked(False)
-        self.plugins_dir.setText('')
-        if hasattr(self,'user_agent_in'): self.user_agent_in.setText('')
-        if hasattr(self,'extra_wget_args_in'): self.extra_wget_args_in.setText('')
-        if hasattr(self,'chk_auto_backoff'): self.chk_auto_backoff.setChecked(False)
-        if hasattr(self,'chk_log_redirect_chain'): self.chk_log_redirect_chain.setChecked(False)
-        if hasattr(self,'chk_save_wget_stderr'): self.chk_save_wget_stderr.setChecked(False)
-        if hasattr(self,'chk_insecure_tls'): self.chk_insecure_tls.setChecked(False)
-        # Resilience defaults
-        if hasattr(self,'chk_resilient'): self.chk_resilient.setChecked(False)
-        if hasattr(self,'chk_relaxed_tls'): self.chk_relaxed_tls.setChecked(False)
-        if hasattr(self,'chk_allow_degraded'): self.chk_allow_degraded.setChecked(False)
-        if hasattr(self,'chk_adaptive_conc'): self.chk_adaptive_conc.setChecked(False)
-        if hasattr(self,'spin_failure_threshold'): self.spin_failure_threshold.setValue(0.15)
-        # Re-run interlock logic and dependency banner
-        self._on_prerender_toggled(self.chk_prerender.isChecked())
-        self._update_dependency_banner()
-        # Disable wizard until URL entered again
-        self.btn_wizard.setEnabled(False)
+        # One repaint for the whole reset instead of one per field/checkbox change
+        self.setUpdatesEnabled(False)
+        # Mute the interlocked widgets: their slots would run for every intermediate state and
+        # are re-run once explicitly below
+        caps=(self.chk_capture_api,self.chk_capture_api_binary,self.chk_capture_graphql,self.chk_capture_storage)
+        blockers=[QSignalBlocker(w) for w in (self.url_in,self.chk_prerender)+caps]
+        try:
+            # Basic fields
+            self.url_in.setText('')
+            self.dest_in.setText('')
+            self.name_in.setText('site')
+            self.ip_in.setText('127.0.0.1')
+            self.host_port.setValue(8080)
+            self.cont_port.setValue(80)
+            # Clone options
+            for cb in (self.chk_build,self.chk_run_built,self.chk_serve,self.chk_open_browser,self.chk_incremental,self.chk_diff,self.chk_estimate_first,self.chk_cleanup):
+                cb.setChecked(False)
+            # Dynamic / prerender
+            self.chk_prerender.setChecked(False)
+            self.spin_prer_pages.setValue(40)
+            self.spin_prer_scroll.setValue(0)
+            self.spin_dom_stable.setValue(0)
+            self.spin_dom_stable_timeout.setValue(4000)
+            for cb in caps:
+                cb.setChecked(False)
+            self.api_types_in.setText('')
+            self.hook_in.setText('')
+            # Router
+            self.chk_router.setChecked(False)
+            self.chk_route_hash.setChecked(False)
+            self.chk_router_quiet.setChecked(False)
+            self.spin_router_max.setValue(200)
+            self.spin_router_settle.setValue(350)
+            self.router_wait_sel.setText('')
+            self.router_allow.setText('')
+            self.router_deny.setText('')
+            # Integrity
+            for cb in (self.chk_checksums,self.chk_verify_after,self.chk_verify_deep):
+                cb.setChecked(False)
+            self.checksum_ext.setText('')
+            # Misc / Perf
+            self.chk_disable_js.setChecked(False)
+            self.size_cap.setText('')
+            self.throttle.setText('')
+            if hasattr(self,'spin_threads'): self.spin_threads.setValue(12)
+            self.auth_user.setText('')
+            self.auth_pass.setText('')
+            self.cookies_file.setText('')
+            self.chk_import_browser_cookies.setChecked(False)
+            self.plugins_dir.setText('')
+            if hasattr(self,'user_agent_in'): self.user_agent_in.setText('')
+            if hasattr(self,'extra_wget_args_in'): self.extra_wget_args_in.setText('')
+            if hasattr(self,'chk_auto_backoff'): self.chk_auto_backoff.setChecked(False)
+            if hasattr(self,'chk_log_redirect_chain'): self.chk_log_redirect_chain.setChecked(False)
+            if hasattr(self,'chk_save_wget_stderr'): self.chk_save_wget_stderr.setChecked(False)
+            if hasattr(self,'chk_insecure_tls'): self.chk_insecure_tls.setChecked(False)
+            # Resilience defaults
+            if hasattr(self,'chk_resilient'): self.chk_resilient.setChecked(False)
+            if hasattr(self,'chk_relaxed_tls'): self.chk_relaxed_tls.setChecked(False)
+            if hasattr(self,'chk_allow_degraded'): self.chk_allow_degraded.setChecked(False)
+            if hasattr(self,'chk_adaptive_conc'): self.chk_adaptive_conc.setChecked(False)
+            if hasattr(self,'spin_failure_threshold'): self.spin_failure_threshold.setValue(0.15)
+            # Re-run interlock logic and dependency banner
+            for cb in caps: cb.setEnabled(self.chk_prerender.isChecked())
+            self._on_prerender_toggled(self.chk_prerender.isChecked())
+            self._update_dependency_banner()
+            # Disable wizard until URL entered again
+            self.btn_wizard.setEnabled(False)
+        finally:
+            for b in blockers: b.unblock()
+            self.setUpdatesEnabled(True)
         self._on_log('[gui] settings reset to defaults')
 
     # ------------------- Profiles (Save / Load) -------------------
@@ -1077,6 +1160,7 @@ QPushButton:disabled { background:#2e2e2e; color:#888; border-color:#3a3a3a; }
                 pass
         except Exception as e:
             QMessageBox.warning(self,'Profile Load','Failed to apply profile: '+str(e))
+    @Slot()
     def _save_profile_dialog(self):
         from PySide6.QtWidgets import QInputDialog
         prof=self._current_profile_dict()
@@ -1091,6 +1175,7 @@ QPushButton:disabled { background:#2e2e2e; color:#888; border-color:#3a3a3a; }
             self._on_log(f"[profile] saved {path}")
         except Exception as e:
             QMessageBox.warning(self,'Save Failed', str(e))
+    @Slot()
     def _load_profile_dialog(self):
         d=self._profiles_dir()
         files=[f for f in os.listdir(d) if f.endswith('.json')]
@@ -1198,6 +1283,7 @@ QPushButton:disabled { background:#2e2e2e; color:#888; border-color:#3a3a3a; }
         except Exception as e:
             info['error'] = str(e)
             return info
+    @Slot()
     def _run_wizard(self):
         """Two-phase wizard: (1) Scan (dry-run heuristics) (2) Results with Apply/Cancel.
         If running in offscreen test mode, run synchronously for deterministic tests."""
@@ -1237,29 +1323,19 @@ QPushButton:disabled { background:#2e2e2e; color:#888; border-color:#3a3a3a; }
             return
         # Build scanning dialog with progress (indeterminate)
         from PySide6.QtWidgets import QDialog, QVBoxLayout, QLabel, QProgressBar
-        from PySide6.QtCore import QTimer
         scan_dlg=QDialog(self); scan_dlg.setWindowTitle('Wizard – Scanning')
         v=QVBoxLayout(scan_dlg)
         v.addWidget(QLabel(f'Scanning {url}\nFetching & analyzing...'))
         bar=QProgressBar(); bar.setRange(0,0); v.addWidget(bar)
         scan_dlg.setModal(True)
-        # Background compute using standard threading (avoids extra Qt event filters)
-        import threading
-        result_holder={'data':None,'done':False}
-        def _worker():
-            try:
-                result_holder['data']=_extended_analysis(url)
-            finally:
-                result_holder['done']=True
-        threading.Thread(target=_worker,daemon=True).start()
-        def _poll():
-            if result_holder['done']:
-                data=result_holder['data'] or {}
-                scan_dlg.accept()
-                self._wizard_show_results(data)
-            else:
-                QTimer.singleShot(120,_poll)
-        QTimer.singleShot(120,_poll)
+        # Background compute; the worker's finished signal (queued to the GUI thread) closes the
+        # dialog as soon as the analysis is done instead of polling for it on a timer.
+        def _done(data):
+            scan_dlg.accept()
+            self._wizard_show_results(data or {})
+        self._wizard_worker=_TaskWorker(_extended_analysis, url)
+        self._wizard_worker.finished.connect(_done)
+        self._wizard_worker.start()
         scan_dlg.exec()
 
     def _apply_wizard_recommendations(self, info: dict, chk_states: dict):
@@ -1383,6 +1459,7 @@ QPushButton:disabled { background:#2e2e2e; color:#888; border-color:#3a3a3a; }
         )
         setattr(cfg,'cleanup', self.chk_cleanup.isChecked())
         return cfg
+    @Slot()
     def start_clone(self):
         # Normalize URL field before validation so validation & history use canonical form
         if self.url_in.text().strip() and '://' not in self.url_in.text().strip():
@@ -1398,9 +1475,10 @@ QPushButton:disabled { background:#2e2e2e; color:#888; border-color:#3a3a3a; }
         cfg=self._build_config(); errs=validate_required_fields(cfg.url,cfg.dest,cfg.bind_ip,cfg.build,cfg.docker_name)
         if errs: QMessageBox.warning(self,'Validation','\n'.join(errs)); return
         if port_in_use(cfg.bind_ip,int(cfg.host_port)):
-            QMessageBox.warning(self,'Port In Use',f'Host port {cfg.host_port} already in use.'); return
+            alt=find_free_port(cfg.bind_ip,int(cfg.host_port)+1)
+            QMessageBox.warning(self,'Port In Use',f'Host port {cfg.host_port} already in use.'+(f' Next free port: {alt}.' if alt else '')); return
         if cfg.build and not docker_available(): QMessageBox.warning(self,'Docker Missing','Docker is not available.'); return
-        self.console.clear(); self._set_running(True); self._paused=False; self.btn_pause.setText('Pause')
+        self._log_queue.clear(); self.console.clear(); self._set_running(True); self._paused=False; self._resume_evt.set(); self.btn_pause.setText('Pause')
         cb=_GuiCallbacks(self); self._init_weighting(cfg)
         if hasattr(self,'chk_enable_auto_retry') and self.chk_enable_auto_retry.isChecked():
             attempts = self.spin_max_attempts.value() if hasattr(self,'spin_max_attempts') else 3
@@ -1413,11 +1491,14 @@ QPushButton:disabled { background:#2e2e2e; color:#888; border-color:#3a3a3a; }
             self.worker=_CloneWorker(cfg,cb)
         self.worker.finished.connect(self._clone_finished); self.worker.start(); self._on_log('[gui] clone started')
 
+    @Slot()
     def _cancel_clone(self):
         if self.worker and self.worker.isRunning():
-            self.worker.cancel(); self._on_log('[gui] cancel requested (cooperative)')
+            self.worker.cancel(); self._resume_evt.set(); self._on_log('[gui] cancel requested (cooperative)')
 
+    @Slot(object)
     def _clone_finished(self, result):
+        self._drain_log_queue()  # worker lines still waiting for the next frame come first
         self._on_log('[gui] clone finished'); self._set_running(False); self._last_result=result
         if result and getattr(result,'success',False):
             self.status_lbl.setText('Clone SUCCESS'); self._save_history();
@@ -1432,7 +1513,7 @@ QPushButton:disabled { background:#2e2e2e; color:#888; border-color:#3a3a3a; }
             self._update_url_action_buttons()
         else:
             self.status_lbl.setText('Clone FAILED')
-        if result and getattr(result,'output_folder',None): self.console.append(f"Output: {result.output_folder}")
+        if result and getattr(result,'output_folder',None): self._console_append(f"Output: {result.output_folder}")
         # Post-run heuristic: if only one HTML page captured and prerender off, suggest enabling dynamic mode
         try:
             if (result and getattr(result,'output_folder',None) and not self.chk_prerender.isChecked() and not self._dynamic_hint_shown):
@@ -1458,12 +1539,13 @@ QPushButton:disabled { background:#2e2e2e; color:#888; border-color:#3a3a3a; }
                             # Suggest moderate thread count
                             if hasattr(self,'spin_threads') and self.spin_threads.value()>12:
                                 self.spin_threads.setValue(8)
-                            self.console.append('[hint] Dynamic capture enabled (prerender + router intercept). Re-run Clone.')
+                            self._console_append('[hint] Dynamic capture enabled (prerender + router intercept). Re-run Clone.')
                         except Exception: pass
                     self._dynamic_hint_shown=True
         except Exception:
             pass
 
+    @Slot(str)
     def _on_log(self,msg:str):
         # Attempt to parse JSON events to surface structured info
         if msg.startswith('{') and msg.endswith('}'):  # fast path
@@ -1472,21 +1554,21 @@ QPushButton:disabled { background:#2e2e2e; color:#888; border-color:#3a3a3a; }
                 et=evt.get('event')
                 if et=='diff_summary':
                     a=evt.get('added'); r=evt.get('removed'); m=evt.get('modified'); u=evt.get('unchanged')
-                    self.console.append(f"[diff] added={a} removed={r} modified={m} unchanged={u}")
+                    self._console_append(f"[diff] added={a} removed={r} modified={m} unchanged={u}")
                     sa=evt.get('sample_added') or []
                     sm=evt.get('sample_modified') or []
-                    if sa: self.console.append('  sample added: '+', '.join(sa))
-                    if sm: self.console.append('  sample modified: '+', '.join(sm))
+                    if sa: self._console_append('  sample added: '+', '.join(sa))
+                    if sm: self._console_append('  sample modified: '+', '.join(sm))
                 elif et=='verify':
-                    self.console.append(f"[verify] passed={'YES' if evt.get('passed') else 'NO'}")
+                    self._console_append(f"[verify] passed={'YES' if evt.get('passed') else 'NO'}")
                 elif et=='canceled':
-                    self.console.append(f"[cancel] user canceled during {evt.get('phase')}")
+                    self._console_append(f"[cancel] user canceled during {evt.get('phase')}")
                 elif et=='plugin_finalize_error':
-                    self.console.append(f"[plugin] finalize error {evt.get('name')}: {evt.get('error')}")
+                    self._console_append(f"[plugin] finalize error {evt.get('name')}: {evt.get('error')}")
                 elif et=='plugin_loaded':
-                    self.console.append(f"[plugin] loaded {evt.get('name')}")
+                    self._console_append(f"[plugin] loaded {evt.get('name')}")
                 elif et=='plugin_load_failed':
-                    self.console.append(f"[plugin] load failed {evt.get('name')}: {evt.get('error')}")
+                    self._console_append(f"[plugin] load failed {evt.get('name')}: {evt.get('error')}")
                 elif et=='timings':
                     # Build a compact timings table
                     keys=[k for k in evt.keys() if k.endswith('_seconds') and k!='total_seconds']
@@ -1494,20 +1576,20 @@ QPushButton:disabled { background:#2e2e2e; color:#888; border-color:#3a3a3a; }
                         rows=[f"  {k.replace('_seconds','')}: {evt[k]}s" for k in sorted(keys)]
                         if evt.get('total_seconds') is not None:
                             rows.append(f"  total: {evt.get('total_seconds')}s")
-                        self.console.append('[timings]\n'+'\n'.join(rows))
+                        self._console_append('[timings]\n'+'\n'.join(rows))
                 elif et in ('clone_fail_stats','clone_fail_stats_second'):
                     phase_lbl = 'initial' if et=='clone_fail_stats' else 'second'
                     ratio = evt.get('error_ratio')
-                    self.console.append(f"[quality] {phase_lbl} pass failure ratio={ratio:.2%} http4xx={evt.get('http_4xx')} http5xx={evt.get('http_5xx')} dns={evt.get('dns_errors')} tls={evt.get('tls_errors')} other={evt.get('other_errors')}")
+                    self._console_append(f"[quality] {phase_lbl} pass failure ratio={ratio:.2%} http4xx={evt.get('http_4xx')} http5xx={evt.get('http_5xx')} dns={evt.get('dns_errors')} tls={evt.get('tls_errors')} other={evt.get('other_errors')}")
                 elif et=='clone_quality':
                     if evt.get('degraded'):
-                        self.console.append(f"[quality] clone degraded (error_ratio={evt.get('error_ratio'):.2%})")
+                        self._console_append(f"[quality] clone degraded (error_ratio={evt.get('error_ratio'):.2%})")
                     else:
-                        self.console.append(f"[quality] clone quality OK (error_ratio={evt.get('error_ratio'):.2%})")
+                        self._console_append(f"[quality] clone quality OK (error_ratio={evt.get('error_ratio'):.2%})")
                 # fall through still prints raw JSON for transparency
             except Exception:
                 pass
-        self.console.append(msg); self.console.ensureCursorVisible()
+        self._console_append(msg)
         # Forward log to AI chat (passive) if dialog open (watch mode triggers internal scheduling)
         if getattr(self,'_ai_chat_dialog',None):
             try: self._ai_chat_dialog.on_new_log(msg)
@@ -1527,10 +1609,46 @@ QPushButton:disabled { background:#2e2e2e; color:#888; border-color:#3a3a3a; }
                             self.chk_router.setChecked(True)
                             if hasattr(self,'spin_threads') and self.spin_threads.value()>12:
                                 self.spin_threads.setValue(8)
-                            self.console.append('[hint] Enabled dynamic mode due to malformed port errors. Click Clone again.')
+                            self._console_append('[hint] Enabled dynamic mode due to malformed port errors. Click Clone again.')
                     except Exception:
                         pass
+    def _console_append(self, text: str):
+        if self._console_batch is not None: self._console_batch.append(text); return
+        self.console.append(text); self.console.ensureCursorVisible()
+    @Slot(str)
+    def _queue_log(self, msg: str):
+        self._log_queue.append(msg)
+        if not self._log_timer.isActive(): self._log_timer.start()
+    @Slot()
+    def _drain_log_queue(self):
+        msgs=self._log_queue; self._log_queue=[]
+        if msgs: self._log_batch(msgs)
+    def _log_batch(self, msgs):
+        """Route msgs through _on_log, then append their console lines with repaints suspended.
+        Lines stay separate appends: QTextEdit.append sniffs rich text from the first line only,
+        so a joined block starting with e.g. '<script>' would be rendered (and eaten) as HTML."""
+        self._console_batch=batch=[]
+        try:
+            for m in msgs: self._on_log(m)
+        finally:
+            self._console_batch=None
+            if batch:
+                self.console.setUpdatesEnabled(False)
+                try:
+                    for t in batch: self.console.append(t)
+                finally:
+                    self.console.setUpdatesEnabled(True)
+                self.console.ensureCursorVisible()
+    @Slot(str, int)
     def _on_phase(self,phase:str,pct:int): self._update_weighted_progress(phase,pct)
+    @Slot(str)
+    def _on_bandwidth(self, rate: str): self._update_metric(rate=rate)
+    @Slot(int)
+    def _on_api_count(self, n: int): self._update_metric(api=n)
+    @Slot(int)
+    def _on_router_count(self, n: int): self._update_metric(router=n)
+    @Slot(int)
+    def _on_checksum(self, pct: int): self._update_metric(chk=pct)
     def _update_metric(self,rate=None,api=None,router=None,chk=None):
         parts=[]
         if rate: parts.append(f'Rate {rate}')
@@ -1540,12 +1658,16 @@ QPushButton:disabled { background:#2e2e2e; color:#888; border-color:#3a3a3a; }
         self.metric_lbl.setText(' | '.join(parts))
         done=[f"{ph}:{self._phase_end[ph]-st:.1f}s" for ph,st in self._phase_start.items() if ph in self._phase_end]
         if done: self.phase_time_lbl.setText(' | '.join(done))
+    @Slot()
     def _toggle_pause(self):
         if not self.worker or not self.worker.isRunning(): return
-        self._paused=not self._paused
+        # clear before pausing / set after resuming so a waiting callback never misses the change
+        if self._paused: self._paused=False; self._resume_evt.set()
+        else: self._resume_evt.clear(); self._paused=True
         self.btn_pause.setText('Resume' if self._paused else 'Pause')
         self._on_log('[gui] paused' if self._paused else '[gui] resumed')
     # -------- Build Now (manual Docker build after clone) --------
+    @Slot()
     def _build_now(self):
         if not self._last_result or not getattr(self._last_result,'success',False):
             QMessageBox.information(self,'Build','Successful clone required before manual build.'); return
@@ -1565,9 +1687,13 @@ QPushButton:disabled { background:#2e2e2e; color:#888; border-color:#3a3a3a; }
         self._on_log(f"[docker] building image {name} (manual Build Now)")
         try:
             import subprocess
-            proc=subprocess.Popen(['docker','build','-t',name,out],stdout=subprocess.PIPE,stderr=subprocess.STDOUT,text=True,bufsize=1)
-            for line in proc.stdout or []:
-                self._on_log(line.rstrip())
+            from cw2dt_core import _iter_pipe_chunks
+            # binary pipe read in large chunks (decoded once per chunk); each chunk's lines are
+            # logged as one batch (one repaint/scroll) instead of one relayout per line
+            proc=subprocess.Popen(['docker','build','-t',name,out],stdout=subprocess.PIPE,stderr=subprocess.STDOUT)
+            if proc.stdout is not None:
+                for lines in _iter_pipe_chunks(proc.stdout):
+                    if lines: self._log_batch([ln.rstrip() for ln in lines])
             proc.wait()
             if proc.returncode==0:
                 self._on_log('[docker] build succeeded')
@@ -1586,12 +1712,15 @@ QPushButton:disabled { background:#2e2e2e; color:#888; border-color:#3a3a3a; }
         return f"http://{host}:{self.host_port.value()}"
     def _update_url_action_buttons(self, container_started: bool=False):
         enabled=bool(self._last_result and getattr(self._last_result,'success',False))
-        if enabled and (container_started or self.btn_serve.text()=='Stop Serve' or image_exists_locally(self.name_in.text().strip() or 'site')):
-            self.btn_copy_addr.setEnabled(True)
-            self.btn_open_addr.setEnabled(True)
-        else:
-            self.btn_copy_addr.setEnabled(False)
-            self.btn_open_addr.setEnabled(False)
+        enabled=bool(enabled and (container_started or self.btn_serve.text()=='Stop Serve' or image_exists_locally(self.name_in.text().strip() or 'site')))
+        # Skip the no-op case (and its repaint) when the address buttons already match
+        if self.btn_copy_addr.isEnabled()==enabled and self.btn_open_addr.isEnabled()==enabled: return
+        self.setUpdatesEnabled(False)
+        try:
+            self.btn_copy_addr.setEnabled(enabled); self.btn_open_addr.setEnabled(enabled)
+        finally:
+            self.setUpdatesEnabled(True)
+    @Slot()
     def _copy_address(self):
         if not self.btn_copy_addr.isEnabled(): return
         url=self._compose_url()
@@ -1600,14 +1729,17 @@ QPushButton:disabled { background:#2e2e2e; color:#888; border-color:#3a3a3a; }
             self._on_log(f"[gui] copied {url}")
         except Exception:
             self._on_log('[gui] copy failed')
+    @Slot()
     def _open_address(self):
         if not self.btn_open_addr.isEnabled(): return
         url=self._compose_url()
         try:
+            import webbrowser
             webbrowser.open(url)
             self._on_log(f"[gui] opened {url}")
         except Exception as e:
             self._on_log(f"[gui] open failed: {e}")
+    @Slot()
     def _run_docker_image(self):
         if not self._last_result or not getattr(self._last_result,'success',False): return
         name=self.name_in.text().strip() or 'site'
@@ -1625,6 +1757,7 @@ QPushButton:disabled { background:#2e2e2e; color:#888; border-color:#3a3a3a; }
             self._update_url_action_buttons(True)
         except Exception as e:
             self._on_log(f'[gui] docker run failed: {e}')
+    @Slot()
     def _serve_folder(self):
         # Toggle behavior: start if not running, else stop
         if self._serve_httpd is None:
@@ -1672,25 +1805,32 @@ QPushButton:disabled { background:#2e2e2e; color:#888; border-color:#3a3a3a; }
             self.btn_serve.setText('Serve Folder')
 
     def _set_running(self,running:bool):
-        self.btn_clone.setEnabled(not running); self.btn_cancel.setEnabled(running); self.btn_estimate.setEnabled(not running); self.btn_pause.setEnabled(running)
-        for w in (self.chk_build,self.chk_run_built,self.chk_serve,self.chk_open_browser,self.chk_prerender): w.setEnabled(not running)
-        if running:
-            self.btn_run_docker.setEnabled(False); self.btn_serve.setEnabled(False); self.btn_build_now.setEnabled(False)
-            if hasattr(self,'btn_copy_addr'): self.btn_copy_addr.setEnabled(False)
-            if hasattr(self,'btn_open_addr'): self.btn_open_addr.setEnabled(False)
-        else:
-            if self._last_result and getattr(self._last_result,'success',False):
-                self.btn_build_now.setEnabled(True)
+        # Toggle the whole control set under one repaint instead of one per widget
+        self.setUpdatesEnabled(False)
+        try:
+            self.btn_clone.setEnabled(not running); self.btn_cancel.setEnabled(running); self.btn_estimate.setEnabled(not running); self.btn_pause.setEnabled(running)
+            for w in (self.chk_build,self.chk_run_built,self.chk_serve,self.chk_open_browser,self.chk_prerender): w.setEnabled(not running)
+            if running:
+                self.btn_run_docker.setEnabled(False); self.btn_serve.setEnabled(False); self.btn_build_now.setEnabled(False)
+                if hasattr(self,'btn_copy_addr'): self.btn_copy_addr.setEnabled(False)
+                if hasattr(self,'btn_open_addr'): self.btn_open_addr.setEnabled(False)
+            else:
+                if self._last_result and getattr(self._last_result,'success',False):
+                    self.btn_build_now.setEnabled(True)
+        finally:
+            self.setUpdatesEnabled(True)
 
     def _compute_and_lock_min_size(self):
-        # Expand all to measure widest required width
-        states=[box._toggle.isChecked() for box in self._sections]
+        # Size for the fully expanded form without expanding it: collapsed sections are measured
+        # through their hidden content widgets, so their children are only shown/polished when
+        # the user first opens them. One sizeHint() per widget: each call re-runs its layout.
+        content_hint=self._config_container.sizeHint()
+        content_w=content_hint.width(); extra_h=0
+        margins=self._config_container.layout().contentsMargins(); pad_x=margins.left()+margins.right()
         for box in self._sections:
-            if not box._toggle.isChecked():
-                box._toggle.setChecked(True); box._on_toggled()
-        QApplication.processEvents()
-        # Measure underlying content width, not the scroll area compressed size
-        content_w=self._config_container.sizeHint().width()
+            if box._toggle.isChecked(): continue
+            h=box._content.sizeHint()
+            content_w=max(content_w, h.width()+pad_x); extra_h+=h.height()+box.layout().spacing()
         # Add some padding + scrollbar reserve
         pad=24
         left_needed=content_w+pad
@@ -1700,25 +1840,30 @@ QPushButton:disabled { background:#2e2e2e; color:#888; border-color:#3a3a3a; }
         right_h=right_hint.height()
         # Compute full window width and target height (but allow height flexibility)
         total_w=left_needed+right_w+40
-        content_h=max(self._config_container.sizeHint().height(), right_h)+120
+        content_h=max(content_hint.height()+extra_h, right_h)+120
         # Cap height to available screen (leave margin) so window doesn't go off-screen
         screen=QApplication.primaryScreen(); avail_h=screen.availableGeometry().height() if screen else 1000
         cap_h=min(content_h, max(600, avail_h-120))
-        # Establish a global MINIMUM width but allow user to expand window to the right.
-        # Left panel width is fixed (min==max) so resizing only affects the right pane / console.
-        self.setMinimumWidth(total_w)
-        self.setMinimumHeight(min(600, cap_h))
-        # Resize to capped height if current greater
-        self.resize(total_w, cap_h)
-        # Set left fixed width so center position stays constant
-        self.splitter.widget(0).setMinimumWidth(left_needed)
-        self.splitter.widget(0).setMaximumWidth(left_needed)
-        # Ensure splitter allocates sizes explicitly
-        self.splitter.setSizes([left_needed, right_w])
-        # Restore previous collapse states
-        for st,box in zip(states,self._sections):
-            if not st:
-                box._toggle.setChecked(False); box._on_toggled()
+        # The show-time re-run usually lands on the same numbers: each setter below invalidates
+        # the window layout, so skip them entirely when nothing changed.
+        locked=(left_needed, right_w, total_w, cap_h)
+        if getattr(self,'_locked_size',None)==locked: return
+        self._locked_size=locked
+        self.setUpdatesEnabled(False)
+        try:
+            # Establish a global MINIMUM width but allow user to expand window to the right.
+            # Left panel width is fixed (min==max) so resizing only affects the right pane / console.
+            self.setMinimumWidth(total_w)
+            self.setMinimumHeight(min(600, cap_h))
+            # Resize to capped height if current greater
+            self.resize(total_w, cap_h)
+            # Set left fixed width so center position stays constant
+            self.splitter.widget(0).setMinimumWidth(left_needed)
+            self.splitter.widget(0).setMaximumWidth(left_needed)
+            # Ensure splitter allocates sizes explicitly
+            self.splitter.setSizes([left_needed, right_w])
+        finally:
+            self.setUpdatesEnabled(True)
 
     def showEvent(self, ev):  # ensure fixation after initial layout on different DPI
         super().showEvent(ev)
@@ -1742,9 +1887,14 @@ QPushButton:disabled { background:#2e2e2e; color:#888; border-color:#3a3a3a; }
         if prev_size and (self.width()!=prev_size.width()):
             if self.x()!=self._anchor_left:
                 # Keep top-left anchored, effectively making right edge the resize handle
-                self.move(self._anchor_left, self.y())
+                self._anchor_timer.start()
         self._last_size=self.size()
 
+    @Slot()
+    def _restore_anchor(self):
+        if self._anchor_left is not None and self.x()!=self._anchor_left:
+            self.move(self._anchor_left, self.y())
+
     def moveEvent(self, ev):
         # Allow normal moves (user dragging window) when size not changing
         # Update anchor to new x so future resizes still grow/shrink from right edge relative to new position.
@@ -1752,33 +1902,33 @@ QPushButton:disabled { background:#2e2e2e; color:#888; border-color:#3a3a3a; }
             self._anchor_left=self.x()
         super().moveEvent(ev)
 
+    _RECENT_MAX=10
     def _history_path(self): return os.path.join(os.path.expanduser('~'),'.cw2dt_history.json')
     def _load_history(self):
+        # MRU kept in memory as an ordered LRU (most recent first); the file is read once here
+        # and only written afterwards. The 'Recent' combo is not part of the collapsible
+        # layout, so no widgets are built for it.
+        self._recent_urls: OrderedDict[str, None]=OrderedDict()
         try:
             p=self._history_path()
             if os.path.exists(p):
-                data=json.load(open(p,'r',encoding='utf-8'))
-                urls=data.get('urls') or []
-                if urls:
-                    self.url_in.setText(urls[0])
-                    box=QComboBox(); box.addItems(urls); box.currentTextChanged.connect(lambda t: self.url_in.setText(t))
-                    lay=QHBoxLayout(); lay.addWidget(QLabel('Recent:')); lay.addWidget(box)
-                    host=self.splitter.widget(0)
-                    # If scroll area, insert into its widget layout
-                    # (History combo is currently omitted from collapsible arrangement for simplicity.)
+                with open(p,'r',encoding='utf-8') as f: urls=json.load(f).get('urls') or []
+                self._recent_urls.update((u,None) for u in urls[:self._RECENT_MAX])
+                if self._recent_urls:
+                    self.url_in.setText(next(iter(self._recent_urls)))
         except Exception:
             pass
     def _save_history(self):
         try:
-            p=self._history_path(); existing=[]
-            if os.path.exists(p):
-                try: existing=json.load(open(p,'r',encoding='utf-8')).get('urls') or []
-                except Exception: existing=[]
             cur=self.url_in.text().strip()
-            if cur: existing=[cur]+[u for u in existing if u!=cur]
-            json.dump({'urls':existing[:10]}, open(p,'w',encoding='utf-8'), indent=2)
+            if cur:
+                self._recent_urls[cur]=None; self._recent_urls.move_to_end(cur, last=False)
+                while len(self._recent_urls)>self._RECENT_MAX: self._recent_urls.popitem(last=True)
+            with open(self._history_path(),'w',encoding='utf-8') as f:
+                json.dump({'urls':list(self._recent_urls)}, f, indent=2)
         except Exception: pass
 
+    @Slot()
     def _estimate_items(self):
         from cw2dt_core import estimate_site_items
         url=self.url_in.text().strip()
@@ -1786,7 +1936,10 @@ QPushButton:disabled { background:#2e2e2e; color:#888; border-color:#3a3a3a; }
         self.status_lbl.setText('Estimating...'); self.repaint(); count=estimate_site_items(url); self.status_lbl.setText(f'Estimate: ~{count} URLs')
 
     # Dependency helper UI
+    @Slot()
     def _show_deps_dialog(self):
+        # Explicit re-check: drop cached probes so freshly installed tools are seen
+        refresh_tool_availability()
         optional=[
             ('PySide6','GUI frontend (already required for GUI mode)'),
             ('rich','Rich progress (--progress=rich)'),
@@ -1934,6 +2087,7 @@ QPushButton:disabled { background:#2e2e2e; color:#888; border-color:#3a3a3a; }
         overall=int(round(tot*100)); self.prog.setValue(overall); self.status_lbl.setText(f"{phase}: {pct}% (overall {overall}%)")
 
     # ------------------- Troubleshooting Diagnostics -------------------
+    @Slot()
     def _run_diagnostics(self):  # lightweight heuristic suggestions based on last console lines
         from PySide6.QtWidgets import QMessageBox
         try:
@@ -2006,6 +2160,7 @@ QPushButton:disabled { background:#2e2e2e; color:#888; border-color:#3a3a3a; }
                 self._on_log('[diag] '+line)
 
     # --- Existing folder adoption ---
+    @Slot()
     def _use_existing_folder(self):
         """Let user select a preexisting output folder (already cloned) to enable build/serve/run without cloning again.
         Accepts folder if it contains at least one HTML file OR a Dockerfile.
@@ -2020,9 +2175,9 @@ QPushButton:disabled { background:#2e2e2e; color:#888; border-color:#3a3a3a; }
             has_docker=os.path.exists(dockerfile)
             has_html=False
             if not has_docker:
-                for root,_,files in os.walk(path):
-                    if any(f.lower().endswith(('.html','.htm')) for f in files):
-                        has_html=True; break
+                # stops at the first HTML file; os.walk listed (and stat'ed) each whole directory first
+                from cw2dt_core import _iter_files, _HTML_EXTS
+                has_html=any(e.name.lower().endswith(_HTML_EXTS) for e in _iter_files(path))
             if not (has_docker or has_html):
                 QMessageBox.warning(self,'Not a Clone Folder','Selected folder does not look like a clone output (no Dockerfile or HTML files).')
                 return
@@ -2063,14 +2218,14 @@ QPushButton:disabled { background:#2e2e2e; color:#888; border-color:#3a3a3a; }
             if getattr(self._last_result,'docker_built',False):
                 self.btn_run_docker.setEnabled(True)
             self._update_url_action_buttons(container_started=False)
-            self.console.append(f"[gui] adopted existing folder: {path}")
+            self._console_append(f"[gui] adopted existing folder: {path}")
             if (not getattr(self._last_result,'docker_built',False)) and has_docker:
-                self.console.append('[hint] Dockerfile present but image not built – click Build Now to build it.')
+                self._console_append('[hint] Dockerfile present but image not built – click Build Now to build it.')
             if not has_docker:
-                self.console.append('[hint] No Dockerfile found; enable Build Docker image and run a fresh clone if you need a container, or just use Serve Folder.')
+                self._console_append('[hint] No Dockerfile found; enable Build Docker image and run a fresh clone if you need a container, or just use Serve Folder.')
         except Exception as e:
             try:
-                self.console.append(f"[gui] adopt failed: {e}")
+                self._console_append(f"[gui] adopt failed: {e}")
             except Exception:
                 pass
 
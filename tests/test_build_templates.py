@@ -0,0 +1,42 @@
+import os, sys
+
+BASE = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if BASE not in sys.path:
+    sys.path.insert(0, BASE)
+
+from cw2dt_core import _render_nginx_conf, _DOCKERFILE_TMPL  # type: ignore
+
+
+def test_nginx_conf_routing_and_csp():
+    conf = _render_nginx_conf(8081, 'spa', csp=True)
+    assert conf.startswith('server {\n    listen 8081;\n')
+    assert '    location / { try_files $uri $uri/ /index.html; }\n}\n' in conf
+    assert conf.index('Content-Security-Policy') < conf.index('location /')
+    assert 'Content-Security-Policy' not in _render_nginx_conf(80, 'strict')
+    assert '$uri.html =404' in _render_nginx_conf(80, 'ext')
+    assert _render_nginx_conf(80, 'bogus') == _render_nginx_conf(80, 'strict')
+
+
+def test_dockerfile_template():
+    text = _DOCKERFILE_TMPL.format(rel='example.com', port=8080)
+    assert text.splitlines() == [
+        'FROM nginx:alpine',
+        'COPY example.com/ /usr/share/nginx/html',
+        'COPY nginx.conf /etc/nginx/conf.d/default.conf',
+        'EXPOSE 8080',
+        'CMD ["nginx", "-g", "daemon off;"]',
+    ]
+
+
+def test_readme_templates_substitute_all_fields():
+    from cw2dt_core import _README_RUN_TMPL, _README_WINDOWS_PS  # type: ignore
+    fields = {'url': 'https://x.test/?q=100%', 'dest': '/d', 'jobs': 4, 'image_tag': 'img',
+              'host_port': 8080, 'container_port': 81, 'host_for_url': 'localhost',
+              'abs_output': '/d/img', 'abs_site_root': '/d/img/x', 'build_status': 'Built', 'flags': ' --build',
+              'run_prefix': 'docker run -d -p 0.0.0.0:8080:81', 'site_mount': '"/d/img/x":/usr/share/nginx/html'}
+    run = _README_RUN_TMPL % fields
+    ps = _README_WINDOWS_PS % fields
+    assert 'docker run -d -p 0.0.0.0:8080:81 img' in run
+    assert "--url 'https://x.test/?q=100%'" in run and run.endswith("--jobs 4 --build\n```\n")
+    assert '    listen 81;\n' in ps and '$uri $uri/ =404; }\n}\n' in ps
+    assert '%(' not in run + ps
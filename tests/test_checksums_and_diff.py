@@ -45,5 +45,23 @@ class TestChecksumsAndDiff(unittest.TestCase):
 		modified_paths = [m['path'] for m in diff['modified']]
 		self.assertIn('about.html', modified_paths)
 
+	def test_compute_checksums_pooled_matches_content(self):
+		# enough files to take the thread-pool path
+		for i in range(80):
+			with open(os.path.join(self.tempdir, f'p{i}.html'),'wb') as f: f.write(b'x'*i)
+		seen = []
+		checks = compute_checksums(self.tempdir, progress_cb=lambda d,t: seen.append((d,t)))
+		self.assertEqual(len(checks), 83)
+		self.assertEqual(checks['p7.html'], hashlib.sha256(b'x'*7).hexdigest())
+		self.assertEqual(seen[-1], (83, 83))
+
+	def test_compute_checksums_prunes_skip_dirs(self):
+		os.makedirs(os.path.join(self.tempdir, 'node_modules', 'pkg'))
+		with open(os.path.join(self.tempdir, 'node_modules', 'pkg', 'readme.html'),'wb') as f: f.write(b'<html>vendored</html>')
+		checks = compute_checksums(self.tempdir)
+		self.assertNotIn(os.path.join('node_modules', 'pkg', 'readme.html'), checks)
+		checks = compute_checksums(self.tempdir, skip_dirs=())
+		self.assertIn(os.path.join('node_modules', 'pkg', 'readme.html'), checks)
+
 if __name__ == '__main__':
 	unittest.main()
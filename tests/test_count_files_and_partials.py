@@ -0,0 +1,40 @@
+import os, sys, tempfile, shutil
+
+BASE = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if BASE not in sys.path:
+    sys.path.insert(0, BASE)
+
+from cw2dt_core import count_files_and_partials  # type: ignore
+
+
+def test_count_files_and_partials_nested_tree():
+    tmp = tempfile.mkdtemp(prefix='cw2dt_count_')
+    try:
+        layout = ['index.html', 'a/page.html', 'a/b/img.png.part', 'a/b/c/data.TMP', 'x/y/z/file.download', 'x/keep.css']
+        for rel in layout:
+            path = os.path.join(tmp, *rel.split('/'))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            open(path, 'w').write('x')
+        os.makedirs(os.path.join(tmp, 'empty', 'deeper'))
+        assert count_files_and_partials(tmp) == (6, 3)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def test_count_files_and_partials_missing_path():
+    assert count_files_and_partials('') == (0, 0)
+    assert count_files_and_partials(os.path.join(tempfile.gettempdir(), 'cw2dt_missing_dir_xyz')) == (0, 0)
+
+
+def test_count_files_and_partials_does_not_follow_dir_symlinks():
+    tmp = tempfile.mkdtemp(prefix='cw2dt_count_link_')
+    try:
+        os.makedirs(os.path.join(tmp, 'real'))
+        open(os.path.join(tmp, 'real', 'a.html'), 'w').write('x')
+        try:
+            os.symlink(os.path.join(tmp, 'real'), os.path.join(tmp, 'link'), target_is_directory=True)
+        except (OSError, NotImplementedError):
+            return
+        assert count_files_and_partials(tmp) == (1, 0)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
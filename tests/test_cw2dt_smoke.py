@@ -118,3 +118,12 @@ def test_plugin_hook_invocation():
             ('post','demo'),
             ('finalize',['output_folder'])
         ]
+
+
+def test_dispatcher_help_does_not_import_gui(capsys):
+    import sys
+    import cw2dt  # type: ignore
+    sys.modules.pop('cw2dt_gui', None)
+    assert cw2dt.main(['--help']) == 0
+    assert 'cw2dt_gui' not in sys.modules
+    assert '--headless' in capsys.readouterr().out
@@ -1,5 +1,5 @@
 import os, tempfile, shutil, json
-from cw2dt_core import _snapshot_file_hashes, _compute_diff
+from cw2dt_core import _snapshot_file_hashes, _compute_diff, _SNAPSHOT_ALG
 
 def test_diff_delta_bytes_and_changed_alias():
     tmp = tempfile.mkdtemp(prefix='cw2dt_diff_')
@@ -26,3 +26,56 @@ def test_diff_delta_bytes_and_changed_alias():
         assert 'a.txt' in diff['changed']
     finally:
         shutil.rmtree(tmp, ignore_errors=True)
+
+def test_snapshot_reuses_hash_when_size_and_mtime_match():
+    tmp = tempfile.mkdtemp(prefix='cw2dt_diff_')
+    try:
+        with open(os.path.join(tmp,'a.txt'),'w',encoding='utf-8') as f: f.write('AAAA')
+        with open(os.path.join(tmp,'b.txt'),'w',encoding='utf-8') as f: f.write('BBBB')
+        snap1={'files': _snapshot_file_hashes(tmp)}
+        # a recorded hash that can only come from prev proves a.txt was not re-read
+        snap1['files']['a.txt']=dict(snap1['files']['a.txt'], **{_SNAPSHOT_ALG: 'from-prev'})
+        st=os.stat(os.path.join(tmp,'b.txt'))
+        with open(os.path.join(tmp,'b.txt'),'w',encoding='utf-8') as f: f.write('XXXX')
+        os.utime(os.path.join(tmp,'b.txt'), (st.st_atime, st.st_mtime+5))
+        snap2=_snapshot_file_hashes(tmp, prev=snap1)
+        assert snap2['a.txt'][_SNAPSHOT_ALG] == 'from-prev'
+        assert snap2['b.txt'][_SNAPSHOT_ALG] != snap1['files']['b.txt'][_SNAPSHOT_ALG]
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+def test_algorithm_switch_is_not_reported_as_modified():
+    # no shared digest algorithm: stat identity decides
+    prev={'files': {'a.txt': {'sha256': 'aa', 'size': 4, 'mtime': 1, 'mtime_ns': 1_000_000_000}}}
+    curr={'files': {'a.txt': {'blake3': 'bb', 'size': 4, 'mtime': 1, 'mtime_ns': 1_000_000_000}}}
+    assert _compute_diff(prev, curr)['modified'] == []
+    curr['files']['a.txt']['mtime_ns'] += 1
+    assert _compute_diff(prev, curr)['changed'] == ['a.txt']
+    # an unchanged file keeps the previous entry's algorithm and digest
+    tmp = tempfile.mkdtemp(prefix='cw2dt_diff_')
+    try:
+        with open(os.path.join(tmp,'a.txt'),'w',encoding='utf-8') as f: f.write('AAAA')
+        snap1={'files': _snapshot_file_hashes(tmp)}
+        other='sha256' if _SNAPSHOT_ALG == 'blake3' else 'blake3'
+        meta=snap1['files']['a.txt']; meta[other]=meta.pop(_SNAPSHOT_ALG)
+        snap2={'files': _snapshot_file_hashes(tmp, prev=snap1)}
+        assert snap2['files']['a.txt'][other] == meta[other]
+        diff=_compute_diff(snap1, snap2)
+        assert diff['changed'] == [] and diff['unchanged_count'] == 1
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+def test_snapshot_rehashes_same_second_rewrite():
+    tmp = tempfile.mkdtemp(prefix='cw2dt_diff_')
+    try:
+        p=os.path.join(tmp,'a.txt'); sec=1_700_000_000*10**9
+        with open(p,'w',encoding='utf-8') as f: f.write('AAAA')
+        os.utime(p, ns=(sec, sec+100))
+        snap1={'files': _snapshot_file_hashes(tmp)}
+        with open(p,'w',encoding='utf-8') as f: f.write('BBBB')
+        os.utime(p, ns=(sec, sec+200_000_000))
+        snap2=_snapshot_file_hashes(tmp, prev=snap1)
+        assert snap2['a.txt']['mtime'] == snap1['files']['a.txt']['mtime']
+        assert snap2['a.txt'][_SNAPSHOT_ALG] != snap1['files']['a.txt'][_SNAPSHOT_ALG]
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
@@ -0,0 +1,61 @@
+import os, sys, tempfile, shutil
+
+BASE = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if BASE not in sys.path:
+    sys.path.insert(0, BASE)
+
+from cw2dt_core import find_site_root  # type: ignore
+
+
+def _touch(base, rel):
+    path = os.path.join(base, *rel.split('/'))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, 'w').write('x')
+
+
+def test_find_site_root_prefers_base_and_nested():
+    tmp = tempfile.mkdtemp(prefix='cw2dt_root_')
+    try:
+        _touch(tmp, 'example.com/assets/app.css')
+        _touch(tmp, 'example.com/Index.HTML')
+        assert find_site_root(tmp) == os.path.join(tmp, 'example.com')
+        _touch(tmp, 'index.php')
+        assert find_site_root(tmp) == tmp
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def test_find_site_root_matches_os_walk_order():
+    tmp = tempfile.mkdtemp(prefix='cw2dt_root_order_')
+    try:
+        for rel in ('a/b/index.htm', 'c/index.html', 'a/z.txt', 'd/e/f/index.html'):
+            _touch(tmp, rel)
+        expected = next(root for root, _, files in os.walk(tmp) if any(f.lower() in ('index.html', 'index.htm', 'index.php') for f in files))
+        assert find_site_root(tmp) == expected
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def test_find_site_root_without_index_returns_base():
+    tmp = tempfile.mkdtemp(prefix='cw2dt_root_none_')
+    try:
+        _touch(tmp, 'x/y.html')
+        assert find_site_root(tmp) == tmp
+        assert find_site_root(os.path.join(tmp, 'missing')) == os.path.join(tmp, 'missing')
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def test_scan_output_matches_separate_passes():
+    from cw2dt_core import scan_output, count_files_and_partials  # type: ignore
+    tmp = tempfile.mkdtemp(prefix='cw2dt_scan_')
+    try:
+        for rel in ('robots.txt', 'site/index.html', 'site/a/page.htm', 'site/img.png.part', 'other/x.html', 'z.tmp'):
+            _touch(tmp, rel)
+        res = scan_output(tmp)
+        assert res.site_root == find_site_root(tmp) == os.path.join(tmp, 'site')
+        assert (res.total, res.partials) == count_files_and_partials(tmp) == (6, 2)
+        assert sorted(os.path.relpath(p, tmp) for p in res.html_files) == sorted(
+            os.path.join(*r.split('/')) for r in ('site/index.html', 'site/a/page.htm', 'other/x.html'))
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
@@ -0,0 +1,25 @@
+import os, sys
+
+BASE = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if BASE not in sys.path:
+    sys.path.insert(0, BASE)
+
+from cw2dt_core import _fast_parse_headless, _build_headless_parser  # type: ignore
+
+
+def test_fast_parse_matches_argparse():
+    argv = ['--headless', '--url', 'https://example.com', '--dest=/tmp/out', '--build', '--jobs', '3',
+            '--failure-threshold=0.3', '--routing-mode', 'spa', '--report', 'md', '--checksum-ext', 'css,js']
+    fast = _fast_parse_headless(argv)
+    assert fast is not None
+    assert vars(fast) == vars(_build_headless_parser().parse_args(argv))
+
+
+def test_fast_parse_defers_to_argparse_when_needed():
+    base = ['--url', 'u', '--dest', 'd']
+    assert _fast_parse_headless(['--dest', 'd']) is None            # missing required
+    assert _fast_parse_headless(base + ['--help']) is None           # help text
+    assert _fast_parse_headless(base + ['--dock', 'x']) is None      # abbreviation
+    assert _fast_parse_headless(base + ['--jobs', 'many']) is None   # bad type
+    assert _fast_parse_headless(base + ['--report', 'pdf']) is None  # bad choice
+    assert _fast_parse_headless(base + ['--build=1']) is None        # value on a switch
@@ -0,0 +1,45 @@
+import os, sys
+
+BASE = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if BASE not in sys.path:
+    sys.path.insert(0, BASE)
+
+import cw2dt_core  # type: ignore
+from cw2dt_core import normalize_ip, get_primary_lan_ip  # type: ignore
+
+
+def test_normalize_ip_values():
+    assert normalize_ip('') == '127.0.0.1'
+    assert normalize_ip(' LocalHost ') == '127.0.0.1'
+    assert normalize_ip('0.0.0.0') == '0.0.0.0'
+    assert normalize_ip('192.168.1.20') == '192.168.1.20'
+    assert normalize_ip('999.1.1.1') == ''
+    assert normalize_ip('999.1.1.1') == ''  # cached path returns the same answer
+
+
+def test_primary_lan_ip_is_cached(monkeypatch):
+    created = []
+    class _FakeSock:
+        def __init__(self, *a): created.append(1)
+        def __enter__(self): return self
+        def __exit__(self, *a): return False
+        def connect(self, addr): pass
+        def getsockname(self): return ('10.1.2.3', 5555)
+    monkeypatch.setattr(cw2dt_core, '_lan_ip_cache', {})
+    monkeypatch.setattr(cw2dt_core.socket, 'socket', _FakeSock)
+    assert get_primary_lan_ip() == '10.1.2.3'
+    assert get_primary_lan_ip() == '10.1.2.3'
+    assert len(created) == 1
+    monkeypatch.setattr(cw2dt_core, '_LAN_IP_TTL', 0.0)
+    get_primary_lan_ip()
+    assert len(created) == 2
+
+
+def test_url_host_extraction():
+    from cw2dt_core import _url_host  # type: ignore
+    assert _url_host('https://Example.com/path?q=1') == 'example.com'
+    assert _url_host('example.com:8080/x') == 'example.com'
+    assert _url_host('http://user:pw@sub.example.org:81/') == 'sub.example.org'
+    assert _url_host('') == ''
+    assert _url_host('http://[::1]:8080/') == '::1'
+    assert _url_host('https://[2001:DB8::1]/x') == '2001:db8::1'
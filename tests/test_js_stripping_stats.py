@@ -45,3 +45,46 @@ def test_js_stripping_stats_present():
         assert jsstats.get('modified',0) >= 1, jsstats
     finally:
         shutil.rmtree(tmp, ignore_errors=True)
+
+
+def test_strip_js_tree_skips_clean_files_and_counts_scripts():
+    tmp = tempfile.mkdtemp(prefix='cw2dt_js_tree_')
+    try:
+        os.makedirs(os.path.join(tmp, 'sub'))
+        dirty = os.path.join(tmp, 'sub', 'page.HTM')
+        clean = os.path.join(tmp, 'clean.html')
+        open(dirty, 'wb').write(b'<p>\xe9</p><SCRIPT src="x.js"></SCRIPT><script>\nvar a=1;\n</script><p>end</p>')
+        open(clean, 'wb').write(b'<p>no scripts here</p>')
+        before = os.stat(clean).st_mtime_ns
+        stats = cw2dt_core._strip_js_tree(tmp)
+        assert stats == {'scanned': 2, 'stripped': 1, 'scripts_removed': 1, 'inline_scripts_removed': 1}
+        # non-UTF-8 bytes survive untouched; clean file is not rewritten
+        assert open(dirty, 'rb').read() == b'<p>\xe9</p><p>end</p>'
+        assert os.stat(clean).st_mtime_ns == before
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def test_strip_js_tree_parallel_many_files():
+    tmp = tempfile.mkdtemp(prefix='cw2dt_js_many_')
+    try:
+        for i in range(40):
+            body = b'<script>x()</script>' if i % 2 else b'<p>plain</p>'
+            open(os.path.join(tmp, f'p{i}.html'), 'wb').write(body)
+        stats = cw2dt_core._strip_js_tree(tmp, max_workers=4)
+        assert stats == {'scanned': 40, 'stripped': 20, 'scripts_removed': 0, 'inline_scripts_removed': 20}
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def test_strip_js_file_empty_and_mixed_case():
+    tmp = tempfile.mkdtemp(prefix='cw2dt_js_mm_')
+    try:
+        empty = os.path.join(tmp, 'empty.html'); open(empty, 'wb').close()
+        assert cw2dt_core._strip_js_file(empty) == (False, 0, 0)
+        upper = os.path.join(tmp, 'upper.html')
+        open(upper, 'wb').write(b'<SCRIPT SRC="a.js"></SCRIPT><b>ok</b>')
+        assert cw2dt_core._strip_js_file(upper) == (True, 1, 0)
+        assert open(upper, 'rb').read() == b'<b>ok</b>'
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
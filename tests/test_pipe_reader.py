@@ -0,0 +1,36 @@
+import os, sys
+
+BASE = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if BASE not in sys.path:
+    sys.path.insert(0, BASE)
+
+from cw2dt_core import _iter_pipe_lines, _iter_pipe_chunks  # type: ignore
+
+
+def _pipe_with(*writes):
+    r, w = os.pipe()
+    for data in writes:
+        os.write(w, data)
+    os.close(w)
+    return os.fdopen(r, 'rb')
+
+
+def test_iter_pipe_lines_handles_cr_lf_and_partial_reads():
+    stream = _pipe_with(b'first\n 10%\r 55%\r', b'\nlast line without newline')
+    with stream:
+        lines = list(_iter_pipe_lines(stream, chunk_size=4))
+    assert lines == ['first', ' 10%', ' 55%', 'last line without newline']
+
+
+def test_iter_pipe_chunks_batches_lines_and_replaces_bad_utf8():
+    stream = _pipe_with(b'a\nb\n\xff\n')
+    with stream:
+        chunks = list(_iter_pipe_chunks(stream))
+    assert chunks == [['a', 'b', '�']]
+
+
+def test_percent_token_regex():
+    from cw2dt_core import _PCT_RE  # type: ignore
+    assert _PCT_RE.search('index.html  42% [===>   ] 1.2M/s').group(1) == '42'
+    assert _PCT_RE.search('Downloading 100%').group(1) == '100'
+    assert _PCT_RE.search('rate 50%/s 1000% 7%x') is None
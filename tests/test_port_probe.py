@@ -0,0 +1,34 @@
+import os, sys, socket
+
+BASE = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if BASE not in sys.path:
+    sys.path.insert(0, BASE)
+
+from cw2dt_core import port_in_use, ports_in_use, find_free_port  # type: ignore
+
+
+def _free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def test_ports_in_use_detects_listener():
+    srv = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        srv.bind(('127.0.0.1', 0)); srv.listen(4)
+        busy = srv.getsockname()[1]
+        idle = _free_port()
+        res = ports_in_use('127.0.0.1', [busy, idle, busy])
+        assert res == {busy: True, idle: False}
+        assert port_in_use('0.0.0.0', busy) is True
+        assert port_in_use('127.0.0.1', idle) is False
+        assert find_free_port('127.0.0.1', busy, span=1) is None
+    finally:
+        srv.close()
+
+
+def test_find_free_port_returns_candidate():
+    start = _free_port()
+    port = find_free_port('127.0.0.1', start, span=5)
+    assert port is not None and start <= port < start + 5
@@ -1,5 +1,5 @@
 import os, tempfile, shutil, threading, http.server, socketserver, pytest
-from cw2dt_core import CloneConfig, clone_site, CloneCallbacks, is_wget2_available
+from cw2dt_core import CloneConfig, clone_site, CloneCallbacks, is_wget2_available, detect_risky_regex
 
 class Cb(CloneCallbacks):
     def __init__(self): self.lines=[]
@@ -27,3 +27,7 @@ def test_regex_warning_emitted_for_risky_patterns():
         assert warnings, 'Expected regex_warning events'
     finally:
         shutil.rmtree(tmp, ignore_errors=True)
+
+def test_detect_risky_regex_first_reason_and_dedup():
+    pats=['(a+)+(.*.*x)', 'safe', '(a+b+)+', '', '(a+b+)+']
+    assert detect_risky_regex(pats) == [('(a+)+(.*.*x)','consecutive_any_wildcards'), ('(a+b+)+','nested_repeating_group')]
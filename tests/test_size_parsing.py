@@ -0,0 +1,30 @@
+import os, sys
+
+BASE = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if BASE not in sys.path:
+    sys.path.insert(0, BASE)
+
+from cw2dt_core import parse_size_to_bytes, parse_rate_to_bps, human_quota_suffix, human_rate_suffix  # type: ignore
+
+
+def test_parse_size_units():
+    assert parse_size_to_bytes('500M') == 500 * 1024**2
+    assert parse_size_to_bytes(' 2gb ') == 2 * 1024**3
+    assert parse_size_to_bytes('1.5K') == 1536
+    assert parse_size_to_bytes('1TB') == 1024**4
+    assert parse_size_to_bytes('4096') == 4096
+    assert parse_rate_to_bps('4M') == 4 * 1024**2
+
+
+def test_parse_size_rejects_garbage():
+    for bad in (None, '', 'MB', '12X', '500B', 'abc'):
+        assert parse_size_to_bytes(bad) is None
+
+
+def test_human_suffixes():
+    assert human_quota_suffix(3 * 1024**3) == '3G'
+    assert human_quota_suffix(5 * 1024**2 + 7) == '5M'
+    assert human_quota_suffix(2048) == '2K'
+    assert human_quota_suffix(100) == '100'
+    assert human_rate_suffix(3 * 1024**3) == '3072M'
+    assert human_rate_suffix(512) == '512'
@@ -0,0 +1,29 @@
+import os, sys
+
+BASE = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if BASE not in sys.path:
+    sys.path.insert(0, BASE)
+
+from cw2dt_core import _DistinctCounter  # type: ignore
+
+
+def test_distinct_counter_exact_below_limit():
+    c = _DistinctCounter(exact_limit=100)
+    for u in ['https://a/1', 'https://a/2', 'https://a/1', 'https://a/3']:
+        c.add(u)
+    assert len(c) == 3
+
+
+def test_distinct_counter_switches_to_bloom_and_stays_close():
+    c = _DistinctCounter(exact_limit=100, capacity=20_000, error_rate=0.01)
+    for i in range(5_000):
+        c.add(f'https://example.com/page/{i}')
+        c.add(f'https://example.com/page/{i}')  # duplicates never count twice
+    assert c._exact is None
+    assert 4_900 <= len(c) <= 5_000
+
+
+def test_url_regex_matches_whole_tokens_only():
+    from cw2dt_core import _URL_RE  # type: ignore
+    line = '--2024-01-01 10:00:00--  https://example.com/a.html ref="http://x/y" http://example.com/b'
+    assert _URL_RE.findall(line) == ['https://example.com/a.html', 'http://example.com/b']
@@ -0,0 +1,64 @@
+import os, sys
+
+BASE = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if BASE not in sys.path:
+    sys.path.insert(0, BASE)
+
+import cw2dt_core  # type: ignore
+
+
+def test_which_caches_hits_and_expires_misses(monkeypatch):
+    calls = []
+    def _fake_which(name):
+        calls.append(name)
+        return '/usr/bin/'+name if name == 'present' else None
+    clock = [1000.0]
+    cw2dt_core.refresh_tool_availability()
+    monkeypatch.setattr(cw2dt_core.shutil, 'which', _fake_which)
+    monkeypatch.setattr(cw2dt_core.time, 'monotonic', lambda: clock[0])
+    try:
+        assert cw2dt_core._which('present') == '/usr/bin/present'
+        assert cw2dt_core._which('absent') is None and cw2dt_core._which('absent') is None
+        assert calls == ['present', 'absent']
+        # a miss expires (the user may have installed the tool); a hit does not
+        clock[0] += cw2dt_core._WHICH_MISS_TTL + 1
+        cw2dt_core._which('present'); cw2dt_core._which('absent')
+        assert calls == ['present', 'absent', 'absent']
+        cw2dt_core.refresh_tool_availability()
+        cw2dt_core._which('present')
+        assert calls[-1] == 'present' and len(calls) == 4
+    finally:
+        cw2dt_core.refresh_tool_availability()
+
+
+def test_availability_checks_do_not_spawn(monkeypatch):
+    def _no_spawn(*a, **k):
+        raise AssertionError('availability probe should not spawn a process')
+    monkeypatch.setattr(cw2dt_core.subprocess, 'run', _no_spawn)
+    monkeypatch.setattr(cw2dt_core.shutil, 'which', lambda name: '/usr/bin/' + name)
+    cw2dt_core.refresh_tool_availability()
+    try:
+        assert cw2dt_core._which('docker') == '/usr/bin/docker'
+        assert cw2dt_core._which('wget2') == '/usr/bin/wget2'
+    finally:
+        cw2dt_core.refresh_tool_availability()
+
+
+def test_image_exists_caches_positive_results_only(monkeypatch):
+    class _Res:
+        def __init__(self, rc): self.returncode = rc
+    calls = []
+    def _fake_run(cmd, **k):
+        calls.append(cmd[-1])
+        return _Res(0 if cmd[-1] == 'present' else 1)
+    monkeypatch.setattr(cw2dt_core.subprocess, 'run', _fake_run)
+    cw2dt_core.refresh_tool_availability()
+    try:
+        assert cw2dt_core.image_exists_locally('present') and cw2dt_core.image_exists_locally('present')
+        assert not cw2dt_core.image_exists_locally('absent') and not cw2dt_core.image_exists_locally('absent')
+        assert calls == ['present', 'absent', 'absent']  # a build may create 'absent' at any time
+        cw2dt_core.refresh_tool_availability()
+        cw2dt_core.image_exists_locally('present')
+        assert calls[-1] == 'present' and len(calls) == 4
+    finally:
+        cw2dt_core.refresh_tool_availability()